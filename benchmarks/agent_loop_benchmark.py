@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Agent-loop overhead benchmark for the LLM client.
+
+Runs LLM client turns (AgentSession from client/mcp_client_llm.py) against
+the real server with the scripted fake LLM (client/llm_backends.py), so no
+network or API key is involved and the model answers instantly. What is
+left is the client's own overhead per turn, broken down by stage:
+
+- schemas:  getting the OpenAI tool schemas (cached with the tool list)
+- messages: assembling the conversation for a request (budget, compaction)
+- llm:      one streamed model call: request JSON encoding and delta handling
+- tools:    the MCP round trip of each tool call
+- results:  condensing tool outputs and building the result messages
+- turn:     a whole turn, from prompt to final answer
+
+The prompts cycle through running one file, running several files in one
+turn, listing files and a plain chat message. Results are written as JSON
+and can be compared with a previous run, like benchmarks/load_test.py.
+
+With --model-latency the fake model waits before answering, like a real
+one; together with --speculate this shows how much execution time
+speculative run_python calls hide behind the model.
+
+Usage:
+    python benchmarks/agent_loop_benchmark.py --turns 200 --output agent.json
+    python benchmarks/agent_loop_benchmark.py --transports memory,stdio --baseline agent.json
+    python benchmarks/agent_loop_benchmark.py --model-latency 0.3 --speculate
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from load_test import CLIENT_DIR, WORKLOAD_FILES, compare, server_target, summarize
+
+
+def workload_prompts(files: list) -> list:
+    """
+    One cycle of benchmark prompts.
+
+    Args:
+        files: Absolute paths of the workload scripts
+
+    Returns:
+        Prompts, answered by the scripted LLM's default rules
+    """
+    return [
+        f"Run {files[0]}",
+        "Run " + " and ".join(files),
+        "Show me all Python files",
+        "Thanks, that is all for now",
+    ]
+
+
+async def run_agent_loop(
+    target,
+    prompts: list,
+    turns: int = 100,
+    context_tokens: int = 8000,
+    tool_output_tokens: int = 1000,
+    model_latency: float = 0.0,
+    speculate: bool = False,
+) -> dict:
+    """
+    Run agent-loop turns with the scripted LLM.
+
+    The first cycle of prompts warms up the session and is not counted.
+
+    Args:
+        target: Function returning a server_url for RmiMcpClient
+        prompts: Prompts, cycled through
+        turns: Number of measured turns
+        context_tokens: Token budget of the conversation
+        tool_output_tokens: Token budget of each tool output
+        model_latency: Seconds the fake model waits before each answer
+        speculate: Run files named in prompts speculatively
+
+    Returns:
+        Result dict with turn throughput and per-stage latency statistics
+    """
+    from mcp_client import RmiMcpClient
+    from mcp_client_llm import AgentSession, LLMClient
+    from llm_backends import ScriptedBackend
+
+    backend = ScriptedBackend(latency=model_latency)
+    async with RmiMcpClient(target()) as mcp_client:
+        session = AgentSession(
+            mcp_client, LLMClient(model="scripted", backend=backend),
+            context_tokens=context_tokens, tool_output_tokens=tool_output_tokens,
+            speculate=speculate, echo=False
+        )
+        for prompt in prompts:
+            await session.turn(prompt)
+        for timings in session.timings.values():
+            timings.clear()
+        if session.speculator is not None:
+            session.speculator.stats.update(started=0, hits=0, wasted=0, seconds_saved=0.0)
+        measured_requests = len(backend.request_bytes)
+
+        start = time.perf_counter()
+        for index in range(turns):
+            await session.turn(prompts[index % len(prompts)])
+        elapsed = time.perf_counter() - start
+
+    request_bytes = backend.request_bytes[measured_requests:]
+    result = {
+        "turns": turns,
+        "seconds": elapsed,
+        "throughput": turns / elapsed if elapsed else 0.0,
+        "latency_ms": summarize(session.timings["turn"]),
+        "stages": {stage: summarize(session.timings[stage]) for stage in session.STAGES},
+        "request_bytes": {
+            "mean": statistics.fmean(request_bytes) if request_bytes else 0,
+            "max": max(request_bytes, default=0),
+        },
+    }
+    if session.speculator is not None:
+        result["speculation"] = dict(session.speculator.stats, hit_rate=session.speculator.hit_rate())
+    return result
+
+
+async def run_benchmark(transports: list, turns: int, context_tokens: int = 8000,
+                        tool_output_tokens: int = 1000, model_latency: float = 0.0,
+                        speculate: bool = False) -> dict:
+    """
+    Run the agent loop on every requested transport.
+
+    Returns:
+        Mapping of transport name to run_agent_loop results
+    """
+    sys.path.insert(0, str(CLIENT_DIR))
+    results = {}
+    with tempfile.TemporaryDirectory() as projects_dir:
+        files = []
+        for name, source in WORKLOAD_FILES.items():
+            path = Path(projects_dir) / name
+            path.write_text(source)
+            files.append(str(path.resolve()))
+
+        env = dict(os.environ)
+        env["PYTHON_PROJECTS_DIR"] = str(Path(projects_dir).resolve())
+
+        for transport in transports:
+            async with server_target(transport, env) as target:
+                results[transport] = await run_agent_loop(
+                    target, workload_prompts(files), turns, context_tokens, tool_output_tokens,
+                    model_latency, speculate
+                )
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Agent-loop overhead benchmark")
+    parser.add_argument(
+        "--transports",
+        default="memory",
+        help="Comma-separated transports: memory, stdio, sse, http (default: memory)"
+    )
+    parser.add_argument("--turns", type=int, default=100, help="Measured turns per transport (default: 100)")
+    parser.add_argument("--context-tokens", type=int, default=8000, help="Conversation token budget (default: 8000)")
+    parser.add_argument(
+        "--tool-output-tokens",
+        type=int,
+        default=1000,
+        help="Token budget of each tool output (default: 1000)"
+    )
+    parser.add_argument(
+        "--model-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake model waits before each answer (default: 0)"
+    )
+    parser.add_argument("--speculate", action="store_true", help="Run files named in prompts speculatively")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=20.0,
+        help="Fail if turns/s drops or p95 turn latency grows by this many percent (default: 20)"
+    )
+    args = parser.parse_args()
+
+    if args.turns < 1:
+        parser.error("--turns must be at least 1")
+
+    transports = [t.strip() for t in args.transports.split(",") if t.strip()]
+    results = asyncio.run(run_benchmark(
+        transports, args.turns, args.context_tokens, args.tool_output_tokens,
+        args.model_latency, args.speculate
+    ))
+
+    for transport, result in results.items():
+        print(f"{transport}: {result['turns']} turns, {result['throughput']:.1f} turns/s, "
+              f"~{result['request_bytes']['mean']:.0f} bytes per LLM request")
+        print(f"  {'stage':<10} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9}")
+        for stage, latency in [("turn", result["latency_ms"])] + list(result["stages"].items()):
+            print(
+                f"  {stage:<10} {latency['count']:>6} {latency.get('mean', 0):>7.2f}ms "
+                f"{latency.get('p50', 0):>7.2f}ms {latency.get('p95', 0):>7.2f}ms"
+            )
+        if "speculation" in result:
+            speculation = result["speculation"]
+            print(f"  speculation: {speculation['started']} started, {speculation['hits']} used "
+                  f"({speculation['hit_rate']:.0%}), {speculation['wasted']} wasted, "
+                  f"{speculation['seconds_saved']:.2f}s hidden")
+
+    report = {
+        "benchmark": "agent_loop",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "turns": args.turns,
+        "context_tokens": args.context_tokens,
+        "tool_output_tokens": args.tool_output_tokens,
+        "model_latency": args.model_latency,
+        "speculate": args.speculate,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nAgent-loop regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression:.0f}% of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for RmiAgentMcpServer.
+
+Drives the server with a number of concurrent clients, each with its own MCP
+session, sending a weighted mix of run_python and list_python_files calls
+through RmiMcpClient. Supported transports:
+
+- memory: the server imported in-process (as tests/test_integration.py does)
+- stdio:  one server process per client, as MCP hosts run it
+- sse:    one run_http_server.py process shared by all clients
+- http:   same, with the streamable HTTP transport
+
+Reports throughput and p50/p95/p99 latency per transport and per operation.
+Results are written as JSON and can be compared with a previous run, so a
+change to the execution path can be checked for throughput or latency
+regressions before it ships.
+
+Usage:
+    python benchmarks/load_test.py --transports memory,sse --clients 8 --requests 400
+    python benchmarks/load_test.py --duration 30 --mix run_python=1 --output load.json
+    python benchmarks/load_test.py --baseline load.json --max-regression 15
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+SERVER_DIR = PROJECT_ROOT / "server"
+CLIENT_DIR = PROJECT_ROOT / "client"
+SERVER_SCRIPT = SERVER_DIR / "mcp_server.py"
+HTTP_SCRIPT = SERVER_DIR / "run_http_server.py"
+
+sys.path.insert(0, str(SERVER_DIR))
+
+from runtime_history import percentile
+from startup_benchmark import free_port
+
+OPERATIONS = ("run_python", "list_python_files")
+DEFAULT_MIX = "run_python=4,list_python_files=1"
+
+# Scripts placed in the projects directory and run by the run_python workload
+WORKLOAD_FILES = {
+    "bench_hello.py": "print('Hello from the load test')\n",
+    "bench_compute.py": "print(sum(i * i for i in range(200000)))\n",
+    "bench_output.py": "for i in range(200):\n    print(f'line {i}: ' + 'x' * 60)\n",
+}
+
+
+def parse_mix(text: str) -> dict:
+    """
+    Parse a workload mix such as "run_python=4,list_python_files=1".
+
+    Returns:
+        Mapping of operation to relative weight
+
+    Raises:
+        ValueError: For unknown operations or non-positive total weight
+    """
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r} (choose from {', '.join(OPERATIONS)})")
+        mix[name] = float(weight) if weight else 1.0
+    if sum(mix.values()) <= 0:
+        raise ValueError(f"Workload mix {text!r} has no positive weights")
+    return mix
+
+
+def summarize(latencies: list) -> dict:
+    """Latency statistics in milliseconds."""
+    if not latencies:
+        return {"count": 0}
+    ms = [value * 1000 for value in latencies]
+    return {
+        "count": len(ms),
+        "mean": statistics.fmean(ms),
+        "p50": percentile(ms, 0.50),
+        "p95": percentile(ms, 0.95),
+        "p99": percentile(ms, 0.99),
+        "max": max(ms),
+    }
+
+
+@asynccontextmanager
+async def server_target(transport: str, env: dict, startup_timeout: float = 60.0):
+    """
+    Start the server for a transport.
+
+    Args:
+        transport: "memory", "stdio", "sse" or "http"
+        env: Environment for server processes
+        startup_timeout: Seconds to wait for an HTTP server to answer
+
+    Yields:
+        Function returning a server_url for RmiMcpClient, called once per client
+    """
+    if transport == "memory":
+        import mcp_server
+        # Point the in-process server at the workload files for this run only
+        original = mcp_server.get_config()
+        mcp_server.apply_config(
+            dataclasses.replace(original, allowed_directory=env["PYTHON_PROJECTS_DIR"])
+        )
+        try:
+            yield lambda: mcp_server.mcp
+        finally:
+            mcp_server.apply_config(original)
+        return
+
+    if transport == "stdio":
+        from fastmcp.client.transports import PythonStdioTransport
+        yield lambda: PythonStdioTransport(str(SERVER_SCRIPT), env=env, cwd=str(SERVER_DIR))
+        return
+
+    if transport not in ("sse", "http"):
+        raise ValueError(f"Unknown transport {transport!r}")
+
+    from fastmcp import Client
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}{'/sse' if transport == 'sse' else '/mcp'}"
+    proc = subprocess.Popen(
+        [sys.executable, str(HTTP_SCRIPT), "--transport", transport,
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        start = time.perf_counter()
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{transport} server exited with code {proc.returncode}")
+            if time.perf_counter() - start > startup_timeout:
+                raise TimeoutError(f"{transport} server did not answer within {startup_timeout}s")
+            try:
+                async with Client(url, timeout=5) as client:
+                    await client.list_tools()
+                break
+            except Exception:
+                await asyncio.sleep(0.05)
+        yield lambda: url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def run_load(
+    target,
+    clients: int,
+    mix: dict,
+    files: list,
+    requests: int = 200,
+    duration: float = None,
+    seed: int = 0,
+) -> dict:
+    """
+    Drive a server with concurrent clients.
+
+    All clients connect (and warm up with one list_python_files call) before
+    the clock starts, so connection set-up is not counted.
+
+    Args:
+        target: Function returning a server_url for each client
+        clients: Number of concurrent clients (one session each)
+        mix: Operation weights (see parse_mix)
+        files: Absolute paths of the scripts run by run_python
+        requests: Total requests, shared by all clients (ignored with duration)
+        duration: Run for this many seconds instead of a request count
+        seed: Random seed for the operation sequence
+
+    Returns:
+        Result dict with throughput, error count and latency statistics
+    """
+    from mcp_client import RmiMcpClient
+
+    rng = random.Random(seed)
+    operations, weights = list(mix), list(mix.values())
+    latencies = {name: [] for name in operations}
+    errors = {name: 0 for name in operations}
+    remaining = [requests]
+    ready = asyncio.Event()
+    connected = [0]
+    started = [0.0]
+    deadline = [None]
+
+    def next_operation():
+        if duration is None:
+            if remaining[0] <= 0:
+                return None
+            remaining[0] -= 1
+        elif time.perf_counter() >= deadline[0]:
+            return None
+        return rng.choices(operations, weights)[0]
+
+    async def worker(index: int):
+        async with RmiMcpClient(target()) as client:
+            await client.list_python_files()
+            connected[0] += 1
+            if connected[0] == clients:
+                started[0] = time.perf_counter()
+                if duration is not None:
+                    deadline[0] = started[0] + duration
+                ready.set()
+            await ready.wait()
+
+            count = 0
+            while True:
+                operation = next_operation()
+                if operation is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    if operation == "run_python":
+                        output = await client.run_python(files[(index + count) % len(files)])
+                    else:
+                        output = await client.list_python_files()
+                    failed = output.startswith("Error")
+                except Exception:
+                    failed = True
+                latencies[operation].append(time.perf_counter() - start)
+                errors[operation] += failed
+                count += 1
+
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started[0]
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "seconds": elapsed,
+        "throughput": len(all_latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": summarize(all_latencies),
+        "operations": {
+            name: {"errors": errors[name], "latency_ms": summarize(values)}
+            for name, values in latencies.items()
+        },
+    }
+
+
+async def run_benchmark(transports: list, clients: int, mix: dict, requests: int,
+                        duration: float = None, seed: int = 0) -> dict:
+    """
+    Run the load test on every requested transport.
+
+    Returns:
+        Mapping of transport name to run_load results
+    """
+    sys.path.insert(0, str(CLIENT_DIR))
+    results = {}
+    with tempfile.TemporaryDirectory() as projects_dir:
+        files = []
+        for name, source in WORKLOAD_FILES.items():
+            path = Path(projects_dir) / name
+            path.write_text(source)
+            files.append(str(path.resolve()))
+
+        env = dict(os.environ)
+        env["PYTHON_PROJECTS_DIR"] = str(Path(projects_dir).resolve())
+
+        for transport in transports:
+            async with server_target(transport, env) as target:
+                results[transport] = await run_load(
+                    target, clients, mix, files, requests, duration, seed
+                )
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Compare throughput and p95 latency against a baseline.
+
+    Args:
+        results: Current results
+        baseline: Report loaded from a previous run
+        max_regression: Allowed change in percent
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for transport, result in results.items():
+        previous = baseline.get("results", {}).get(transport)
+        if not previous:
+            continue
+        floor = previous["throughput"] * (1 - max_regression / 100)
+        if result["throughput"] < floor:
+            change = (1 - result["throughput"] / previous["throughput"]) * 100
+            regressions.append(
+                f"{transport} throughput: {result['throughput']:.1f}/s vs baseline "
+                f"{previous['throughput']:.1f}/s (-{change:.0f}%)"
+            )
+        p95, previous_p95 = result["latency_ms"].get("p95"), previous["latency_ms"].get("p95")
+        if p95 is not None and previous_p95 and p95 > previous_p95 * (1 + max_regression / 100):
+            change = (p95 / previous_p95 - 1) * 100
+            regressions.append(
+                f"{transport} p95 latency: {p95:.1f}ms vs baseline {previous_p95:.1f}ms (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="End-to-end load test")
+    parser.add_argument(
+        "--transports",
+        default="memory",
+        help="Comma-separated transports: memory, stdio, sse, http (default: memory)"
+    )
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients (default: 4)")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests per transport (default: 200)")
+    parser.add_argument("--duration", type=float, help="Run each transport for this many seconds instead")
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Operation weights (default: {DEFAULT_MIX})"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the operation sequence")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=20.0,
+        help="Fail if throughput drops or p95 latency grows by this many percent (default: 20)"
+    )
+    args = parser.parse_args()
+
+    if args.clients < 1:
+        parser.error("--clients must be at least 1")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    transports = [t.strip() for t in args.transports.split(",") if t.strip()]
+    results = asyncio.run(run_benchmark(
+        transports, args.clients, mix, args.requests, args.duration, args.seed
+    ))
+
+    print(f"{'transport':<10} {'requests':>8} {'errors':>6} {'req/s':>8} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8}")
+    for transport, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"{transport:<10} {result['requests']:>8} {result['errors']:>6} "
+            f"{result['throughput']:>8.1f} {latency.get('p50', 0):>6.1f}ms "
+            f"{latency.get('p95', 0):>6.1f}ms {latency.get('p99', 0):>6.1f}ms"
+        )
+
+    report = {
+        "benchmark": "load",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "clients": args.clients,
+        "requests": args.requests,
+        "duration": args.duration,
+        "mix": mix,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nLoad-test regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression:.0f}% of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for RmiAgentMcpServer.
+
+Measures, over several cold starts:
+
+- import_seconds:        time to `import mcp_server` inside a fresh interpreter
+- process_seconds:       wall time of a fresh interpreter that imports the server
+- stdio_first_call:      spawn of the stdio server until the first list_tools succeeds
+- sse_first_call:        spawn of run_http_server.py (SSE) until list_tools succeeds
+- http_first_call:       same for the streamable HTTP transport
+
+Results are written as JSON and can be compared with a previous run, so that
+start-up regressions fail CI.
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 5 --output startup.json
+    python benchmarks/startup_benchmark.py --baseline startup.json --max-regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+SERVER_DIR = PROJECT_ROOT / "server"
+SERVER_SCRIPT = SERVER_DIR / "mcp_server.py"
+HTTP_SCRIPT = SERVER_DIR / "run_http_server.py"
+
+IMPORT_PROBE = (
+    "import time; start = time.perf_counter(); import mcp_server; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def server_env(projects_dir: str) -> dict:
+    """Environment for server processes started by the benchmark."""
+    env = dict(os.environ)
+    env["PYTHON_PROJECTS_DIR"] = projects_dir
+    return env
+
+
+def free_port() -> int:
+    """Find a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> tuple:
+    """
+    Import the server in a fresh interpreter.
+
+    Returns:
+        Tuple of (import seconds, whole process seconds)
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(proc.stdout.strip().splitlines()[-1]), time.perf_counter() - start
+
+
+async def measure_stdio(env: dict) -> float:
+    """Time from spawning the stdio server to the first list_tools result."""
+    from fastmcp import Client
+    from fastmcp.client.transports import PythonStdioTransport
+
+    transport = PythonStdioTransport(str(SERVER_SCRIPT), env=env, cwd=str(SERVER_DIR))
+    start = time.perf_counter()
+    async with Client(transport) as client:
+        await client.list_tools()
+        return time.perf_counter() - start
+
+
+async def measure_http(env: dict, transport: str, timeout: float = 60.0) -> float:
+    """Time from spawning the HTTP server to the first list_tools result."""
+    from fastmcp import Client
+
+    port = free_port()
+    path = "/sse" if transport == "sse" else "/mcp"
+    url = f"http://127.0.0.1:{port}{path}"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(HTTP_SCRIPT), "--transport", transport,
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{transport} server exited with code {proc.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"{transport} server did not answer within {timeout}s")
+            try:
+                async with Client(url, timeout=5) as client:
+                    await client.list_tools()
+                    return time.perf_counter() - start
+            except Exception:
+                await asyncio.sleep(0.02)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def summarize(samples: list) -> dict:
+    """Summary statistics for a list of durations."""
+    return {
+        "runs": samples,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+async def run_benchmark(runs: int, transports: list) -> dict:
+    """
+    Run every measurement the requested number of times.
+
+    Args:
+        runs: Number of cold starts per measurement
+        transports: Transports to measure ("stdio", "sse", "http")
+
+    Returns:
+        Mapping of measurement name to summary statistics
+    """
+    samples = {}
+    with tempfile.TemporaryDirectory() as projects_dir:
+        env = server_env(projects_dir)
+
+        for _ in range(runs):
+            import_seconds, process_seconds = measure_import(env)
+            samples.setdefault("import_seconds", []).append(import_seconds)
+            samples.setdefault("process_seconds", []).append(process_seconds)
+
+        for transport in transports:
+            name = f"{transport}_first_call"
+            for _ in range(runs):
+                if transport == "stdio":
+                    duration = await measure_stdio(env)
+                else:
+                    duration = await measure_http(env, transport)
+                samples.setdefault(name, []).append(duration)
+
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """
+    Compare median timings against a baseline.
+
+    Args:
+        results: Current results
+        baseline: Results loaded from a previous run
+        max_regression: Allowed slowdown in percent
+
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, summary in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        limit = previous["median"] * (1 + max_regression / 100)
+        if summary["median"] > limit:
+            change = (summary["median"] / previous["median"] - 1) * 100
+            regressions.append(
+                f"{name}: {summary['median']:.3f}s vs baseline "
+                f"{previous['median']:.3f}s (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Server startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per measurement (default: 5)")
+    parser.add_argument(
+        "--transports",
+        default="stdio,sse,http",
+        help="Comma-separated transports to measure (default: stdio,sse,http)"
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=20.0,
+        help="Fail if a median is this many percent slower than the baseline (default: 20)"
+    )
+    args = parser.parse_args()
+
+    transports = [t.strip() for t in args.transports.split(",") if t.strip()]
+    results = asyncio.run(run_benchmark(args.runs, transports))
+
+    print(f"{'measurement':<20} {'min':>8} {'median':>8} {'max':>8}")
+    for name, summary in results.items():
+        print(f"{name:<20} {summary['min']:>7.3f}s {summary['median']:>7.3f}s {summary['max']:>7.3f}s")
+
+    report = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "runs": args.runs,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nStart-up regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression:.0f}% of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Pool of warm MCP sessions, shared between callers.
+
+Opening a session costs a connection plus the MCP initialize handshake,
+which is hundreds of milliseconds through ngrok. ConnectionPool keeps
+connected FastMCP clients per server URL and hands them out to any number
+of callers: MCP multiplexes concurrent requests over one session, so
+callers share sessions instead of each opening their own.
+
+Sessions are health-checked lazily when they are handed out: a session
+that has disconnected, or that fails a ping after being quiet for a while,
+is closed and replaced by a new one before the caller sees it. Sessions
+that stay unused for too long are closed.
+
+A pool belongs to the event loop it is used on.
+
+Example:
+    async with ConnectionPool() as pool:
+        async with RmiMcpClient("http://localhost:8000/mcp", pool=pool) as client:
+            print(await client.run_python("hello_world.py"))
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from fastmcp import Client
+from fastmcp.client.transports import SSETransport, StreamableHttpTransport
+
+from retry import is_connection_error
+from tool_cache import ToolCache
+
+
+def build_transport(server_url: Any, compression: bool = True):
+    """
+    Build the transport for a server URL.
+
+    Args:
+        server_url: Server script path, HTTP(S) URL or FastMCP instance
+        compression: Accept compressed (gzip/zstd) HTTP responses
+
+    Returns:
+        A FastMCP transport, or the server URL itself to let FastMCP infer it
+    """
+    if compression or not isinstance(server_url, str):
+        return server_url
+    if not server_url.startswith(("http://", "https://")):
+        return server_url
+
+    headers = {"Accept-Encoding": "identity"}
+    if urlparse(server_url).path.rstrip("/").endswith("/sse"):
+        return SSETransport(server_url, headers=headers)
+    return StreamableHttpTransport(server_url, headers=headers)
+
+
+async def is_alive(client: Client, timeout: float) -> bool:
+    """
+    Check that a session's server responds.
+
+    Any reply counts, including an error from servers that do not
+    implement ping.
+
+    Args:
+        client: Connected client
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        True if the server answered in time
+    """
+    try:
+        await asyncio.wait_for(client.ping(), timeout)
+    except Exception as e:
+        return not is_connection_error(e) and client.is_connected()
+    return True
+
+
+class PooledSession:
+    """A connected client, its tool list cache and usage bookkeeping."""
+
+    def __init__(self, client: Client, tool_cache: Optional[ToolCache] = None):
+        self.client = client
+        self.tool_cache = tool_cache or ToolCache()
+        self.in_use = 0
+        self.discarded = False
+        self.last_used = time.monotonic()
+        self.last_checked = self.last_used
+
+
+class ConnectionPool:
+    """Warm, shared MCP sessions per server URL."""
+
+    def __init__(
+        self,
+        sessions_per_url: int = 1,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        idle_timeout: float = 300.0,
+        compression: bool = True,
+        tools_ttl: Optional[float] = 300.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            sessions_per_url: Sessions opened per server before busy ones are
+                              shared (each session carries many requests)
+            health_check_interval: Ping a session before reuse if it has been
+                                   quiet for this many seconds
+            health_check_timeout: Seconds a ping may take before the session
+                                  is considered dead
+            idle_timeout: Close sessions unused for this many seconds
+            compression: Accept compressed HTTP responses
+            tools_ttl: Seconds each session's tool list is cached (see ToolCache)
+        """
+        self.sessions_per_url = max(1, sessions_per_url)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.idle_timeout = idle_timeout
+        self.compression = compression
+        self.tools_ttl = tools_ttl
+        self._sessions: Dict[Any, List[PooledSession]] = {}
+        self._locks: Dict[Any, asyncio.Lock] = {}
+        self.stats = {"connects": 0, "reuses": 0, "reconnects": 0, "idle_closed": 0}
+
+    async def _open(self, server_url: Any) -> PooledSession:
+        tool_cache = ToolCache(self.tools_ttl)
+        client = Client(build_transport(server_url, self.compression), message_handler=tool_cache)
+        await client.__aenter__()
+        self.stats["connects"] += 1
+        return PooledSession(client, tool_cache)
+
+    async def _close(self, session: PooledSession):
+        try:
+            await session.client.__aexit__(None, None, None)
+        except Exception:
+            # The connection is being thrown away; nothing left to clean up
+            pass
+
+    async def _healthy(self, session: PooledSession) -> bool:
+        if not session.client.is_connected():
+            return False
+        if session.in_use or time.monotonic() - session.last_checked < self.health_check_interval:
+            return True
+        if not await is_alive(session.client, self.health_check_timeout):
+            return False
+        session.last_checked = time.monotonic()
+        return True
+
+    async def _close_idle(self, server_url: Any):
+        now = time.monotonic()
+        sessions = self._sessions.get(server_url, [])
+        for session in [s for s in sessions if not s.in_use and now - s.last_used > self.idle_timeout]:
+            sessions.remove(session)
+            self.stats["idle_closed"] += 1
+            await self._close(session)
+
+    async def acquire(self, server_url: Any) -> PooledSession:
+        """
+        Get a connected session for a server, opening one if needed.
+
+        Must be paired with release().
+
+        Args:
+            server_url: Server script path, HTTP(S) URL or FastMCP instance
+
+        Returns:
+            PooledSession whose client is connected
+        """
+        lock = self._locks.setdefault(server_url, asyncio.Lock())
+        async with lock:
+            await self._close_idle(server_url)
+            sessions = self._sessions.setdefault(server_url, [])
+
+            while True:
+                session = min(sessions, key=lambda s: s.in_use, default=None)
+                if session is None or (session.in_use and len(sessions) < self.sessions_per_url):
+                    session = await self._open(server_url)
+                    sessions.append(session)
+                    break
+                if await self._healthy(session):
+                    self.stats["reuses"] += 1
+                    break
+                sessions.remove(session)
+                self.stats["reconnects"] += 1
+                await self._close(session)
+
+            session.in_use += 1
+            return session
+
+    async def release(self, session: PooledSession):
+        """Return a session obtained from acquire()."""
+        session.in_use -= 1
+        session.last_used = time.monotonic()
+        if session.discarded and not session.in_use:
+            await self._close(session)
+
+    async def discard(self, server_url: Any, session: PooledSession):
+        """
+        Drop a session that failed, so the next acquire() reconnects.
+
+        Args:
+            server_url: Server the session belongs to
+            session: Session to drop
+        """
+        sessions = self._sessions.get(server_url, [])
+        if session in sessions:
+            sessions.remove(session)
+            self.stats["reconnects"] += 1
+        # Callers still using it close it on release
+        session.discarded = True
+        if not session.in_use:
+            await self._close(session)
+
+    @asynccontextmanager
+    async def session(self, server_url: Any):
+        """
+        Borrow a connected client for the duration of a block.
+
+        Args:
+            server_url: Server script path, HTTP(S) URL or FastMCP instance
+
+        Yields:
+            Connected FastMCP Client (shared; do not close it)
+        """
+        session = await self.acquire(server_url)
+        try:
+            yield session.client
+        finally:
+            await self.release(session)
+
+    async def close(self):
+        """Close every session in the pool."""
+        sessions = [s for group in self._sessions.values() for s in group]
+        self._sessions.clear()
+        for session in sessions:
+            await self._close(session)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted conversation history for the LLM client.
+
+llm_interactive_mode used to resend the whole history, including every raw
+tool output, on each request, so requests grew with the session until they
+hit the model's context limit. Conversation sends the system prompt and
+the most recent turns verbatim. Once the history is over its token budget,
+the oldest turns are compacted into one line each: what was asked, which
+tools ran and what they returned, and how the model answered. The summary
+is capped as well, so the size of each request stays flat in long sessions.
+
+Tokens are estimated at 4 characters per token unless a counter (e.g. a
+tiktoken encoder) is passed in.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the tokens of a text (about 4 characters per token).
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count
+    """
+    return (len(text) + 3) // 4
+
+
+def shorten(text: str, limit: int) -> str:
+    """Collapse whitespace and cut text to at most limit characters."""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+class Conversation:
+    """Message history of one LLM session, kept within a token budget."""
+
+    # Per-message overhead of the chat format (role, separators)
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_tokens: int = 8000,
+        keep_turns: int = 2,
+        summary_tokens: Optional[int] = None,
+        line_chars: int = 200,
+        count_tokens: Callable[[str], int] = estimate_tokens
+    ):
+        """
+        Initialize the conversation.
+
+        Args:
+            system_prompt: System message, always sent first
+            max_tokens: Token budget of one request's messages
+            keep_turns: Most recent turns always sent verbatim (the turn in
+                        progress counts as one)
+            summary_tokens: Budget of the summary of compacted turns
+                            (default: a quarter of max_tokens)
+            line_chars: Longest summary line per compacted turn
+            count_tokens: Token counter for a piece of text
+        """
+        if keep_turns < 1:
+            raise ValueError("keep_turns must be at least 1")
+
+        self.system = {"role": "system", "content": system_prompt}
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens if summary_tokens is not None else max_tokens // 4
+        self.line_chars = line_chars
+        self.count_tokens = count_tokens
+
+        # Each turn starts with a user message, followed by the assistant
+        # and tool messages that answer it
+        self.turns: List[List[Dict[str, Any]]] = []
+        self.summary: List[str] = []
+        self.omitted_turns = 0
+
+        self.request_tokens: List[int] = []
+        self.stats = {"requests": 0, "compacted_turns": 0, "tokens_saved": 0}
+
+    def append(self, message: Dict[str, Any]):
+        """
+        Add a message; a user message starts a new turn.
+
+        Args:
+            message: Chat message dict
+        """
+        if message["role"] == "user" or not self.turns:
+            self.turns.append([])
+        self.turns[-1].append(message)
+
+    def extend(self, messages: List[Dict[str, Any]]):
+        """Add several messages."""
+        for message in messages:
+            self.append(message)
+
+    def message_tokens(self, message: Dict[str, Any]) -> int:
+        """Estimate the tokens of one message."""
+        tokens = self.MESSAGE_OVERHEAD + self.count_tokens(message.get("content") or "")
+        if message.get("tool_calls"):
+            tokens += self.count_tokens(json.dumps(message["tool_calls"]))
+        return tokens
+
+    def summary_message(self) -> Optional[Dict[str, Any]]:
+        """System message with the summary of compacted turns, if any."""
+        if not self.summary:
+            return None
+        lines = ["Summary of the earlier conversation (tool outputs omitted):"]
+        if self.omitted_turns:
+            lines.append(f"- ({self.omitted_turns} earlier turns omitted)")
+        lines.extend(f"- {line}" for line in self.summary)
+        return {"role": "system", "content": "\n".join(lines)}
+
+    def summarize_turn(self, turn: List[Dict[str, Any]]) -> str:
+        """
+        Condense a turn into one line.
+
+        Args:
+            turn: Messages of the turn
+
+        Returns:
+            Summary line
+        """
+        parts = []
+        names = {}
+        for message in turn:
+            if message["role"] == "user":
+                parts.append(f'User: "{shorten(message.get("content") or "", 80)}"')
+            elif message["role"] == "tool":
+                result = (message.get("content") or "").strip()
+                first_line = result.splitlines()[0] if result else "(no output)"
+                line_count = len(result.splitlines())
+                more = f" (+{line_count - 1} lines)" if line_count > 1 else ""
+                name = names.get(message.get("tool_call_id"), message.get("name", "tool"))
+                parts.append(f"{name} -> {shorten(first_line, 60)}{more}")
+            elif message.get("tool_calls"):
+                for call in message["tool_calls"]:
+                    function = call["function"]
+                    names[call["id"]] = f'{function["name"]}({shorten(function["arguments"], 60)})'
+            elif message.get("content"):
+                parts.append(f'Assistant: "{shorten(message["content"], 80)}"')
+        return shorten("; ".join(parts), self.line_chars)
+
+    def tokens(self) -> int:
+        """Estimate the tokens of the messages a request would send now."""
+        return sum(self.message_tokens(message) for message in self._assemble())
+
+    def _assemble(self) -> List[Dict[str, Any]]:
+        messages = [self.system]
+        summary = self.summary_message()
+        if summary is not None:
+            messages.append(summary)
+        for turn in self.turns:
+            messages.extend(turn)
+        return messages
+
+    def compact(self):
+        """Summarize the oldest turns until the history fits the budget."""
+        while len(self.turns) > self.keep_turns and self.tokens() > self.max_tokens:
+            turn = self.turns.pop(0)
+            before = sum(self.message_tokens(message) for message in turn)
+            line = self.summarize_turn(turn)
+            self.summary.append(line)
+            self.stats["compacted_turns"] += 1
+            self.stats["tokens_saved"] += before - self.count_tokens(line)
+
+            # Keep the summary itself bounded, dropping its oldest lines
+            while len(self.summary) > 1 and self._summary_size() > self.summary_tokens:
+                self.summary.pop(0)
+                self.omitted_turns += 1
+
+    def _summary_size(self) -> int:
+        return self.message_tokens(self.summary_message())
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """
+        Messages for the next request, compacted to the budget.
+
+        Records the request's estimated size in request_tokens.
+
+        Returns:
+            System prompt, summary of compacted turns and recent turns
+        """
+        self.compact()
+        messages = self._assemble()
+        self.request_tokens.append(sum(self.message_tokens(message) for message in messages))
+        self.stats["requests"] += 1
+        return messages
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+LLM backends for LLMClient.
+
+A backend turns a chat request (model, messages, tools) into a stream of
+deltas shaped like the choices[0].delta objects of the OpenAI streaming API:
+
+    {"content": "The program"}
+    {"tool_calls": [{"index": 0, "id": "call_0",
+                     "function": {"name": "run_python", "arguments": "{\\"file"}}]}
+
+OpenAIBackend talks to OpenAI or any OpenAI-compatible endpoint.
+ScriptedBackend is a deterministic fake that needs no network or API key:
+it replays canned responses and otherwise picks tools with simple rules,
+so llm_interactive_mode can run against a real MCP server offline (in
+tests and in benchmarks/agent_loop_benchmark.py).
+"""
+
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+
+class LLMBackend(ABC):
+    """Source of streamed chat completions."""
+
+    @abstractmethod
+    def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the response to a chat request.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            tools: OpenAI tool definitions, if the model may call tools
+
+        Yields:
+            Delta dicts with "content" and/or "tool_calls"
+        """
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI, or any OpenAI-compatible API, through the openai package."""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            api_key: API key
+            base_url: OpenAI-compatible API URL (if None, reads from
+                      OPENAI_BASE_URL, falling back to the OpenAI API)
+        """
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise ImportError(
+                "OpenAI package required. Install with: pip install openai"
+            )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    async def stream(self, model, messages, tools=None):
+        kwargs = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+        }
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+
+        stream = await self.client.chat.completions.create(**kwargs)
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            event = {}
+            if delta.content:
+                event["content"] = delta.content
+            if delta.tool_calls:
+                event["tool_calls"] = [
+                    {
+                        "index": part.index,
+                        "id": part.id,
+                        "function": {
+                            "name": part.function.name if part.function else None,
+                            "arguments": part.function.arguments if part.function else None,
+                        },
+                    }
+                    for part in delta.tool_calls
+                ]
+            if event:
+                yield event
+
+
+# File names mentioned in a prompt, e.g. "run python_projects/hello.py"
+FILE_NAME = re.compile(r"[\w./\\-]+\.py\b")
+
+Response = Dict[str, Any]
+
+
+def default_response(messages: List[Dict[str, Any]], tools: Optional[list] = None) -> Response:
+    """
+    Rule-based reply used by ScriptedBackend when no canned response is left.
+
+    After tool results it reports the first line of each; otherwise it runs
+    every .py file named in the last user message, lists files when asked
+    to, or answers with a short help text.
+
+    Args:
+        messages: Chat messages of the request
+        tools: Tool definitions of the request (None: tools not allowed)
+
+    Returns:
+        Response dict with content and tool_calls
+    """
+    if messages and messages[-1]["role"] == "tool":
+        results = []
+        for message in reversed(messages):
+            if message["role"] != "tool":
+                break
+            lines = (message.get("content") or "").strip().splitlines()
+            results.append(f"{message.get('name', 'tool')}: {lines[0] if lines else '(no output)'}")
+        return {"content": "Done. " + "; ".join(reversed(results)), "tool_calls": []}
+
+    prompt = next((m.get("content") or "" for m in reversed(messages) if m["role"] == "user"), "")
+    if tools:
+        files = FILE_NAME.findall(prompt)
+        if files:
+            return {
+                "content": None,
+                "tool_calls": [{"name": "run_python", "arguments": {"file_name": name}} for name in files],
+            }
+        if re.search(r"\b(list|show|files)\b", prompt, re.IGNORECASE):
+            return {"content": None, "tool_calls": [{"name": "list_python_files", "arguments": {}}]}
+    return {"content": "I can run a Python file (name it, e.g. hello.py) or list the files.", "tool_calls": []}
+
+
+class ScriptedBackend(LLMBackend):
+    """Deterministic offline fake that replays canned responses."""
+
+    def __init__(
+        self,
+        responses: Optional[List[Union[Response, Callable[..., Response]]]] = None,
+        chunk_size: int = 16,
+        encode_requests: bool = True,
+        latency: float = 0.0
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            responses: Responses returned in order, each a dict with content
+                       and tool_calls (dicts with name and arguments) or a
+                       function of (messages, tools) returning one; once
+                       used up, default_response answers
+            chunk_size: Characters per streamed text or argument delta
+            encode_requests: Serialize each request to JSON, as a real API
+                             client does (counted in request_bytes)
+            latency: Seconds before the first delta, like a model's time to
+                     first token
+        """
+        self.responses = list(responses or [])
+        self.chunk_size = chunk_size
+        self.encode_requests = encode_requests
+        self.latency = latency
+        self.requests: List[Dict[str, Any]] = []
+        self.request_bytes: List[int] = []
+
+    def _pieces(self, text: str) -> List[str]:
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    async def stream(self, model, messages, tools=None):
+        request = {"model": model, "messages": list(messages), "tools": tools}
+        self.requests.append(request)
+        if self.encode_requests:
+            self.request_bytes.append(len(json.dumps(request)))
+
+        response = self.responses.pop(0) if self.responses else default_response
+        if callable(response):
+            response = response(messages, tools)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        for piece in self._pieces(response.get("content") or ""):
+            # Yield to the event loop between chunks, like a network stream
+            await asyncio.sleep(0)
+            yield {"content": piece}
+
+        for index, call in enumerate(response.get("tool_calls") or []):
+            await asyncio.sleep(0)
+            yield {"tool_calls": [{
+                "index": index,
+                "id": f"call_{len(self.requests)}_{index}",
+                "function": {"name": call["name"], "arguments": ""},
+            }]}
+            for piece in self._pieces(json.dumps(call.get("arguments", {}))):
+                await asyncio.sleep(0)
+                yield {"tool_calls": [{"index": index, "function": {"arguments": piece}}]}
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Client-side load balancing across identical MCP servers.
+
+Given several server URLs (e.g. one per run_http_server.py instance),
+LoadBalancer keeps a client per endpoint and sends each call to the
+endpoint with the fewest requests in flight (least outstanding requests),
+so a server busy with long executions stops receiving new ones while the
+others are free.
+
+Failing endpoints are ejected for a while:
+
+- connection failures: after failure_threshold consecutive failures. An
+  endpoint that cannot be connected to at all is ejected at once, and the
+  call moves to another endpoint, since nothing was sent.
+- admission rejections (overloaded, rate limited or draining servers): the
+  endpoint is ejected and the call moves on, since it never started there.
+  Endpoint clients report them as ServerRejection, raised only for results
+  carrying the server's rejection marker, so script output is never
+  mistaken for one.
+- failed health checks: idle endpoints are pinged every
+  health_check_interval seconds.
+
+Each ejection of the same endpoint lasts twice as long as the previous one,
+up to max_ejection_time; a success resets it. When every endpoint is
+ejected, calls go to the one whose ejection ends first rather than failing.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+
+from retry import RetryPolicy, ServerRejection, is_connection_error
+
+
+class Endpoint:
+    """One server and its routing state."""
+
+    def __init__(self, url: Any, client: Any):
+        self.url = url
+        self.client = client
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.stats = {"requests": 0, "failures": 0, "ejections": 0}
+
+    def available(self, now: float) -> bool:
+        """Check whether the endpoint may receive calls."""
+        return now >= self.ejected_until
+
+
+class LoadBalancer:
+    """Least-outstanding-requests routing with ejection of failing endpoints."""
+
+    def __init__(
+        self,
+        server_urls: List[Any],
+        client_factory: Callable[[Any], Any],
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 2,
+        ejection_time: float = 10.0,
+        max_ejection_time: float = 120.0,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 5.0,
+    ):
+        """
+        Initialize the balancer.
+
+        Args:
+            server_urls: Endpoints serving the same files
+            client_factory: Creates the (unconnected) RmiMcpClient for a URL,
+                            with raise_rejections set
+            retry: Attempts and backoff when every endpoint failed or was
+                   rejected; retry_run_python allows moving run_python to
+                   another endpoint after its connection dropped mid-call
+            failure_threshold: Consecutive connection failures before ejection
+            ejection_time: Seconds of the first ejection
+            max_ejection_time: Upper bound for repeated ejections
+            health_check_interval: Seconds between pings of idle endpoints
+                                   (0 disables active health checks)
+            health_check_timeout: Seconds a ping may take
+        """
+        if not server_urls:
+            raise ValueError("At least one server URL is required")
+        self.endpoints = [Endpoint(url, client_factory(url)) for url in server_urls]
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = max(1, failure_threshold)
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._health_task: Optional[asyncio.Task] = None
+
+    def pick(self, exclude: tuple = ()) -> Endpoint:
+        """
+        Choose the endpoint for the next call.
+
+        Args:
+            exclude: Endpoints already tried for this call (used only while
+                     others are available)
+
+        Returns:
+            The available endpoint with the fewest outstanding requests
+            (random among ties), or the one whose ejection ends first
+        """
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.available(now) and e not in exclude]
+        if not candidates:
+            candidates = [e for e in self.endpoints if e.available(now)]
+        if not candidates:
+            return min(self.endpoints, key=lambda e: e.ejected_until)
+        fewest = min(e.outstanding for e in candidates)
+        return random.choice([e for e in candidates if e.outstanding == fewest])
+
+    def eject(self, endpoint: Endpoint, duration: Optional[float] = None):
+        """
+        Stop routing to an endpoint for a while.
+
+        Args:
+            endpoint: Endpoint to eject
+            duration: Seconds (default: ejection_time, doubled per repeated ejection)
+        """
+        if duration is None:
+            duration = min(self.max_ejection_time, self.ejection_time * 2 ** endpoint.ejections)
+        endpoint.ejections += 1
+        endpoint.stats["ejections"] += 1
+        endpoint.ejected_until = time.monotonic() + duration
+
+    def record_success(self, endpoint: Endpoint):
+        """Reset the failure state of an endpoint after a successful call."""
+        endpoint.consecutive_failures = 0
+        endpoint.ejections = 0
+
+    def record_failure(self, endpoint: Endpoint, eject: bool = False):
+        """
+        Count a failed call, ejecting the endpoint at failure_threshold.
+
+        Args:
+            endpoint: Endpoint that failed
+            eject: Eject immediately regardless of the threshold
+        """
+        endpoint.consecutive_failures += 1
+        endpoint.stats["failures"] += 1
+        if eject or endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.consecutive_failures = 0
+            self.eject(endpoint)
+
+    async def call(self, operation: Callable[[Any], Awaitable[Any]], idempotent: bool = True) -> Any:
+        """
+        Run a request on the best endpoint, moving to others on failure.
+
+        Args:
+            operation: Async function taking an endpoint's RmiMcpClient
+            idempotent: Whether the request may be repeated elsewhere after
+                        its connection dropped mid-call
+
+        Returns:
+            Result of the operation (or the last rejection if every attempt
+            was rejected)
+        """
+        attempts = max(self.retry.max_attempts, len(self.endpoints))
+        tried = []
+        for attempt in range(1, attempts + 1):
+            if len(tried) == len(self.endpoints):
+                # Every endpoint failed or refused this call; back off
+                tried = []
+                await asyncio.sleep(self.retry.delay(attempt))
+            endpoint = self.pick(tuple(tried))
+            tried.append(endpoint)
+            endpoint.outstanding += 1
+            endpoint.stats["requests"] += 1
+            try:
+                try:
+                    await endpoint.client.ensure_connected()
+                except Exception as e:
+                    # Nothing was sent, so another endpoint can take the call
+                    if not is_connection_error(e) or attempt == attempts:
+                        raise
+                    self.record_failure(endpoint, eject=True)
+                    continue
+
+                try:
+                    result = await operation(endpoint.client)
+                except ServerRejection as e:
+                    # Rejected before running: let the others take it
+                    endpoint.stats["failures"] += 1
+                    self.eject(endpoint, e.retry_after or None)
+                    if attempt == attempts:
+                        return e.text
+                    continue
+                except Exception as e:
+                    if not is_connection_error(e):
+                        raise
+                    self.record_failure(endpoint)
+                    if not idempotent or attempt == attempts:
+                        raise
+                    continue
+            finally:
+                endpoint.outstanding -= 1
+
+            self.record_success(endpoint)
+            return result
+
+    async def health_check(self):
+        """Ping every idle, non-ejected endpoint and eject those that fail."""
+        now = time.monotonic()
+
+        async def check(endpoint: Endpoint):
+            try:
+                await asyncio.wait_for(endpoint.client.ping(), self.health_check_timeout)
+            except Exception:
+                self.record_failure(endpoint, eject=True)
+
+        await asyncio.gather(*(
+            check(e) for e in self.endpoints if e.available(now) and not e.outstanding
+        ))
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.health_check()
+
+    def status(self) -> List[dict]:
+        """
+        Describe the routing state of every endpoint.
+
+        Returns:
+            One dict per endpoint with url, outstanding, ejected (seconds
+            left, 0 if routable) and request/failure/ejection counts
+        """
+        now = time.monotonic()
+        return [
+            {
+                "url": e.url,
+                "outstanding": e.outstanding,
+                "ejected": round(max(0.0, e.ejected_until - now), 1),
+                **e.stats,
+            }
+            for e in self.endpoints
+        ]
+
+    async def __aenter__(self):
+        """Connect to every endpoint; unreachable ones start out ejected."""
+        results = await asyncio.gather(
+            *(e.client.__aenter__() for e in self.endpoints), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == len(self.endpoints):
+            raise errors[0]
+        for endpoint, result in zip(self.endpoints, results):
+            if isinstance(result, BaseException):
+                self.record_failure(endpoint, eject=True)
+
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for endpoint in self.endpoints:
+            try:
+                await endpoint.client.__aexit__(None, None, None)
+            except Exception:
+                # Endpoint was never reachable or its stream is already gone
+                pass
@@ -9,9 +9,26 @@ Author: Based on PRD specification
 """
 
 import asyncio
+import fnmatch
+import statistics
 import sys
-from typing import Optional
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from connection_pool import ConnectionPool, PooledSession, build_transport
+from load_balancer import LoadBalancer
+from retry import RetryPolicy, ServerRejection, admission_rejection, is_connection_error
+from tool_cache import ToolCache
+
+
+def _result_text(result) -> Optional[str]:
+    """Text of the first content block of a tool result, if any."""
+    content = getattr(result, "content", None)
+    if content and len(content) > 0:
+        return content[0].text
+    return None
 
 
 class RmiMcpClient:
@@ -19,7 +36,15 @@ class RmiMcpClient:
     Client for interacting with RmiAgentMcpServer.
     """
     
-    def __init__(self, server_url: str):
+    def __init__(
+        self,
+        server_url: Union[str, List[str]],
+        compression: bool = True,
+        pool: Optional[ConnectionPool] = None,
+        retry: Optional[RetryPolicy] = None,
+        tools_ttl: Optional[float] = 300.0,
+        raise_rejections: bool = False
+    ):
         """
         Initialize the MCP client.
         
@@ -27,47 +52,292 @@ class RmiMcpClient:
             server_url: URL or path to the MCP server
                        - For local: path to server script (e.g., "../server/mcp_server.py")
                        - For HTTP: URL with /sse endpoint (e.g., "http://localhost:8000/sse")
+                         or /mcp endpoint for streamable HTTP (e.g., "http://localhost:8000/mcp")
                        - For ngrok: ngrok URL (e.g., "https://abc123.ngrok.io/sse")
+                       - A list of identical servers: calls are spread across them
+                         (see load_balancer.py); the balancer is self.balancer
+            compression: Accept compressed (gzip/zstd) HTTP responses. They are
+                         decoded transparently; set to False to request identity.
+            pool: Borrow a warm session from this pool instead of connecting.
+                  The session stays open for other callers on exit.
+            retry: Reconnect and retry policy (default: RetryPolicy(), which
+                   retries list_tools and list_python_files but not run_python)
+            tools_ttl: Seconds the tool list is cached, unless the server
+                       reports a change first (None: no expiry, 0: no cache).
+                       Pooled sessions use the pool's setting.
+            raise_rejections: Raise ServerRejection for calls the server
+                              still rejects after the retries, instead of
+                              returning the rejection text
         """
         self.server_url = server_url
+        self.compression = compression
+        self.pool = pool
+        self.retry = retry or RetryPolicy()
+        self.tools_ttl = tools_ttl
+        self.raise_rejections = raise_rejections
+        self.tool_cache: Optional[ToolCache] = None
         self.client = None
+        self._session: Optional[PooledSession] = None
+        # Session that failed; replaced before its next use
+        self._failed_client = None
+        self._reconnect_lock = asyncio.Lock()
+        self.stats = {"reconnects": 0, "retries": 0}
+        
+        self.balancer: Optional[LoadBalancer] = None
+        if isinstance(server_url, (list, tuple)):
+            if len(server_url) == 1:
+                self.server_url = server_url[0]
+            else:
+                # The balancer retries on other endpoints, each endpoint tries once
+                endpoint_retry = RetryPolicy(
+                    max_attempts=1,
+                    retry_run_python=self.retry.retry_run_python
+                )
+                self.balancer = LoadBalancer(
+                    list(server_url),
+                    lambda url: RmiMcpClient(
+                        url, compression, pool, endpoint_retry, tools_ttl, raise_rejections=True
+                    ),
+                    retry=self.retry
+                )
+    
+    def _build_transport(self):
+        """
+        Build the transport for the server URL.
+        
+        Returns:
+            A FastMCP transport, or the server URL itself to let FastMCP infer it
+        """
+        return build_transport(self.server_url, self.compression)
+    
+    async def _connect(self):
+        if self.pool is not None:
+            self._session = await self.pool.acquire(self.server_url)
+            self.client = self._session.client
+            self.tool_cache = self._session.tool_cache
+            return
+        
+        # A new session may have missed list_changed notifications
+        self.tool_cache = ToolCache(self.tools_ttl)
+        self.client = Client(self._build_transport(), message_handler=self.tool_cache)
+        await self.client.__aenter__()
+    
+    async def _disconnect(self, failed: bool = False):
+        if self._session is not None:
+            session, self._session = self._session, None
+            if failed or not session.client.is_connected():
+                await self.pool.discard(self.server_url, session)
+            await self.pool.release(session)
+            return
+        
+        if self.client:
+            try:
+                await self.client.__aexit__(None, None, None)
+            except Exception:
+                # Closing a session whose stream is already gone
+                if not failed:
+                    raise
+    
+    async def reconnect(self):
+        """
+        Replace the current session with a new one.
+        
+        Connecting is attempted up to retry.max_attempts times with backoff.
+        
+        Raises:
+            Exception: The last connection error if every attempt failed
+        """
+        await self._disconnect(failed=True)
+        self.client = None
+        self.stats["reconnects"] += 1
+        for attempt in range(1, self.retry.max_attempts + 1):
+            try:
+                await self._connect()
+                return
+            except Exception as e:
+                if attempt == self.retry.max_attempts or not is_connection_error(e):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+    
+    def _usable(self, client) -> bool:
+        return client is not None and client is not self._failed_client and client.is_connected()
+    
+    async def ensure_connected(self):
+        """
+        Reconnect if the session is closed or failed; no-op otherwise.
+        
+        Concurrent callers that saw the same failure reconnect only once.
+        """
+        async with self._reconnect_lock:
+            if not self._usable(self.client):
+                await self.reconnect()
+    
+    async def _call(self, operation, idempotent: bool):
+        """
+        Run a request, reconnecting and retrying after connection errors.
+        
+        Args:
+            operation: Async function taking the connected FastMCP client
+            idempotent: Whether the request may be repeated after a
+                        connection error
+        
+        Calls rejected by the server's admission control are retried as
+        well, after the delay the server asked for.
+        
+        Returns:
+            Result of the operation (the rejection, if every attempt was
+            rejected)
+        
+        Raises:
+            ServerRejection: If every attempt was rejected and raise_rejections is set
+            ToolError: If the tool reported any other error
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self._usable(self.client):
+                await self.ensure_connected()
+            client = self.client
+            try:
+                result = await operation(client)
+            except Exception as e:
+                if not is_connection_error(e) and client.is_connected():
+                    raise
+                # Reconnect before the next call, whether or not this one is retried
+                self._failed_client = client
+                if not idempotent or attempt >= self.retry.max_attempts:
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            
+            rejection = admission_rejection(result)
+            if rejection is None:
+                if getattr(result, "is_error", False):
+                    raise ToolError(_result_text(result) or "Tool call failed")
+                return result
+            retry_after = rejection.get("retry_after")
+            if retry_after is None or attempt >= self.retry.max_attempts:
+                if self.raise_rejections:
+                    raise ServerRejection(
+                        _result_text(result) or "Call rejected",
+                        rejection.get("reason", ""), retry_after
+                    )
+                return result
+            # The server's marker says it was rejected before running, so it
+            # is safe to repeat even for run_python
+            self.stats["retries"] += 1
+            await asyncio.sleep(max(retry_after, self.retry.delay(attempt)))
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.client = Client(self.server_url)
-        await self.client.__aenter__()
+        if self.balancer is not None:
+            await self.balancer.__aenter__()
+            return self
+        await self._connect()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        if self.balancer is not None:
+            await self.balancer.__aexit__(exc_type, exc_val, exc_tb)
+            return
+        
+        if self._session is not None:
+            await self._disconnect()
+            return
+        
         if self.client:
             await self.client.__aexit__(exc_type, exc_val, exc_tb)
     
-    async def list_tools(self):
+    async def ping(self):
+        """
+        Check that the server responds.
+        
+        Any reply counts, including an error from servers that do not
+        implement ping.
+        
+        Raises:
+            Exception: If the server cannot be reached
+        """
+        if self.balancer is not None:
+            await self.balancer.call(lambda client: client.ping())
+            return
+        try:
+            await self._call(lambda client: client.ping(), idempotent=True)
+        except Exception as e:
+            # Servers that do not implement ping still answered
+            if is_connection_error(e):
+                raise
+    
+    async def list_tools(self, refresh: bool = False):
         """
         List all available tools on the server.
         
+        The list is cached until the server reports a change or tools_ttl
+        expires.
+        
+        Args:
+            refresh: Fetch the list from the server even if it is cached
+        
         Returns:
             List of tool definitions
         """
-        return await self.client.list_tools()
+        if self.balancer is not None:
+            return await self.balancer.call(lambda client: client.list_tools(refresh))
+        
+        tools = None if refresh or self.tool_cache is None else self.tool_cache.get()
+        if tools is None:
+            tools = await self._call(lambda client: client.list_tools(), idempotent=True)
+            self.tool_cache.store(tools)
+        return tools
     
-    async def run_python(self, file_name: str) -> str:
+    async def tool_schemas(self, build: Callable[[List[Any]], Any]) -> Any:
+        """
+        Get a value derived from the tool list, cached along with it.
+        
+        Args:
+            build: Function converting the tool list (e.g. to LLM function
+                   schemas); also the cache key
+        
+        Returns:
+            build(tools), rebuilt only when the tool list changes
+        """
+        if self.balancer is not None:
+            return await self.balancer.call(lambda client: client.tool_schemas(build))
+        
+        await self.list_tools()
+        return self.tool_cache.derived(build)
+    
+    async def run_python(self, file_name: str, timeout: Optional[float] = None) -> str:
         """
         Execute a Python file on the server.
         
         Args:
             file_name: Path to the Python file to execute
+            timeout: Seconds before the server kills the run (capped by the
+                     server maximum; server default if None)
         
         Returns:
             Output from the Python execution
         """
-        result = await self.client.call_tool("run_python", {"file_name": file_name})
+        if self.balancer is not None:
+            return await self.balancer.call(
+                lambda client: client.run_python(file_name, timeout),
+                idempotent=self.retry.retry_run_python
+            )
+        
+        args = {"file_name": file_name}
+        if timeout is not None:
+            args["timeout"] = timeout
+        result = await self._call(
+            lambda client: client.call_tool("run_python", args, raise_on_error=False),
+            idempotent=self.retry.retry_run_python
+        )
         
         # Extract text content from result
-        if result.content and len(result.content) > 0:
-            return result.content[0].text
-        return "(No output)"
+        text = _result_text(result)
+        return text if text is not None else "(No output)"
     
     async def list_python_files(self, directory: Optional[str] = None) -> str:
         """
@@ -79,23 +349,58 @@ class RmiMcpClient:
         Returns:
             List of Python files
         """
+        if self.balancer is not None:
+            return await self.balancer.call(lambda client: client.list_python_files(directory))
+        
         args = {}
         if directory:
             args["directory"] = directory
         
-        result = await self.client.call_tool("list_python_files", args)
+        result = await self._call(
+            lambda client: client.call_tool("list_python_files", args, raise_on_error=False),
+            idempotent=True
+        )
+        
+        text = _result_text(result)
+        return text if text is not None else "(No files found)"
+    
+    async def call_tool(self, name: str, args: Optional[Dict[str, Any]] = None, idempotent: bool = False) -> str:
+        """
+        Call any server tool by name.
         
-        if result.content and len(result.content) > 0:
-            return result.content[0].text
-        return "(No files found)"
+        Args:
+            name: Tool name (e.g. "search_python_files")
+            args: Tool arguments
+            idempotent: Whether the call may be repeated after a connection error
+        
+        Returns:
+            Text output of the tool
+        """
+        if self.balancer is not None:
+            return await self.balancer.call(
+                lambda client: client.call_tool(name, args, idempotent),
+                idempotent=idempotent
+            )
+        
+        result = await self._call(
+            lambda client: client.call_tool(name, args or {}, raise_on_error=False),
+            idempotent=idempotent
+        )
+        
+        text = _result_text(result)
+        return text if text is not None else "(No output)"
 
 
-async def interactive_mode(server_url: str):
+async def interactive_mode(server_url: Union[str, List[str]], retry: Optional[RetryPolicy] = None):
     """
     Run the client in interactive mode.
     
+    A command that fails (e.g. because the connection dropped and could not
+    be retried) is reported and the loop continues on a new connection.
+    
     Args:
         server_url: URL or path to the MCP server
+        retry: Reconnect and retry policy (see RmiMcpClient)
     """
     print("=" * 60)
     print("RmiAgentMcpServer - Interactive Client")
@@ -104,7 +409,7 @@ async def interactive_mode(server_url: str):
     print()
     
     try:
-        async with RmiMcpClient(server_url) as client:
+        async with RmiMcpClient(server_url, retry=retry) as client:
             print("✓ Connected successfully!")
             print()
             
@@ -134,35 +439,40 @@ async def interactive_mode(server_url: str):
                     print("Goodbye!")
                     break
                 
-                elif choice == '1':
-                    file_name = input("Enter Python file path: ").strip()
-                    if file_name:
-                        print(f"\nExecuting: {file_name}")
-                        print("-" * 60)
-                        output = await client.run_python(file_name)
+                try:
+                    if choice == '1':
+                        file_name = input("Enter Python file path: ").strip()
+                        if file_name:
+                            print(f"\nExecuting: {file_name}")
+                            print("-" * 60)
+                            output = await client.run_python(file_name)
+                            print(output)
+                            print("-" * 60)
+                    
+                    elif choice == '2':
+                        directory = input("Enter directory (or press Enter for default): ").strip()
+                        directory = directory if directory else None
+                        print()
+                        output = await client.list_python_files(directory)
                         print(output)
-                        print("-" * 60)
-                
-                elif choice == '2':
-                    directory = input("Enter directory (or press Enter for default): ").strip()
-                    directory = directory if directory else None
-                    print()
-                    output = await client.list_python_files(directory)
-                    print(output)
-                
-                elif choice == '3':
-                    tools_result = await client.list_tools()
-                    # Handle both list and object with .tools attribute
-                    tools = tools_result.tools if hasattr(tools_result, 'tools') else tools_result
-                    print("Available tools:")
-                    for tool in tools:
-                        print(f"\n  Tool: {tool.name}")
-                        print(f"  Description: {tool.description}")
-                        if hasattr(tool, 'inputSchema'):
-                            print(f"  Input Schema: {tool.inputSchema}")
-                
-                else:
-                    print("Invalid command. Please try again.")
+                    
+                    elif choice == '3':
+                        tools_result = await client.list_tools()
+                        # Handle both list and object with .tools attribute
+                        tools = tools_result.tools if hasattr(tools_result, 'tools') else tools_result
+                        print("Available tools:")
+                        for tool in tools:
+                            print(f"\n  Tool: {tool.name}")
+                            print(f"  Description: {tool.description}")
+                            if hasattr(tool, 'inputSchema'):
+                                print(f"  Input Schema: {tool.inputSchema}")
+                    
+                    else:
+                        print("Invalid command. Please try again.")
+                    
+                except Exception as e:
+                    # The client reconnects on the next command
+                    print(f"✗ Error: {type(e).__name__}: {str(e)}")
                 
                 print()
     
@@ -175,19 +485,29 @@ async def interactive_mode(server_url: str):
         traceback.print_exc()
 
 
-async def run_single_command(server_url: str, file_name: str):
+async def run_single_command(
+    server_url: Union[str, List[str]],
+    file_name: str,
+    pool: Optional[ConnectionPool] = None,
+    timeout: Optional[float] = None,
+    retry: Optional[RetryPolicy] = None
+):
     """
     Run a single Python file and exit.
     
     Args:
         server_url: URL or path to the MCP server
         file_name: Path to the Python file to execute
+        pool: Reuse a warm session from this pool (e.g. when a script runs
+              many files one after another)
+        timeout: Per-run timeout in seconds (server default if None)
+        retry: Reconnect and retry policy (see RmiMcpClient)
     """
     try:
-        async with RmiMcpClient(server_url) as client:
+        async with RmiMcpClient(server_url, pool=pool, retry=retry) as client:
             print(f"Executing: {file_name}")
             print("-" * 60)
-            output = await client.run_python(file_name)
+            output = await client.run_python(file_name, timeout=timeout)
             print(output)
             print("-" * 60)
     
@@ -196,6 +516,139 @@ async def run_single_command(server_url: str, file_name: str):
         sys.exit(1)
 
 
+GLOB_CHARS = "*?["
+
+
+def parse_file_list(output: str) -> Tuple[str, List[str]]:
+    """
+    Parse the output of the list_python_files tool.
+    
+    Args:
+        output: Tool output ("Python files in <dir>:" followed by "  - <path>" lines)
+    
+    Returns:
+        Tuple of (directory, paths relative to it); empty if no files were found
+    """
+    lines = output.splitlines()
+    if not lines or not lines[0].startswith("Python files in "):
+        return "", []
+    directory = lines[0][len("Python files in "):].rstrip(":")
+    return directory, [line.strip()[2:] for line in lines[1:] if line.strip().startswith("- ")]
+
+
+async def expand_file_patterns(client: RmiMcpClient, patterns: List[str]) -> List[str]:
+    """
+    Expand glob patterns against the files on the server.
+    
+    Patterns are matched against both the full path and the path relative
+    to the server's directory (e.g. "*.py", "tests/test_*.py"). Arguments
+    without glob characters are passed through unchanged.
+    
+    Args:
+        client: Connected client
+        patterns: File names and glob patterns
+    
+    Returns:
+        File names in argument order, without duplicates
+    """
+    available = None
+    files = []
+    for pattern in patterns:
+        if not any(char in pattern for char in GLOB_CHARS):
+            matches = [pattern]
+        else:
+            if available is None:
+                directory, relative_paths = parse_file_list(await client.list_python_files())
+                available = [(rel, f"{directory.rstrip('/')}/{rel}") for rel in relative_paths]
+            matches = [
+                full for rel, full in available
+                if fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(full, pattern)
+            ]
+            if not matches:
+                print(f"Warning: no files on the server match {pattern!r}", file=sys.stderr)
+        for path in matches:
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def is_failure(output: str) -> bool:
+    """Check whether run_python output reports a failed run."""
+    return output.startswith("Error") or "\n[Process exited with code " in output
+
+
+async def run_files(
+    server_url: Union[str, List[str]],
+    patterns: List[str],
+    concurrency: int = 4,
+    timeout: Optional[float] = None,
+    retry: Optional[RetryPolicy] = None
+) -> int:
+    """
+    Run many Python files concurrently over a single connection.
+    
+    Results are printed as each run completes, followed by a summary.
+    
+    Args:
+        server_url: URL or path to the MCP server, or a list of identical
+                    servers to spread the runs across
+        patterns: File names and glob patterns
+        concurrency: Maximum number of runs in flight
+        timeout: Per-run timeout passed to the server (server default if None)
+        retry: Reconnect and retry policy (see RmiMcpClient)
+    
+    Returns:
+        Number of failed runs
+    """
+    async with RmiMcpClient(server_url, retry=retry) as client:
+        files = await expand_file_patterns(client, patterns)
+        if not files:
+            print("No files to run")
+            return 0
+        
+        slots = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(file_name: str):
+            async with slots:
+                start = time.perf_counter()
+                try:
+                    output = await client.run_python(file_name, timeout=timeout)
+                except Exception as e:
+                    output = f"Error: {type(e).__name__}: {str(e)}"
+                return file_name, output, time.perf_counter() - start
+        
+        print(f"Running {len(files)} file(s) with concurrency {concurrency}")
+        started = time.perf_counter()
+        durations, failed = [], []
+        for completed in asyncio.as_completed([run_one(f) for f in files]):
+            file_name, output, duration = await completed
+            durations.append(duration)
+            status = "FAIL" if is_failure(output) else "ok"
+            if status == "FAIL":
+                failed.append(file_name)
+            print("-" * 60)
+            print(f"[{status} {duration:.2f}s] {file_name}")
+            print(output.rstrip())
+        wall_time = time.perf_counter() - started
+        endpoints = client.balancer.status() if client.balancer is not None else []
+    
+    print("=" * 60)
+    print(f"Files: {len(files)}  Succeeded: {len(files) - len(failed)}  Failed: {len(failed)}")
+    print(
+        f"Wall time: {wall_time:.2f}s  Run time: total {sum(durations):.2f}s, "
+        f"min {min(durations):.2f}s, median {statistics.median(durations):.2f}s, "
+        f"max {max(durations):.2f}s"
+    )
+    for endpoint in endpoints:
+        print(
+            f"  Server {endpoint['url']}: {endpoint['requests']} requests, "
+            f"{endpoint['failures']} failures, {endpoint['ejections']} ejections"
+        )
+    for file_name in failed:
+        print(f"  FAILED: {file_name}")
+    return len(failed)
+
+
 def main():
     """
     Main entry point for the client.
@@ -213,32 +666,82 @@ Examples:
   # Interactive mode with HTTP server
   python mcp_client.py --server http://localhost:8000/sse
   
+  # Interactive mode with streamable HTTP server (--transport http)
+  python mcp_client.py --server http://localhost:8000/mcp
+  
   # Interactive mode with ngrok
   python mcp_client.py --server https://abc123.ngrok.io/sse
   
   # Run single file
   python mcp_client.py --server ../server/mcp_server.py --file test.py
+  
+  # Run several files and glob patterns (matched on the server), 8 at a time
+  python mcp_client.py --server http://localhost:8000/mcp --file "tests/*.py" a.py --concurrency 8
+  
+  # Spread runs across several identical servers (least outstanding requests)
+  python mcp_client.py --server http://localhost:8000/mcp http://localhost:8001/mcp --file "*.py"
         """
     )
     
     parser.add_argument(
         "--server",
         required=True,
-        help="Server URL or path (local script, http://..., or https://...)"
+        nargs="+",
+        help="Server URL or path (local script, http://..., or https://...); "
+             "several identical servers to spread runs across them"
     )
     
     parser.add_argument(
         "--file",
-        help="Python file to execute (single command mode)"
+        nargs="+",
+        help="Python file(s) or glob patterns to execute (single command mode)"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Files run at the same time with several --file arguments (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Per-run timeout in seconds (default: server setting)"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries after a dropped connection or rate limit (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--retry-run-python",
+        action="store_true",
+        help="Also retry run_python after a dropped connection (the file may run twice)"
     )
     
     args = parser.parse_args()
     
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries must not be negative")
+    retry = RetryPolicy(max_attempts=args.retries + 1, retry_run_python=args.retry_run_python)
+    server = args.server[0] if len(args.server) == 1 else args.server
+    
     # Run appropriate mode
-    if args.file:
-        asyncio.run(run_single_command(args.server, args.file))
+    if args.file and len(args.file) == 1 and not any(c in args.file[0] for c in GLOB_CHARS):
+        asyncio.run(run_single_command(server, args.file[0], timeout=args.timeout, retry=retry))
+    elif args.file:
+        failed = asyncio.run(
+            run_files(server, args.file, args.concurrency, args.timeout, retry=retry)
+        )
+        sys.exit(1 if failed else 0)
     else:
-        asyncio.run(interactive_mode(args.server))
+        asyncio.run(interactive_mode(server, retry=retry))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ and automatically select the right tool and parameters.
 Usage:
     export OPENAI_API_KEY='your-key-here'
     python mcp_client_llm.py --server <server-url>
+    python mcp_client_llm.py --server <server-url> --batch prompts.txt --output results.jsonl
 
 Example prompts:
     - "Run the hello world program"
@@ -20,93 +21,527 @@ import sys
 import os
 import asyncio
 import json
+import statistics
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 
 # Add client directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from mcp_client import RmiMcpClient
+from connection_pool import ConnectionPool
+from llm_backends import LLMBackend, OpenAIBackend, ScriptedBackend
+from conversation import Conversation
+from output_condenser import OutputStore
+from speculation import Speculator
+
+
+class ToolCall:
+    """A tool call requested by the LLM, assembled from streamed deltas."""
+    
+    def __init__(self, index: int):
+        self.index = index
+        self.id: Optional[str] = None
+        self.name = ""
+        self.arguments = ""
+        # Set when the call is started (see LLMClient.call_llm)
+        self.task: Optional[asyncio.Task] = None
+    
+    def parsed_arguments(self) -> Optional[Dict[str, Any]]:
+        """
+        Parse the arguments if they form a complete JSON object.
+        
+        Returns:
+            Argument dict, or None while the arguments are still incomplete
+        """
+        text = self.arguments.strip() or "{}"
+        if not text.endswith("}"):
+            return None
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
 
 
 class LLMClient:
     """
     Wrapper for LLM API calls.
-    Supports OpenAI and Gemini.
+    Supports OpenAI and any OpenAI-compatible endpoint (e.g. Gemini), or any
+    other LLMBackend (such as the offline ScriptedBackend).
+    
+    Calls are asynchronous and streamed, so the event loop (and with it the
+    MCP session) keeps running while the model is generating.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        backend: Optional[LLMBackend] = None
+    ):
         """
         Initialize LLM client.
         
         Args:
             api_key: API key (if None, reads from OPENAI_API_KEY env var)
             model: Model to use (gpt-4o-mini, gpt-4, gemini-2.5-flash, etc.)
+            base_url: OpenAI-compatible API URL (if None, reads from
+                      OPENAI_BASE_URL, falling back to the OpenAI API)
+            backend: Backend to use instead of the OpenAI API (no API key
+                     needed)
         """
+        self.model = model
+        
+        if backend is not None:
+            self.backend = backend
+            return
+        
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "API key required. Set OPENAI_API_KEY environment variable or pass api_key parameter."
             )
         
-        self.model = model
-        
-        # Initialize OpenAI client
-        try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
-        except ImportError:
-            raise ImportError(
-                "OpenAI package required. Install with: pip install openai"
-            )
+        self.backend = OpenAIBackend(self.api_key, base_url)
     
-    def call_llm(self, messages: list, tools: Optional[list] = None) -> Dict[str, Any]:
+    async def call_llm(
+        self,
+        messages: list,
+        tools: Optional[list] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+        on_tool_call: Optional[Callable[[ToolCall], Awaitable[str]]] = None
+    ) -> Dict[str, Any]:
         """
-        Call the LLM with messages and optional tools.
+        Call the LLM with messages and optional tools, streaming the response.
         
         Args:
             messages: List of message dicts with 'role' and 'content'
             tools: Optional list of tool definitions
+            on_text: Called with each piece of text as it arrives
+            on_tool_call: Called with each tool call as soon as its arguments
+                          are complete, while the rest of the response is
+                          still streaming; the coroutine it returns is
+                          started as the call's task
         
         Returns:
-            Response dict with message and optional tool_calls
+            Response dict with content (str or None) and tool_calls (list of
+            ToolCall, None if the model called no tools)
         """
-        kwargs = {
-            "model": self.model,
-            "messages": messages,
-        }
+        content = []
+        calls: Dict[int, ToolCall] = {}
         
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        def start(call: ToolCall):
+            if call.task is None and on_tool_call is not None:
+                call.task = asyncio.ensure_future(on_tool_call(call))
         
-        response = self.client.chat.completions.create(**kwargs)
+        async for delta in self.backend.stream(self.model, messages, tools):
+            text = delta.get("content")
+            if text:
+                content.append(text)
+                if on_text is not None:
+                    on_text(text)
+            
+            for part in delta.get("tool_calls") or []:
+                call = calls.get(part["index"])
+                if call is None:
+                    call = calls[part["index"]] = ToolCall(part["index"])
+                if part.get("id"):
+                    call.id = part["id"]
+                function = part.get("function") or {}
+                call.name += function.get("name") or ""
+                call.arguments += function.get("arguments") or ""
+                if call.name and call.arguments and call.parsed_arguments() is not None:
+                    start(call)
         
-        message = response.choices[0].message
+        # Calls without arguments are only known to be complete at the end
+        tool_calls = [calls[index] for index in sorted(calls)]
+        for call in tool_calls:
+            start(call)
         
         return {
-            "content": message.content,
-            "tool_calls": message.tool_calls if hasattr(message, 'tool_calls') else None
+            "content": "".join(content) or None,
+            "tool_calls": tool_calls or None
         }
 
 
-async def llm_interactive_mode(server_url: str, api_key: Optional[str] = None):
+# Server administration tools, not offered to the model
+ADMIN_TOOLS = frozenset({"reload_config", "get_recent_traces"})
+
+# Read-only tools, safe to repeat after a connection error
+READ_ONLY_TOOLS = frozenset({"list_python_files", "search_python_files", "describe_python_files"})
+
+
+async def execute_tool(mcp_client: RmiMcpClient, name: str, args: Dict[str, Any]) -> str:
+    """
+    Execute a tool call through the MCP client.
+    
+    Args:
+        mcp_client: Connected MCP client
+        name: Tool name
+        args: Tool arguments
+    
+    Returns:
+        Tool output text
+    """
+    if name == "run_python":
+        return await mcp_client.run_python(args["file_name"], timeout=args.get("timeout"))
+    elif name == "list_python_files":
+        return await mcp_client.list_python_files(args.get("directory"))
+    elif name in ADMIN_TOOLS:
+        return f"Error: Tool not available: {name}"
+    return await mcp_client.call_tool(name, args, idempotent=name in READ_ONLY_TOOLS)
+
+
+def to_openai_tools(tools: list) -> list:
+    """
+    Convert MCP tool definitions to OpenAI function tools.
+    
+    Server administration tools (ADMIN_TOOLS) are left out.
+    
+    Args:
+        tools: Tool definitions from list_tools
+    
+    Returns:
+        List of OpenAI tool dicts
+    """
+    openai_tools = []
+    for tool in tools:
+        if tool.name in ADMIN_TOOLS:
+            continue
+        tool_def = {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            }
+        }
+        
+        # Extract parameters from inputSchema if available
+        if hasattr(tool, 'inputSchema') and tool.inputSchema:
+            schema = tool.inputSchema
+            if isinstance(schema, dict):
+                if 'properties' in schema:
+                    tool_def["function"]["parameters"]["properties"] = schema['properties']
+                if 'required' in schema:
+                    tool_def["function"]["parameters"]["required"] = schema['required']
+        
+        openai_tools.append(tool_def)
+    return openai_tools
+
+
+async def gather_tool_results(tool_calls: list) -> list:
+    """
+    Wait for the started tool calls of one model turn.
+    
+    Args:
+        tool_calls: ToolCall objects whose tasks were started by call_llm
+    
+    Returns:
+        Result text per call, in order (failures become error messages)
+    """
+    results = await asyncio.gather(*(call.task for call in tool_calls), return_exceptions=True)
+    return [
+        f"Error: {type(result).__name__}: {str(result)}" if isinstance(result, Exception) else result
+        for result in results
+    ]
+
+
+def tool_call_messages(content: Optional[str], tool_calls: list, results: list) -> list:
+    """
+    Build the conversation messages for one model turn with tool calls.
+    
+    Args:
+        content: Text the model sent along with the calls
+        tool_calls: ToolCall objects from call_llm
+        results: Result text per call
+    
+    Returns:
+        One assistant message holding every call, followed by one tool
+        message per result
+    """
+    messages = [{
+        "role": "assistant",
+        "content": content,
+        "tool_calls": [
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.name,
+                    "arguments": json.dumps(tool_call.parsed_arguments() or {})
+                }
+            }
+            for tool_call in tool_calls
+        ]
+    }]
+    for tool_call, result in zip(tool_calls, results):
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "name": tool_call.name,
+            "content": result
+        })
+    return messages
+
+
+def print_streamed(text: str):
+    """Print a piece of streamed LLM output without a newline."""
+    print(text, end="", flush=True)
+
+
+SYSTEM_PROMPT = """You are an AI assistant that helps users execute Python code via MCP tools.
+
+Available tools:
+- run_python(file_name): Execute a Python file and return output
+- list_python_files(directory): List Python files in a directory
+- search_python_files(query, regex): Search the contents of the files
+- describe_python_files(path): Summarize the functions and classes of files
+
+When the user asks to run a file, use the run_python tool.
+When the user asks to list files, use the list_python_files tool.
+When the user asks where something is defined or used, search or describe the files
+instead of running them.
+
+File paths should be relative to python_projects/ directory, like:
+- python_projects/hello_world.py
+- python_projects/calculator.py
+- python_projects/error_test.py
+
+Be helpful and interpret user requests naturally."""
+
+
+class AgentSession:
+    """
+    One LLM conversation driving a connected MCP client.
+    
+    Holds the conversation, the kept tool outputs and the tool concurrency
+    limit, and records how long each stage of a turn takes (see
+    benchmarks/agent_loop_benchmark.py).
+    """
+    
+    STAGES = ("schemas", "messages", "llm", "tools", "results")
+    
+    def __init__(
+        self,
+        mcp_client: RmiMcpClient,
+        llm: LLMClient,
+        max_parallel_tools: int = 4,
+        context_tokens: int = 8000,
+        tool_output_tokens: int = 1000,
+        speculate: bool = False,
+        echo: bool = True
+    ):
+        """
+        Initialize the session.
+        
+        Args:
+            mcp_client: Connected MCP client
+            llm: LLM client
+            max_parallel_tools: Most tool calls of one model turn running at once
+            context_tokens: Token budget of the conversation sent with each request
+            tool_output_tokens: Token budget of each tool output sent to the LLM
+                                (0 sends outputs whole)
+            speculate: Start run_python for a file the prompt names while the
+                       model is still deciding (see speculation.py)
+            echo: Print the conversation to stdout
+        """
+        if max_parallel_tools < 1:
+            raise ValueError("max_parallel_tools must be at least 1")
+        
+        self.mcp_client = mcp_client
+        self.llm = llm
+        self.echo = echo
+        
+        # Conversation history (older turns are compacted to stay within budget)
+        self.conversation = Conversation(SYSTEM_PROMPT, max_tokens=context_tokens)
+        
+        # Long tool outputs are condensed for the LLM; the full text stays here
+        self.outputs = OutputStore(max_tokens=tool_output_tokens)
+        
+        # Tool calls start while the rest of the response streams in and
+        # run concurrently, at most max_parallel_tools at a time
+        self.tool_slots = asyncio.Semaphore(max_parallel_tools)
+        
+        self.speculator = Speculator(mcp_client, slots=self.tool_slots) if speculate else None
+        
+        # Seconds per turn and per stage of a turn; "tools" is the MCP round
+        # trip of each tool call
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in ("turn",) + self.STAGES}
+        
+        # Tool calls the model made in the latest turn
+        self.tool_calls: List[ToolCall] = []
+    
+    def _print(self, *args, **kwargs):
+        if self.echo:
+            print(*args, **kwargs)
+    
+    def _on_text(self, text: str):
+        if self.echo:
+            print_streamed(text)
+    
+    async def run_tool(self, tool_call: ToolCall) -> str:
+        """Run one tool call through the MCP client."""
+        if self.speculator is not None and tool_call.name == "run_python":
+            speculative = await self.speculator.take(tool_call.parsed_arguments() or {})
+            if speculative is not None:
+                start = time.perf_counter()
+                try:
+                    return await speculative
+                finally:
+                    self.timings["tools"].append(time.perf_counter() - start)
+        
+        async with self.tool_slots:
+            start = time.perf_counter()
+            try:
+                return await execute_tool(
+                    self.mcp_client, tool_call.name, tool_call.parsed_arguments() or {}
+                )
+            finally:
+                self.timings["tools"].append(time.perf_counter() - start)
+    
+    async def _call_llm(self, tools: Optional[list] = None, **kwargs) -> Dict[str, Any]:
+        start = time.perf_counter()
+        messages = self.conversation.messages()
+        self.timings["messages"].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        response = await self.llm.call_llm(messages, tools=tools, on_text=self._on_text, **kwargs)
+        self.timings["llm"].append(time.perf_counter() - start)
+        return response
+    
+    async def _call_llm_with_tools(self, tools: list) -> tuple:
+        response = await self._call_llm(tools, on_tool_call=self.run_tool)
+        if not response["tool_calls"]:
+            return response, []
+        
+        self._print(f"(Executing {len(response['tool_calls'])} tool call(s)...)\n")
+        
+        # Started by call_llm as soon as their arguments were complete
+        return response, await gather_tool_results(response["tool_calls"])
+    
+    async def turn(self, user_input: str) -> Optional[str]:
+        """
+        Answer one user prompt, running the tools the model asks for.
+        
+        Args:
+            user_input: User prompt
+        
+        Returns:
+            The model's final answer
+        """
+        turn_start = time.perf_counter()
+        self.tool_calls = []
+        
+        # Add user message to conversation
+        self.conversation.append({
+            "role": "user",
+            "content": user_input
+        })
+        
+        # Call LLM (tools are refetched only if the server changed them)
+        start = time.perf_counter()
+        openai_tools = await self.mcp_client.tool_schemas(to_openai_tools)
+        self.timings["schemas"].append(time.perf_counter() - start)
+        
+        # Files the prompt names start running while the model decides
+        if self.speculator is not None:
+            self.speculator.start(user_input)
+        
+        self._print("\n🤖 AI: ", end="", flush=True)
+        try:
+            response, raw_results = await self._call_llm_with_tools(openai_tools)
+        finally:
+            # Speculative runs the model did not ask for are discarded
+            if self.speculator is not None:
+                self.speculator.discard()
+        
+        # Check if LLM wants to call a tool
+        if response["tool_calls"]:
+            tool_calls = self.tool_calls = response["tool_calls"]
+            start = time.perf_counter()
+            results = [self.outputs.condense(result) for result in raw_results]
+            
+            # Add the calls and their results to the conversation
+            self.conversation.extend(tool_call_messages(response["content"], tool_calls, results))
+            self.timings["results"].append(time.perf_counter() - start)
+            
+            # The terminal shows the full output; only the model gets it condensed
+            for tool_call, result in zip(tool_calls, raw_results):
+                self._print(f"🔧 Tool: {tool_call.name}")
+                self._print(f"📝 Arguments: {json.dumps(tool_call.parsed_arguments() or {}, indent=2)}")
+                self._print("-" * 70)
+                self._print(result)
+                self._print("-" * 70)
+            
+            # Get LLM's interpretation of the result
+            self._print("\n🤖 AI: ", end="", flush=True)
+            response = await self._call_llm()
+        
+        # Without a tool call this is the model's direct answer
+        self._print()
+        self.conversation.append({
+            "role": "assistant",
+            "content": response["content"]
+        })
+        
+        self.timings["turn"].append(time.perf_counter() - turn_start)
+        return response["content"]
+
+
+async def llm_interactive_mode(
+    server_url: str,
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    base_url: Optional[str] = None,
+    max_parallel_tools: int = 4,
+    context_tokens: int = 8000,
+    tool_output_tokens: int = 1000,
+    speculate: bool = False,
+    llm: Optional[LLMClient] = None,
+    prompts: Optional[Iterable[str]] = None
+):
     """
     Run interactive mode with LLM integration.
     
     Args:
         server_url: URL or path to MCP server
         api_key: Optional API key (defaults to OPENAI_API_KEY env var)
+        model: LLM model to use
+        base_url: OpenAI-compatible API URL (defaults to OPENAI_BASE_URL or OpenAI)
+        max_parallel_tools: Most tool calls of one model turn running at once
+        context_tokens: Token budget of the conversation sent with each request
+        tool_output_tokens: Token budget of each tool output sent to the LLM
+                            (0 sends outputs whole)
+        speculate: Start run_python for a file the prompt names while the
+                   model is still deciding
+        llm: LLM client to use instead of one built from api_key, model and
+             base_url (e.g. with a ScriptedBackend)
+        prompts: Prompts to answer instead of reading them from the terminal;
+                 the session ends after the last one
     """
+    if max_parallel_tools < 1:
+        raise ValueError("max_parallel_tools must be at least 1")
+    
     print("=" * 70)
     print("RmiAgentMcpServer - LLM-Powered Interactive Client")
     print("=" * 70)
     print(f"Connecting to: {server_url}")
     print()
     
+    prompts = iter(prompts) if prompts is not None else None
+    
     try:
         # Initialize LLM client
-        llm = LLMClient(api_key=api_key)
+        if llm is None:
+            llm = LLMClient(api_key=api_key, model=model, base_url=base_url)
         print(f"✓ LLM initialized: {llm.model}")
         
         # Connect to MCP server
@@ -123,54 +558,14 @@ async def llm_interactive_mode(server_url: str, api_key: Optional[str] = None):
                 print(f"  - {tool.name}")
             print()
             
-            # Convert MCP tools to OpenAI tool format
-            openai_tools = []
-            for tool in tools:
-                tool_def = {
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": {
-                            "type": "object",
-                            "properties": {},
-                            "required": []
-                        }
-                    }
-                }
-                
-                # Extract parameters from inputSchema if available
-                if hasattr(tool, 'inputSchema') and tool.inputSchema:
-                    schema = tool.inputSchema
-                    if isinstance(schema, dict):
-                        if 'properties' in schema:
-                            tool_def["function"]["parameters"]["properties"] = schema['properties']
-                        if 'required' in schema:
-                            tool_def["function"]["parameters"]["required"] = schema['required']
-                
-                openai_tools.append(tool_def)
-            
-            # Conversation history
-            conversation = [
-                {
-                    "role": "system",
-                    "content": """You are an AI assistant that helps users execute Python code via MCP tools.
-
-Available tools:
-- run_python(file_name): Execute a Python file and return output
-- list_python_files(directory): List Python files in a directory
-
-When the user asks to run a file, use the run_python tool.
-When the user asks to list files, use the list_python_files tool.
-
-File paths should be relative to python_projects/ directory, like:
-- python_projects/hello_world.py
-- python_projects/calculator.py
-- python_projects/error_test.py
-
-Be helpful and interpret user requests naturally."""
-                }
-            ]
+            session = AgentSession(
+                mcp_client, llm,
+                max_parallel_tools=max_parallel_tools,
+                context_tokens=context_tokens,
+                tool_output_tokens=tool_output_tokens,
+                speculate=speculate
+            )
+            conversation, outputs = session.conversation, session.outputs
             
             print("=" * 70)
             print("💬 Chat with the AI to execute Python code!")
@@ -182,97 +577,51 @@ Be helpful and interpret user requests naturally."""
             print("  - 'Show me all Python files'")
             print("  - 'Run the test file that has errors'")
             print()
+            print("Type ':output [N]' to see the full text of a condensed tool output.")
             print("Type 'quit' or 'exit' to quit.")
             print("=" * 70)
             print()
             
             # Interactive loop
             while True:
-                # Get user input
-                user_input = input("You: ").strip()
+                if prompts is not None:
+                    user_input = next(prompts, "quit").strip()
+                    print(f"You: {user_input}")
+                else:
+                    # Get user input (in a thread, so the MCP session keeps running)
+                    user_input = (await asyncio.to_thread(input, "You: ")).strip()
                 
                 if user_input.lower() in ['quit', 'exit', 'q']:
+                    if conversation.request_tokens:
+                        average = sum(conversation.request_tokens) // len(conversation.request_tokens)
+                        print(
+                            f"\nContext: {conversation.stats['requests']} LLM requests, "
+                            f"~{average} tokens on average, "
+                            f"{conversation.stats['compacted_turns']} turns compacted, "
+                            f"{outputs.stats['condensed']} tool outputs condensed"
+                        )
+                    if session.speculator is not None:
+                        stats = session.speculator.stats
+                        print(
+                            f"Speculation: {stats['started']} runs started early, "
+                            f"{stats['hits']} used ({session.speculator.hit_rate():.0%}), "
+                            f"{stats['wasted']} wasted, {stats['seconds_saved']:.1f}s of execution hidden"
+                        )
                     print("\nGoodbye!")
                     break
                 
                 if not user_input:
                     continue
                 
-                # Add user message to conversation
-                conversation.append({
-                    "role": "user",
-                    "content": user_input
-                })
-                
-                # Call LLM
-                print("\n🤖 AI: ", end="", flush=True)
-                response = llm.call_llm(conversation, tools=openai_tools)
-                
-                # Check if LLM wants to call a tool
-                if response["tool_calls"]:
-                    print("(Executing tool...)\n")
-                    
-                    for tool_call in response["tool_calls"]:
-                        function_name = tool_call.function.name
-                        function_args = json.loads(tool_call.function.arguments)
-                        
-                        print(f"🔧 Tool: {function_name}")
-                        print(f"📝 Arguments: {json.dumps(function_args, indent=2)}")
-                        print("-" * 70)
-                        
-                        # Execute the tool via MCP
-                        if function_name == "run_python":
-                            result = await mcp_client.run_python(function_args["file_name"])
-                        elif function_name == "list_python_files":
-                            directory = function_args.get("directory")
-                            result = await mcp_client.list_python_files(directory)
-                        else:
-                            result = f"Unknown tool: {function_name}"
-                        
-                        print(result)
-                        print("-" * 70)
-                        
-                        # Add tool result to conversation
-                        conversation.append({
-                            "role": "assistant",
-                            "content": None,
-                            "tool_calls": [
-                                {
-                                    "id": tool_call.id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": function_name,
-                                        "arguments": json.dumps(function_args)
-                                    }
-                                }
-                            ]
-                        })
-                        
-                        conversation.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "name": function_name,
-                            "content": result
-                        })
-                    
-                    # Get LLM's interpretation of the result
-                    print("\n🤖 AI: ", end="", flush=True)
-                    final_response = llm.call_llm(conversation)
-                    print(final_response["content"])
-                    
-                    conversation.append({
-                        "role": "assistant",
-                        "content": final_response["content"]
-                    })
-                
-                else:
-                    # LLM responded without calling a tool
-                    print(response["content"])
-                    conversation.append({
-                        "role": "assistant",
-                        "content": response["content"]
-                    })
+                # Show a full tool output locally, without involving the LLM
+                if user_input.startswith(":output"):
+                    number = user_input[len(":output"):].strip()
+                    full_output = outputs.get(int(number)) if number.isdigit() else outputs.get()
+                    print(full_output if full_output is not None else "No such tool output is kept.")
+                    print()
+                    continue
                 
+                await session.turn(user_input)
                 print()
     
     except KeyboardInterrupt:
@@ -284,6 +633,145 @@ Be helpful and interpret user requests naturally."""
         traceback.print_exc()
 
 
+def read_prompts(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Parse batch input.
+    
+    Each non-blank line is a prompt, or a JSON object with "prompt" and an
+    optional "id" that is copied to the result.
+    
+    Args:
+        lines: Lines of a prompt file or stdin
+    
+    Returns:
+        Prompt dicts with "prompt" and possibly "id"
+    
+    Raises:
+        ValueError: If a JSON line has no "prompt"
+    """
+    prompts = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            item = json.loads(line)
+            if not isinstance(item.get("prompt"), str):
+                raise ValueError(f"Line {number}: JSON prompt needs a \"prompt\" string")
+            prompts.append({key: item[key] for key in ("id", "prompt") if key in item})
+        else:
+            prompts.append({"prompt": line})
+    return prompts
+
+
+async def run_batch(
+    server_url: str,
+    prompts: List[Dict[str, Any]],
+    output=None,
+    concurrency: int = 4,
+    api_key: Optional[str] = None,
+    model: str = "gpt-4o-mini",
+    base_url: Optional[str] = None,
+    max_parallel_tools: int = 4,
+    context_tokens: int = 8000,
+    tool_output_tokens: int = 1000,
+    speculate: bool = False,
+    llm: Optional[LLMClient] = None
+) -> int:
+    """
+    Answer many prompts concurrently, each in its own conversation.
+    
+    All conversations share one pooled MCP connection. One JSON line per
+    prompt is written as it completes, with the answer, the tool calls
+    made and the turn's timing; a summary goes to stderr.
+    
+    Args:
+        server_url: URL or path to MCP server
+        prompts: Prompt dicts from read_prompts()
+        output: Text stream for the JSON lines (default: stdout)
+        concurrency: Most prompts being answered at once
+        api_key: Optional API key (defaults to OPENAI_API_KEY env var)
+        model: LLM model to use
+        base_url: OpenAI-compatible API URL (defaults to OPENAI_BASE_URL or OpenAI)
+        max_parallel_tools: Most tool calls of one model turn running at once
+        context_tokens: Token budget of each conversation
+        tool_output_tokens: Token budget of each tool output sent to the LLM
+        speculate: Start run_python for a file the prompt names while the
+                   model is still deciding
+        llm: LLM client to use instead of one built from api_key, model and
+             base_url (e.g. with a ScriptedBackend)
+    
+    Returns:
+        Number of prompts that failed with an error
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    output = output or sys.stdout
+    if llm is None:
+        llm = LLMClient(api_key=api_key, model=model, base_url=base_url)
+    
+    slots = asyncio.Semaphore(concurrency)
+    
+    async def answer(index: int, item: Dict[str, Any], pool: ConnectionPool) -> Dict[str, Any]:
+        async with slots:
+            record = dict(item, index=index, answer=None, error=None, tool_calls=[])
+            session = None
+            start = time.perf_counter()
+            try:
+                async with RmiMcpClient(server_url, pool=pool) as mcp_client:
+                    session = AgentSession(
+                        mcp_client, llm,
+                        max_parallel_tools=max_parallel_tools,
+                        context_tokens=context_tokens,
+                        tool_output_tokens=tool_output_tokens,
+                        speculate=speculate,
+                        echo=False
+                    )
+                    record["answer"] = await session.turn(item["prompt"])
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {str(e)}"
+            record["seconds"] = round(time.perf_counter() - start, 4)
+            
+            if session is not None:
+                record["tool_calls"] = [
+                    {"name": call.name, "arguments": call.parsed_arguments()}
+                    for call in session.tool_calls
+                ]
+                # Seconds spent per stage; tool calls overlap, so "tools"
+                # can exceed the turn
+                record["stages"] = {
+                    stage: round(sum(times), 4) for stage, times in session.timings.items()
+                    if stage != "turn"
+                }
+            return record
+    
+    started = time.perf_counter()
+    durations, failed = [], 0
+    async with ConnectionPool() as pool:
+        tasks = [answer(index, item, pool) for index, item in enumerate(prompts)]
+        for completed in asyncio.as_completed(tasks):
+            record = await completed
+            durations.append(record["seconds"])
+            if record["error"] is not None:
+                failed += 1
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    wall_time = time.perf_counter() - started
+    
+    print(
+        f"Prompts: {len(prompts)}  Succeeded: {len(prompts) - failed}  Failed: {failed}  "
+        f"Wall time: {wall_time:.2f}s",
+        file=sys.stderr
+    )
+    if durations:
+        print(
+            f"Turn time: total {sum(durations):.2f}s, min {min(durations):.2f}s, "
+            f"median {statistics.median(durations):.2f}s, max {max(durations):.2f}s",
+            file=sys.stderr
+        )
+    return failed
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -305,6 +793,15 @@ Examples:
   
   # Use Gemini
   python mcp_client_llm.py --server ../server/mcp_server.py --model gemini-2.5-flash
+
+  # Any OpenAI-compatible endpoint (e.g. a local model server)
+  python mcp_client_llm.py --server ../server/mcp_server.py --base-url http://localhost:8080/v1 --model my-model
+
+  # Offline, with the scripted fake LLM and prompts from the command line
+  python mcp_client_llm.py --server ../server/mcp_server.py --fake-llm --prompt "run hello_world.py"
+
+  # Batch: one prompt per line (or "-" for stdin), 8 at a time, results as JSON lines
+  python mcp_client_llm.py --server ../server/mcp_server.py --batch prompts.txt --concurrency 8 --output results.jsonl
         """
     )
     
@@ -325,10 +822,112 @@ Examples:
         help="API key (defaults to OPENAI_API_KEY env var)"
     )
     
+    parser.add_argument(
+        "--base-url",
+        help="OpenAI-compatible API URL (defaults to OPENAI_BASE_URL env var, then OpenAI)"
+    )
+    
+    parser.add_argument(
+        "--max-parallel-tools",
+        type=int,
+        default=4,
+        help="Most tool calls of one model turn running at once (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--context-tokens",
+        type=int,
+        default=8000,
+        help="Token budget of the conversation sent to the LLM; older turns are compacted (default: 8000)"
+    )
+    
+    parser.add_argument(
+        "--tool-output-tokens",
+        type=int,
+        default=1000,
+        help="Token budget of each tool output sent to the LLM; 0 sends outputs whole (default: 1000)"
+    )
+    
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="Start run_python for a file the prompt names while the model is still deciding"
+    )
+    
+    parser.add_argument(
+        "--fake-llm",
+        nargs="?",
+        const="",
+        metavar="SCRIPT",
+        help="Use the offline scripted LLM instead of an API; SCRIPT is an optional JSON "
+             "list of responses ({\"content\": ..., \"tool_calls\": [{\"name\": ..., \"arguments\": {...}}]})"
+    )
+    
+    parser.add_argument(
+        "--prompt",
+        action="append",
+        dest="prompts",
+        help="Answer this prompt instead of reading from the terminal (repeatable)"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Answer the prompts in FILE (\"-\" for stdin) concurrently, each in its own "
+             "conversation; one prompt per line, or JSON lines with \"prompt\" and \"id\""
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Prompts answered at the same time with --batch (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write --batch results as JSON lines to FILE (default: stdout)"
+    )
+    
     args = parser.parse_args()
     
+    if args.batch and args.prompts:
+        parser.error("--batch and --prompt cannot be combined")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    
+    llm = None
+    if args.fake_llm is not None:
+        responses = json.loads(Path(args.fake_llm).read_text()) if args.fake_llm else None
+        llm = LLMClient(model=args.model, backend=ScriptedBackend(responses))
+    
+    if args.batch:
+        if args.batch == "-":
+            prompts = read_prompts(sys.stdin)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                prompts = read_prompts(f)
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            failed = asyncio.run(run_batch(
+                args.server, prompts, output, args.concurrency,
+                api_key=args.api_key, model=args.model, base_url=args.base_url,
+                max_parallel_tools=args.max_parallel_tools, context_tokens=args.context_tokens,
+                tool_output_tokens=args.tool_output_tokens, speculate=args.speculate, llm=llm
+            ))
+        finally:
+            if args.output:
+                output.close()
+        sys.exit(1 if failed else 0)
+    
     # Run interactive mode
-    asyncio.run(llm_interactive_mode(args.server, api_key=args.api_key))
+    asyncio.run(llm_interactive_mode(
+        args.server, api_key=args.api_key, model=args.model, base_url=args.base_url,
+        max_parallel_tools=args.max_parallel_tools, context_tokens=args.context_tokens,
+        tool_output_tokens=args.tool_output_tokens, speculate=args.speculate,
+        llm=llm, prompts=args.prompts
+    ))
 
 
 if __name__ == "__main__":
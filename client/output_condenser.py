@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Condensation of long tool outputs before they are sent to the LLM.
+
+A run_python result used to go into the conversation verbatim, so a script
+printing 50,000 lines was shipped whole to the model, on that turn and
+every later one. condense_output keeps what the model needs within a token
+budget: the exit code line, the most recent Python tracebacks, the first
+and last lines, and a note with statistics about what was left out. The
+full output stays with the client in an OutputStore and can be shown in the
+terminal on demand (":output N" in mcp_client_llm).
+"""
+
+import re
+from collections import OrderedDict
+from typing import Callable, List, Optional, Set, Tuple
+
+from conversation import estimate_tokens
+
+
+TRACEBACK_HEADER = "Traceback (most recent call last):"
+STDERR_MARKER = "--- stderr ---"
+EXIT_CODE_LINE = re.compile(r"^\[Process exited with code -?\d+\]$")
+ERROR_LINE = re.compile(r"error|exception|warning|fail", re.IGNORECASE)
+
+# Longest line kept as is; longer lines are cut
+MAX_LINE_CHARS = 300
+
+# Share of the budget spent on tracebacks
+TRACEBACK_SHARE = 0.4
+
+# Tokens reserved per "... lines omitted ..." marker
+MARKER_TOKENS = 10
+
+
+def find_tracebacks(lines: List[str]) -> List[Tuple[int, int]]:
+    """
+    Find Python tracebacks in output lines.
+
+    Args:
+        lines: Output lines
+
+    Returns:
+        (start, end) line ranges, end exclusive, in order of appearance
+    """
+    spans = []
+    index = 0
+    while index < len(lines):
+        if lines[index].startswith(TRACEBACK_HEADER):
+            end = index + 1
+            # Frames are indented; the exception line that ends them is not
+            while end < len(lines) and lines[end].startswith((" ", "\t")):
+                end += 1
+            end = min(end + 1, len(lines))
+            spans.append((index, end))
+            index = end
+        else:
+            index += 1
+    return spans
+
+
+def cut_line(line: str) -> str:
+    """Cut a line to MAX_LINE_CHARS characters."""
+    if len(line) <= MAX_LINE_CHARS:
+        return line
+    return f"{line[:MAX_LINE_CHARS]}... (+{len(line) - MAX_LINE_CHARS:,} chars)"
+
+
+def condense_output(
+    text: str,
+    max_tokens: int = 1000,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+    note: str = ""
+) -> str:
+    """
+    Condense a tool output to about max_tokens tokens.
+
+    Args:
+        text: Full output
+        max_tokens: Token budget of the condensed output
+        count_tokens: Token counter for a piece of text
+        note: Extra text for the closing statistics line (e.g. where the
+              full output is kept)
+
+    Returns:
+        The output itself if it fits, otherwise its exit code line,
+        latest tracebacks, head and tail with omission markers, followed
+        by a statistics line
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    lines = text.splitlines()
+    tracebacks = find_tracebacks(lines)
+    # The server adds the marker after stdout, so the last one is the real one
+    stderr_start = len(lines) - 1 - lines[::-1].index(STDERR_MARKER) if STDERR_MARKER in lines else None
+    stderr_lines = len(lines) - stderr_start - 1 if stderr_start is not None else 0
+    error_lines = sum(1 for line in lines if ERROR_LINE.search(line))
+
+    stats = (
+        f"[Output condensed: {len(lines):,} lines, {len(text):,} characters, "
+        f"{stderr_lines:,} stderr lines, {len(tracebacks)} traceback(s), "
+        f"{error_lines:,} lines mentioning errors or warnings{note}]"
+    )
+
+    kept: Set[int] = set()
+    cost = {}
+    budget = max_tokens - count_tokens(stats) - 2 * MARKER_TOKENS
+
+    def line_cost(index: int) -> int:
+        if index not in cost:
+            cost[index] = count_tokens(cut_line(lines[index])) + 1
+        return cost[index]
+
+    def keep(index: int) -> bool:
+        nonlocal budget
+        if index in kept:
+            return True
+        if line_cost(index) > budget:
+            return False
+        kept.add(index)
+        budget -= line_cost(index)
+        return True
+
+    # The exit code line closes run_python output; keep it and the stderr marker
+    for index in range(len(lines) - 1, -1, -1):
+        if lines[index].strip():
+            if EXIT_CODE_LINE.match(lines[index]):
+                keep(index)
+            break
+    if stderr_start is not None:
+        keep(stderr_start)
+
+    # Latest tracebacks first; a long one keeps its header and last frames
+    traceback_budget = int(budget * TRACEBACK_SHARE)
+    for start, end in reversed(tracebacks):
+        budget -= MARKER_TOKENS
+        spent = budget
+        for index in [start] + list(range(end - 1, start, -1)):
+            if spent - budget + line_cost(index) > traceback_budget or not keep(index):
+                break
+        traceback_budget -= spent - budget
+        if traceback_budget <= 0:
+            break
+
+    # Head and tail share the rest
+    head_budget = budget // 2
+    head_end = 0
+    while head_end < len(lines) and budget - line_cost(head_end) >= head_budget:
+        keep(head_end)
+        head_end += 1
+    tail_start = len(lines) - 1
+    while tail_start >= head_end and keep(tail_start):
+        tail_start -= 1
+
+    parts = []
+    previous = -1
+    for index in sorted(kept):
+        if index > previous + 1:
+            parts.append(f"... ({index - previous - 1:,} lines omitted) ...")
+        parts.append(cut_line(lines[index]))
+        previous = index
+    if previous < len(lines) - 1:
+        parts.append(f"... ({len(lines) - previous - 1:,} lines omitted) ...")
+    parts.append(stats)
+    return "\n".join(parts)
+
+
+class OutputStore:
+    """Full tool outputs of a session, kept locally while the LLM sees condensed ones."""
+
+    def __init__(
+        self,
+        max_tokens: int = 1000,
+        max_outputs: int = 20,
+        count_tokens: Callable[[str], int] = estimate_tokens
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_tokens: Token budget of each output sent to the LLM (0 disables
+                        condensation)
+            max_outputs: Full outputs kept; the oldest are dropped
+            count_tokens: Token counter for a piece of text
+        """
+        self.max_tokens = max_tokens
+        self.max_outputs = max_outputs
+        self.count_tokens = count_tokens
+        self.outputs: "OrderedDict[int, str]" = OrderedDict()
+        self.next_number = 1
+        self.stats = {"condensed": 0, "tokens_saved": 0}
+
+    def condense(self, text: str) -> str:
+        """
+        Condense an output for the LLM, keeping the full text if it was cut.
+
+        Args:
+            text: Full tool output
+
+        Returns:
+            Text to send to the LLM (with the number of the kept output)
+        """
+        if not self.max_tokens or self.count_tokens(text) <= self.max_tokens:
+            return text
+
+        number = self.next_number
+        self.next_number += 1
+        self.outputs[number] = text
+        while len(self.outputs) > self.max_outputs:
+            self.outputs.popitem(last=False)
+
+        condensed = condense_output(
+            text, self.max_tokens, self.count_tokens, note=f"; full output kept locally as #{number}"
+        )
+        self.stats["condensed"] += 1
+        self.stats["tokens_saved"] += self.count_tokens(text) - self.count_tokens(condensed)
+        return condensed
+
+    def get(self, number: Optional[int] = None) -> Optional[str]:
+        """
+        Full text of a kept output.
+
+        Args:
+            number: Output number (default: the latest)
+
+        Returns:
+            The output, or None if it is unknown or was dropped
+        """
+        if number is None:
+            return next(reversed(self.outputs.values()), None)
+        return self.outputs.get(number)
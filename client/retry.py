@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Reconnect and retry policy for the MCP client.
+
+A dropped stream (server restart, ngrok reconnect, idle proxy timeout)
+surfaces as an exception from the MCP session. RmiMcpClient then opens a new
+session and, for calls that are safe to repeat, tries again after a delay
+that grows exponentially with each attempt. The delay is "full jitter": a
+random time between zero and the exponential bound, so clients that lost
+their connection at the same moment do not all come back at once.
+
+Calls rejected by the server's admission control never started running,
+so they are retried too, waiting at least as long as the server asked. A
+rejection is recognized only by the marker the server puts in the result's
+_meta, never by the output text: a script may print anything.
+
+Only list_tools and list_python_files are retried by default. run_python
+may have started (and had side effects) before the connection dropped, so
+its retries are opt-in.
+"""
+
+import random
+from typing import Optional
+
+import anyio
+from mcp.types import CONNECTION_CLOSED
+
+try:
+    from httpx2 import TransportError as _HttpTransportError
+except ImportError:
+    try:
+        from httpx import TransportError as _HttpTransportError
+    except ImportError:
+        _HttpTransportError = ConnectionError
+
+
+# _meta key of a result rejected before the call ran (see server/admission.py)
+REJECTION_META = "rmi/rejection"
+
+CONNECTION_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    EOFError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    _HttpTransportError,
+)
+
+class ServerRejection(Exception):
+    """A call the server rejected before running it (see admission_rejection)."""
+
+    def __init__(self, text: str, reason: str, retry_after: Optional[float]):
+        super().__init__(text)
+        self.text = text
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """How often and how patiently to reconnect and retry."""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        retry_run_python: bool = False,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Attempts per call, including the first (1 disables
+                          retries; the session is still reconnected)
+            base_delay: Upper bound of the delay before the first retry
+            max_delay: Cap on the delay bound, which doubles per attempt
+            retry_run_python: Also retry run_python after a connection error.
+                              The file may then run more than once.
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_run_python = retry_run_python
+
+    def delay(self, attempt: int) -> float:
+        """
+        Delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+
+        Returns:
+            Seconds, uniformly random up to min(max_delay, base_delay * 2^(attempt - 1))
+        """
+        bound = min(self.max_delay, self.base_delay * 2 ** max(0, attempt - 1))
+        return random.uniform(0, bound)
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """
+    Check whether an exception means the session's connection was lost.
+
+    Follows the exception's cause chain, since transports wrap the
+    underlying network error.
+
+    Args:
+        exc: Exception raised by a client call
+
+    Returns:
+        True for network and closed-stream errors, False for errors reported
+        by the server (invalid arguments, tool errors)
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, CONNECTION_ERRORS):
+            return True
+        if getattr(exc, "code", None) == CONNECTION_CLOSED:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def admission_rejection(result) -> Optional[dict]:
+    """
+    Recognize a call rejected by the server's admission control.
+
+    Only the server's marker counts, not the text of the result.
+
+    Args:
+        result: Tool call result (FastMCP CallToolResult)
+
+    Returns:
+        {"reason": ..., "retry_after": seconds, or None if the call should
+        not be retried on this server}, or None if the call was not rejected
+    """
+    if not getattr(result, "is_error", False):
+        return None
+    rejection = (getattr(result, "meta", None) or {}).get(REJECTION_META)
+    return rejection if isinstance(rejection, dict) else None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Speculative run_python calls for the LLM client.
+
+Asked to "run calculator.py", the model almost always answers with a
+run_python call for that file, but only after its own latency. Speculator
+starts that call as soon as the prompt arrives, when the prompt clearly
+names a file: a run verb plus a name that matches exactly one file in the
+server's file listing (fetched with list_python_files and cached). If the
+model then calls run_python for the same file with no other arguments,
+the speculative task is handed over and its execution time is hidden
+behind the model's. Runs the model does not ask for, or asks for with
+different arguments (such as its own timeout), are cancelled and counted
+as wasted.
+
+Speculation executes files the model may never have chosen to run, so it
+is opt-in (--speculate in mcp_client_llm).
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from llm_backends import FILE_NAME
+
+
+# Words that make a prompt ask for a run
+RUN_VERB = re.compile(r"\b(run|execute|exec|launch|start|rerun|re-run)\b", re.IGNORECASE)
+
+LISTING_HEADER = re.compile(r"^Python files in (.+):$")
+
+
+def parse_listing(text: str) -> List[str]:
+    """
+    Parse list_python_files output into full file paths.
+
+    Args:
+        text: Tool output ("Python files in <dir>:" then "  - <relative path>")
+
+    Returns:
+        Paths of the listed files (empty for errors and empty listings)
+    """
+    lines = text.splitlines()
+    header = LISTING_HEADER.match(lines[0]) if lines else None
+    if header is None:
+        return []
+    directory = header.group(1).rstrip("/\\")
+    return [
+        f"{directory}/{line.strip()[2:]}"
+        for line in lines[1:]
+        if line.strip().startswith("- ")
+    ]
+
+
+class Speculator:
+    """Starts run_python early for files named in a prompt."""
+
+    def __init__(
+        self,
+        mcp_client,
+        index_ttl: float = 60.0,
+        max_runs: int = 3,
+        slots: Optional[asyncio.Semaphore] = None
+    ):
+        """
+        Initialize the speculator.
+
+        Args:
+            mcp_client: Connected MCP client (RmiMcpClient)
+            index_ttl: Seconds the file listing is reused
+            max_runs: Most files run speculatively for one prompt
+            slots: Semaphore limiting tool calls; speculative runs take a
+                   slot like the model's own calls
+        """
+        self.mcp_client = mcp_client
+        self.slots = slots
+        self.index_ttl = index_ttl
+        self.max_runs = max_runs
+        self.paths: Optional[List[str]] = None
+        self._indexed_at = 0.0
+        self._setup: Optional[asyncio.Task] = None
+        # Speculative runs of the current prompt: path -> {task, started, finished};
+        # started is None while the run waits for a slot
+        self.pending: Dict[str, dict] = {}
+        self.stats = {"started": 0, "hits": 0, "wasted": 0, "seconds_saved": 0.0}
+
+    async def refresh_index(self):
+        """Fetch the file listing if it is missing or older than index_ttl."""
+        if self.paths is not None and time.monotonic() - self._indexed_at < self.index_ttl:
+            return
+        self.paths = parse_listing(await self.mcp_client.list_python_files())
+        self._indexed_at = time.monotonic()
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Find the one listed file a name refers to.
+
+        Args:
+            name: Path or file name, e.g. "calculator.py" or
+                  "python_projects/calculator.py"
+
+        Returns:
+            Full path, or None if no file or several files match
+        """
+        if not self.paths:
+            return None
+        name = name.replace("\\", "/")
+        if name in self.paths:
+            return name
+        suffix = "/" + name.lstrip("./")
+        matches = [path for path in self.paths if path.replace("\\", "/").endswith(suffix)]
+        return matches[0] if len(matches) == 1 else None
+
+    def match_prompt(self, prompt: str) -> List[str]:
+        """
+        Files a prompt clearly asks to run.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            Distinct full paths, at most max_runs (empty without a run verb)
+        """
+        if not RUN_VERB.search(prompt):
+            return []
+        paths = []
+        for name in FILE_NAME.findall(prompt):
+            path = self.resolve(name)
+            if path is not None and path not in paths:
+                paths.append(path)
+        return paths[:self.max_runs]
+
+    def start(self, prompt: str):
+        """
+        Start speculative runs for a prompt in the background.
+
+        Args:
+            prompt: User prompt
+        """
+        self._setup = asyncio.ensure_future(self._start(prompt))
+
+    async def _start(self, prompt: str):
+        try:
+            await self.refresh_index()
+        except Exception:
+            # No listing, no speculation; the model's calls run as usual
+            return
+        for path in self.match_prompt(prompt):
+            run = {"task": None, "started": None, "finished": None}
+            run["task"] = asyncio.ensure_future(self._run(run, path))
+            run["task"].add_done_callback(lambda _, run=run: run.update(finished=time.perf_counter()))
+            self.pending[path] = run
+            self.stats["started"] += 1
+
+    async def _run(self, run: dict, path: str) -> str:
+        if self.slots is None:
+            run["started"] = time.perf_counter()
+            return await self.mcp_client.run_python(path)
+        async with self.slots:
+            run["started"] = time.perf_counter()
+            return await self.mcp_client.run_python(path)
+
+    def _cancel(self, run: dict):
+        if run["task"].done() and not run["task"].cancelled():
+            # Retrieve a failure so it is not reported as unhandled
+            run["task"].exception()
+        run["task"].cancel()
+        self.stats["wasted"] += 1
+
+    async def take(self, arguments: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """
+        Hand over the speculative run for a run_python call of the model.
+
+        Only a call with just a file_name matches the speculative run; if
+        the model asks for more (e.g. its own timeout), the speculative run
+        of that file is cancelled.
+
+        Args:
+            arguments: Arguments of the model's call
+
+        Returns:
+            The running or finished task, or None if the call has to run
+            itself
+        """
+        if self._setup is not None:
+            await self._setup
+        path = self.resolve(arguments.get("file_name") or "")
+        if path not in self.pending:
+            return None
+        run = self.pending.pop(path)
+        if set(arguments) != {"file_name"}:
+            self._cancel(run)
+            return None
+        self.stats["hits"] += 1
+        # The model's call would have started now, so the run is ahead by
+        # the time it has been running
+        if run["started"] is not None:
+            self.stats["seconds_saved"] += (run["finished"] or time.perf_counter()) - run["started"]
+        return run["task"]
+
+    def discard(self):
+        """Cancel speculative runs the model did not ask for."""
+        if self._setup is not None and not self._setup.done():
+            self._setup.cancel()
+        self._setup = None
+        for run in self.pending.values():
+            self._cancel(run)
+        self.pending.clear()
+
+    def hit_rate(self) -> float:
+        """Share of speculative runs the model asked for."""
+        return self.stats["hits"] / self.stats["started"] if self.stats["started"] else 0.0
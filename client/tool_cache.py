@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Client-side cache of a server's tool list.
+
+The tools of a server rarely change during a session, yet every
+interactive "list tools" command and every LLM session start asked the
+server for them again. ToolCache keeps the list from the last tools/list
+call, together with anything derived from it (such as the OpenAI function
+schemas built by mcp_client_llm), until the server sends a
+notifications/tools/list_changed message or the entry is older than its TTL.
+
+A ToolCache is also the FastMCP message handler of the session it belongs
+to, which is how it receives the list_changed notification.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from fastmcp.client.messages import MessageHandler
+
+
+class ToolCache(MessageHandler):
+    """Tool list of one session, invalidated by list_changed or a TTL."""
+
+    def __init__(self, ttl: Optional[float] = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a tool list is reused (None: until the server says it
+                 changed; 0 disables caching)
+        """
+        self.ttl = ttl
+        self.tools: Optional[List[Any]] = None
+        self._fetched_at = 0.0
+        self._derived: Dict[Any, Any] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self) -> Optional[List[Any]]:
+        """
+        Get the cached tool list if it is still fresh.
+
+        Returns:
+            List of tool definitions, or None if it must be fetched
+        """
+        if self.tools is not None and self.ttl is not None and \
+                time.monotonic() - self._fetched_at >= self.ttl:
+            self.invalidate()
+        if self.tools is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return self.tools
+
+    def store(self, tools: List[Any]):
+        """Cache a freshly fetched tool list."""
+        self.tools = tools
+        self._fetched_at = time.monotonic()
+        self._derived.clear()
+
+    def derived(self, build: Callable[[List[Any]], Any]) -> Any:
+        """
+        Get a value derived from the cached tool list, building it once.
+
+        Args:
+            build: Function of the tool list (also the cache key)
+
+        Returns:
+            build(tools), reused until the tool list is invalidated
+        """
+        if build not in self._derived:
+            self._derived[build] = build(self.tools)
+        return self._derived[build]
+
+    def invalidate(self):
+        """Drop the tool list and everything derived from it."""
+        if self.tools is not None:
+            self.stats["invalidations"] += 1
+        self.tools = None
+        self._derived.clear()
+
+    async def on_tool_list_changed(self, message):
+        self.invalidate()
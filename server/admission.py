@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Admission control for tool calls.
+
+AdmissionMiddleware rejects work the server should not start:
+
+- per-client rate limits: a token bucket per client, refilled at a fixed
+  rate of tool calls per second with a burst allowance
+- per-client run_python quotas: a maximum number of concurrent executions
+  per client, so one runaway agent loop cannot occupy every slot
+- load shedding: run_python is refused while the server is overloaded
+  (too many queued executions or a high CPU load), instead of letting the
+  call wait in the queue until it times out
+- draining: run_python is refused while the server shuts down
+
+Rejected calls return immediately with an error result (isError) whose
+text starts with "Error: Rate limit exceeded", "Error: Server overloaded"
+or "Error: Server is shutting down".
+Its _meta carries REJECTION_META, {"reason": ..., "retry_after": seconds},
+so clients can tell a rejection from a script that merely printed such a
+line, and back off only for real rejections.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from fastmcp.server.dependencies import get_http_headers, get_http_request
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools import ToolResult
+from mcp.types import TextContent
+
+from metrics import REGISTRY
+
+
+RATE_LIMITED_PREFIX = "Error: Rate limit exceeded"
+OVERLOADED_PREFIX = "Error: Server overloaded"
+DRAINING_PREFIX = "Error: Server is shutting down"
+
+# _meta key marking a call that was rejected before it ran
+REJECTION_META = "rmi/rejection"
+
+REJECTIONS = REGISTRY.counter(
+    "rmi_admission_rejections_total",
+    "Tool calls rejected before running, by reason",
+    ("tool", "reason")
+)
+
+
+class TokenBucket:
+    """Allows `rate` events per second on average, with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: float, now: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now: Optional[float] = None) -> float:
+        """
+        Take one token if available.
+
+        Args:
+            now: Current monotonic time (default: time.monotonic())
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets per client, keeping at most max_clients of them."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Calls per second allowed per client
+            burst: Calls a client may make at once after being idle
+            max_clients: Buckets kept; the least recently seen client is
+                         forgotten first (it starts again with a full bucket)
+        """
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client: str, now: Optional[float] = None) -> float:
+        """
+        Count a call for a client.
+
+        Args:
+            client: Client identity (see client_key)
+            now: Current monotonic time
+
+        Returns:
+            0 if the call is allowed, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, now)
+                self._buckets[client] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(now)
+
+
+def client_key() -> str:
+    """
+    Identify the client making the current request.
+
+    Uses, in order: an API key (X-API-Key or Authorization: Bearer), the MCP
+    session id (the mcp-session-id header of streamable HTTP, or the
+    session_id query parameter of SSE messages) and the remote address of
+    the HTTP connection. API keys are hashed so they are not kept in memory.
+    Without HTTP (stdio, in-memory) there is a single client per server,
+    called "local".
+
+    Returns:
+        Stable identity string
+    """
+    headers = get_http_headers(include={"authorization", "mcp-session-id"})
+    api_key = headers.get("x-api-key")
+    if not api_key and headers.get("authorization", "").lower().startswith("bearer "):
+        api_key = headers["authorization"][7:].strip()
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    if headers.get("mcp-session-id"):
+        return "session:" + headers["mcp-session-id"]
+
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return "local"
+
+    # Clients behind one proxy or tunnel share an address, but not a session
+    if request.query_params.get("session_id"):
+        return "session:" + request.query_params["session_id"]
+    if request.client is not None:
+        return "addr:" + request.client.host
+
+    return "local"
+
+
+def rejection_result(reason: str, text: str, retry_after: Optional[float] = 0.0) -> ToolResult:
+    """
+    Build the result of a call rejected before it ran.
+
+    Args:
+        reason: Why the call was rejected (e.g. "rate_limited")
+        text: Error text for the caller
+        retry_after: Seconds to wait before retrying (0: any time soon,
+                     None: do not retry here)
+
+    Returns:
+        Error result carrying REJECTION_META
+    """
+    # Shaped like the result of a tool returning str, which has an output schema
+    return ToolResult(
+        content=[TextContent(type="text", text=text)],
+        structured_content={"result": text},
+        meta={REJECTION_META: {"reason": reason, "retry_after": retry_after}},
+        is_error=True
+    )
+
+
+class AdmissionMiddleware(Middleware):
+    """Apply rate limits, execution quotas and load shedding to tool calls."""
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_runs_per_client: int = 0,
+        overload_reason: Optional[Callable[[], Optional[str]]] = None,
+        draining: Optional[Callable[[], bool]] = None,
+        execution_tools: tuple = ("run_python",),
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            rate_limiter: Limits all tool calls per client (None disables)
+            max_runs_per_client: Concurrent execution_tools calls allowed per
+                                 client (0 means unlimited)
+            overload_reason: Returns why the server is overloaded, or None;
+                             execution_tools calls are shed while it is set
+            draining: Returns whether the server is shutting down;
+                      execution_tools calls are refused (not to be retried
+                      on this server) while it does
+            execution_tools: Tools subject to quotas and load shedding
+        """
+        self.rate_limiter = rate_limiter
+        self.max_runs_per_client = max_runs_per_client
+        self.overload_reason = overload_reason
+        self.draining = draining
+        self.execution_tools = execution_tools
+        self._running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _reject(self, tool: str, reason: str, text: str, retry_after: Optional[float] = 0.0) -> ToolResult:
+        REJECTIONS.inc(tool=tool, reason=reason)
+        return rejection_result(reason, text, retry_after)
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        client = client_key()
+
+        if self.rate_limiter is not None:
+            retry_after = self.rate_limiter.check(client)
+            if retry_after:
+                return self._reject(
+                    tool, "rate_limited",
+                    f"{RATE_LIMITED_PREFIX}; retry in {retry_after:.1f} seconds",
+                    retry_after
+                )
+
+        if tool not in self.execution_tools:
+            return await call_next(context)
+
+        if self.draining is not None and self.draining():
+            return self._reject(
+                tool, "draining",
+                f"{DRAINING_PREFIX} and not accepting new executions", None
+            )
+
+        if self.overload_reason is not None:
+            reason = self.overload_reason()
+            if reason:
+                return self._reject(
+                    tool, "overloaded", f"{OVERLOADED_PREFIX} ({reason}); retry later"
+                )
+
+        if not self.max_runs_per_client:
+            return await call_next(context)
+
+        with self._lock:
+            running = self._running.get(client, 0)
+            if running >= self.max_runs_per_client:
+                over_quota = True
+            else:
+                over_quota = False
+                self._running[client] = running + 1
+        if over_quota:
+            return self._reject(
+                tool, "quota",
+                f"{RATE_LIMITED_PREFIX}: {self.max_runs_per_client} executions "
+                f"already running for this client; retry when one finishes"
+            )
+
+        try:
+            return await call_next(context)
+        finally:
+            with self._lock:
+                self._running[client] -= 1
+                if not self._running[client]:
+                    del self._running[client]
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+ASGI middleware that compresses HTTP responses with zstd or gzip.
+
+The encoding is negotiated from the request's Accept-Encoding header
+(zstd is preferred when the optional ``zstandard`` package is installed).
+Complete responses are only compressed above a size threshold. Streaming
+responses (such as the SSE event stream that carries tool results) are
+compressed chunk by chunk with a flush after every chunk, so each event
+still reaches the client immediately.
+
+Compression ratio inputs (bytes in/out) and CPU time are recorded in the
+metrics registry.
+"""
+
+import importlib.util
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+from metrics import REGISTRY
+
+# zstd support is optional and imported on first use
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+
+# Responses smaller than this are sent uncompressed
+DEFAULT_MINIMUM_SIZE = 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+)
+
+BYTES_IN = REGISTRY.counter(
+    "rmi_http_compression_bytes_in_total",
+    "Response bytes before compression",
+    ("encoding",)
+)
+BYTES_OUT = REGISTRY.counter(
+    "rmi_http_compression_bytes_out_total",
+    "Response bytes after compression",
+    ("encoding",)
+)
+CPU_SECONDS = REGISTRY.counter(
+    "rmi_http_compression_cpu_seconds_total",
+    "CPU time spent compressing responses",
+    ("encoding",)
+)
+RESPONSES = REGISTRY.counter(
+    "rmi_http_compression_responses_total",
+    "Responses by chosen content encoding",
+    ("encoding",)
+)
+
+
+def supported_encodings() -> List[str]:
+    """
+    Get the encodings this server can produce, in order of preference.
+
+    Returns:
+        List of encoding names
+    """
+    return ["zstd", "gzip"] if HAS_ZSTD else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choose a response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        "zstd", "gzip" or None if the response should not be compressed
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        q = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name)
+
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class _StreamCompressor:
+    """Incremental compressor that flushes after each chunk."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            import zstandard
+            self._zstd_flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self._compressor = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        start = time.thread_time()
+        out = self._compressor.compress(data)
+        if final:
+            out += self._compressor.flush()
+        elif self.encoding == "zstd":
+            out += self._compressor.flush(self._zstd_flush_block)
+        else:
+            out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.cpu_seconds += time.thread_time() - start
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        return out
+
+    def record(self):
+        BYTES_IN.inc(self.bytes_in, encoding=self.encoding)
+        BYTES_OUT.inc(self.bytes_out, encoding=self.encoding)
+        CPU_SECONDS.inc(self.cpu_seconds, encoding=self.encoding)
+        RESPONSES.inc(encoding=self.encoding)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress HTTP responses for clients that accept zstd or gzip.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Complete responses below this size are not compressed
+            gzip_level: zlib compression level (1-9)
+            zstd_level: zstd compression level
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = _header(scope.get("headers", []), b"accept-encoding")
+        encoding = negotiate_encoding(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = message.get("headers", [])
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+                passthrough = (
+                    _header(headers, b"content-encoding") is not None
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Small, complete response: not worth compressing
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _StreamCompressor(encoding, self.gzip_level, self.zstd_level)
+                headers = [
+                    (k, v) for k, v in start_message.get("headers", [])
+                    if k.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"vary", b"Accept-Encoding"))
+                if not more_body:
+                    compressed = compressor.compress(body, final=True)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    compressor.record()
+                    return
+                await send({**start_message, "headers": headers})
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+            if not more_body:
+                compressor.record()
+
+        await self.app(scope, receive, send_wrapper)
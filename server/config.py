@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Reloadable server configuration.
+
+The settings that may change while the server is running are kept in one
+immutable ServerConfig object. A reload builds a complete new object and
+swaps it in with a single assignment, so a tool call that took a snapshot of
+the configuration when it started sees either the old or the new settings,
+never a mix of both.
+
+Values come from environment variables and can be overridden by a JSON file
+named by MCP_CONFIG_FILE. The environment of a running process cannot be
+changed from outside, so to change settings without a restart, edit that
+file and send SIGHUP (or call the reload_config tool).
+
+load_server_config reads the server's settings without importing the
+server, so run_http_server.py can report them before it starts.
+"""
+
+import json
+import os
+import sys
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+# Config field -> environment variable
+ENV_VARS = {
+    "allowed_directory": "PYTHON_PROJECTS_DIR",
+    "python_timeout": "PYTHON_TIMEOUT",
+    "python_cmd": "PYTHON_CMD",
+    "python_max_concurrency": "PYTHON_MAX_CONCURRENCY",
+    "syntax_preflight": "PYTHON_SYNTAX_PREFLIGHT",
+    "python_max_timeout": "PYTHON_MAX_TIMEOUT",
+    "python_adaptive_timeout": "PYTHON_ADAPTIVE_TIMEOUT",
+}
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+SYNTAX_PREFLIGHT_VALUES = ("auto",) + TRUE_VALUES + FALSE_VALUES
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Settings that can be reloaded without restarting the server."""
+
+    allowed_directory: str
+    python_timeout: int
+    python_cmd: str
+    python_max_concurrency: int
+    syntax_preflight: str = "auto"
+    # Upper bound for per-call timeouts (never below python_timeout)
+    python_max_timeout: int = 300
+    # Derive each file's deadline from its previous runtimes
+    python_adaptive_timeout: bool = False
+
+    def __post_init__(self):
+        if self.python_timeout <= 0:
+            raise ValueError(f"python_timeout must be positive, got {self.python_timeout}")
+        if self.python_max_timeout <= 0:
+            raise ValueError(f"python_max_timeout must be positive, got {self.python_max_timeout}")
+        if self.python_max_concurrency < 1:
+            raise ValueError(
+                f"python_max_concurrency must be at least 1, got {self.python_max_concurrency}"
+            )
+        if not self.python_cmd:
+            raise ValueError("python_cmd must not be empty")
+        if self.syntax_preflight not in SYNTAX_PREFLIGHT_VALUES:
+            raise ValueError(
+                f"syntax_preflight must be one of {', '.join(SYNTAX_PREFLIGHT_VALUES)}, "
+                f"got {self.syntax_preflight!r}"
+            )
+
+    @property
+    def timeout_limit(self) -> int:
+        """Largest timeout a caller may request."""
+        return max(self.python_timeout, self.python_max_timeout)
+
+    def diff(self, other: "ServerConfig") -> Dict[str, tuple]:
+        """
+        Compare with another configuration.
+
+        Args:
+            other: Configuration to compare against
+
+        Returns:
+            Mapping of field name to (old value, new value) for changed fields
+        """
+        changes = {}
+        for field in fields(self):
+            old, new = getattr(self, field.name), getattr(other, field.name)
+            if old != new:
+                changes[field.name] = (old, new)
+        return changes
+
+
+def _coerce(name: str, value: Any) -> Any:
+    if name == "python_adaptive_timeout":
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in TRUE_VALUES:
+            return True
+        if str(value).lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"{name} must be a boolean, got {value!r}")
+    if name in ("python_timeout", "python_max_concurrency", "python_max_timeout"):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be an integer, got {value!r}")
+    if name == "syntax_preflight":
+        return str(value).lower()
+    return str(value)
+
+
+def load_config(
+    defaults: Mapping[str, Any],
+    environ: Mapping[str, str],
+    config_file: Optional[str] = None,
+) -> ServerConfig:
+    """
+    Build a configuration from defaults, the environment and a JSON file.
+
+    Later sources win: environment variables override the defaults, and
+    keys in the config file override both.
+
+    Args:
+        defaults: Value for every ServerConfig field
+        environ: Environment variables (see ENV_VARS)
+        config_file: Optional path of a JSON object with ServerConfig fields
+
+    Returns:
+        Validated ServerConfig
+
+    Raises:
+        ValueError: If a value is invalid or the file has unknown keys
+        OSError: If the config file cannot be read
+    """
+    values = dict(defaults)
+
+    for name, env_var in ENV_VARS.items():
+        if environ.get(env_var):
+            values[name] = environ[env_var]
+
+    if config_file:
+        try:
+            overrides = json.loads(Path(config_file).read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {config_file}: {e}")
+        if not isinstance(overrides, dict):
+            raise ValueError(f"{config_file} must contain a JSON object")
+        unknown = sorted(set(overrides) - set(ENV_VARS))
+        if unknown:
+            raise ValueError(f"Unknown settings in {config_file}: {', '.join(unknown)}")
+        values.update(overrides)
+
+    return ServerConfig(**{name: _coerce(name, value) for name, value in values.items()})
+
+
+# Cross-platform configuration with fallback
+def get_default_python_dir() -> str:
+    """
+    Get default Python projects directory with cross-platform support.
+
+    Returns:
+        Absolute path to python_projects directory
+    """
+    # Try to get from environment variable first
+    env_dir = os.getenv("PYTHON_PROJECTS_DIR")
+    if env_dir:
+        return env_dir
+
+    # Fallback: Use project root / python_projects
+    # This works on both Windows and Linux
+    project_root = Path(__file__).parent.parent.resolve()
+    default_dir = project_root / "python_projects"
+
+    return str(default_dir)
+
+
+def get_python_command() -> str:
+    """
+    Get the appropriate Python command for the current platform.
+
+    Returns:
+        'python' on Windows, 'python3' on Linux/Mac
+    """
+    if sys.platform == "win32":
+        return "python"
+    else:
+        return "python3"
+
+
+def load_server_config() -> ServerConfig:
+    """
+    Read the reloadable settings from the environment and MCP_CONFIG_FILE.
+
+    Returns:
+        New ServerConfig
+
+    Raises:
+        ValueError: If a setting is invalid
+        OSError: If the config file cannot be read
+    """
+    return load_config(
+        defaults={
+            "allowed_directory": get_default_python_dir(),
+            "python_timeout": 30,
+            "python_cmd": get_python_command(),
+            # Maximum number of Python processes running at once; further calls queue
+            "python_max_concurrency": os.cpu_count() or 4,
+            # "auto" pre-checks syntax only if python_cmd matches this interpreter's version
+            "syntax_preflight": "auto",
+            # Largest per-call timeout a client may ask for
+            "python_max_timeout": 300,
+            # Derive each file's deadline from its previous runtimes
+            "python_adaptive_timeout": False,
+        },
+        environ=os.environ,
+        config_file=os.getenv("MCP_CONFIG_FILE"),
+    )
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Server metrics for tool calls and Python executions.
+
+Tool-level metrics (request counts, latency, output size) are recorded by
+ToolMetricsMiddleware for every tool. Execution-level metrics (queue depth,
+in-flight executions, spawn time, output bytes, timeouts) are updated by
+run_python in mcp_server.py.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastmcp.server.middleware import Middleware
+
+from metrics import REGISTRY
+
+
+TOOL_CALLS = REGISTRY.counter(
+    "rmi_tool_calls_total",
+    "Tool calls by tool and outcome",
+    ("tool", "status")
+)
+TOOL_DURATION = REGISTRY.histogram(
+    "rmi_tool_duration_seconds",
+    "Tool call latency",
+    ("tool",)
+)
+TOOL_OUTPUT_BYTES = REGISTRY.counter(
+    "rmi_tool_output_bytes_total",
+    "Bytes of text returned by tools",
+    ("tool",)
+)
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "rmi_run_python_queue_depth",
+    "run_python calls waiting for an execution slot"
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "rmi_run_python_in_flight",
+    "Python processes currently executing"
+)
+SPAWN_SECONDS = REGISTRY.histogram(
+    "rmi_run_python_spawn_seconds",
+    "Time to start a Python process",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+EXECUTION_SECONDS = REGISTRY.histogram(
+    "rmi_run_python_execution_seconds",
+    "Time from process start to exit"
+)
+OUTPUT_BYTES = REGISTRY.counter(
+    "rmi_run_python_output_bytes_total",
+    "Bytes written by Python processes",
+    ("stream",)
+)
+TIMEOUTS = REGISTRY.counter(
+    "rmi_run_python_timeouts_total",
+    "Python processes killed for exceeding the timeout"
+)
+ADAPTIVE_TIMEOUTS = REGISTRY.counter(
+    "rmi_run_python_adaptive_timeouts_total",
+    "Python processes killed by a deadline learned from previous runs"
+)
+
+
+# Outcome of the tool call being handled. A dict rather than a flag, so a
+# tool running in a worker thread (with a copy of the context) can set it.
+_call_outcome: ContextVar[Optional[dict]] = ContextVar("rmi_call_outcome", default=None)
+
+
+def _result_text(result) -> str:
+    return "".join(getattr(block, "text", "") for block in (result.content or []))
+
+
+def tool_error(text: str) -> str:
+    """
+    Mark the current tool call as failed.
+
+    Args:
+        text: Error text the tool returns (e.g. "Error: File not found")
+
+    Returns:
+        The text unchanged
+    """
+    outcome = _call_outcome.get()
+    if outcome is not None:
+        outcome["error"] = True
+    return text
+
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Record count, latency, outcome and output size of every tool call.
+
+    Tools report their own failures as strings built with tool_error, so
+    those are counted as errors along with error results and raised
+    exceptions. Output text is not inspected: a script may print "Error".
+    """
+
+    async def on_call_tool(self, context, call_next):
+        tool = context.message.name
+        start = time.perf_counter()
+        status = "error"
+        outcome = {"error": False}
+        token = _call_outcome.set(outcome)
+        try:
+            result = await call_next(context)
+            text = _result_text(result)
+            TOOL_OUTPUT_BYTES.inc(len(text.encode("utf-8")), tool=tool)
+            if not getattr(result, "is_error", False) and not outcome["error"]:
+                status = "ok"
+            return result
+        finally:
+            _call_outcome.reset(token)
+            TOOL_DURATION.observe(time.perf_counter() - start, tool=tool)
+            TOOL_CALLS.inc(tool=tool, status=status)
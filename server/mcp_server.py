@@ -10,62 +10,305 @@ Author: Based on PRD specification
 """
 
 import os
+import re
 import sys
 import subprocess
 import shlex
+import json
+import signal
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from fastmcp import FastMCP
+from instrumentation import (
+    ToolMetricsMiddleware, tool_error, QUEUE_DEPTH, IN_FLIGHT, SPAWN_SECONDS,
+    EXECUTION_SECONDS, OUTPUT_BYTES, TIMEOUTS, ADAPTIVE_TIMEOUTS
+)
+from tracing import TracingMiddleware, create_tracer
+from config import ServerConfig, load_server_config, get_default_python_dir, get_python_command
+from admission import AdmissionMiddleware, RateLimiter, DRAINING_PREFIX
+
+if TYPE_CHECKING:
+    # Imported lazily on first use to keep server start-up fast
+    from search_index import TrigramIndex
+    from symbol_index import SymbolIndex, FileSymbols
+    from syntax_check import SyntaxChecker
+    from runtime_history import RuntimeHistory
 
 # Initialize FastMCP server
 mcp = FastMCP("RmiAgentMcpServer")
+mcp.add_middleware(ToolMetricsMiddleware())
+
 
-# Cross-platform configuration with fallback
-def get_default_python_dir() -> str:
+def get_default_cache_dir() -> str:
     """
-    Get default Python projects directory with cross-platform support.
+    Get the directory where the server keeps its on-disk caches.
     
     Returns:
-        Absolute path to python_projects directory
+        Absolute path to the cache directory
     """
-    # Try to get from environment variable first
-    env_dir = os.getenv("PYTHON_PROJECTS_DIR")
+    env_dir = os.getenv("MCP_CACHE_DIR")
     if env_dir:
         return env_dir
     
-    # Fallback: Use project root / python_projects
-    # This works on both Windows and Linux
     project_root = Path(__file__).parent.parent.resolve()
-    default_dir = project_root / "python_projects"
+    return str(project_root / ".mcp_cache")
+
+
+# Configuration (reloadable, see reload_server_config)
+_config = load_server_config()
+_config_lock = threading.Lock()
+# Module-level names kept for existing callers; they follow the active config
+ALLOWED_DIRECTORY = _config.allowed_directory
+PYTHON_TIMEOUT = _config.python_timeout
+PYTHON_CMD = _config.python_cmd
+PYTHON_MAX_CONCURRENCY = _config.python_max_concurrency
+SYNTAX_PREFLIGHT = _config.syntax_preflight
+
+# Fixed for the lifetime of the process
+CACHE_DIR = get_default_cache_dir()
+# Trace exporters: comma-separated "memory", "file" or "none"
+TRACE_EXPORT = os.getenv("MCP_TRACE_EXPORT", "memory")
+TRACE_FILE = os.getenv("MCP_TRACE_FILE", str(Path(CACHE_DIR) / "traces.jsonl"))
+# Admission control (0 disables each limit, see AdmissionMiddleware)
+RATE_LIMIT = float(os.getenv("MCP_RATE_LIMIT", "0"))  # tool calls per second per client
+RATE_BURST = float(os.getenv("MCP_RATE_BURST", "10"))
+CLIENT_MAX_RUNS = int(os.getenv("MCP_CLIENT_MAX_RUNS", "0"))  # concurrent run_python per client
+SHED_QUEUE_DEPTH = int(os.getenv("MCP_SHED_QUEUE_DEPTH", "0"))  # queued run_python calls
+SHED_LOAD = float(os.getenv("MCP_SHED_LOAD", "0"))  # 1-minute load average per CPU
+
+# Request tracing (see get_recent_traces)
+tracer = create_tracer(
+    mcp.name,
+    TRACE_EXPORT,
+    TRACE_FILE,
+    buffer_size=int(os.getenv("MCP_TRACE_BUFFER", "200"))
+)
+mcp.add_middleware(TracingMiddleware(tracer))
+
+# Lazily created search index (see get_search_index)
+_search_index: Optional["TrigramIndex"] = None
+
+# AST symbols of Python files, refreshed lazily per file (see get_symbol_index)
+_symbol_index: Optional["SymbolIndex"] = None
+
+# Execution slots limiting concurrent Python processes
+_execution_slots = threading.BoundedSemaphore(PYTHON_MAX_CONCURRENCY)
+
+# In-process compile results, cached by content hash (see get_syntax_checker)
+_syntax_checker: Optional["SyntaxChecker"] = None
+_syntax_preflight_enabled: Optional[bool] = None
+
+# Recent runtimes per file, for adaptive timeouts (see get_runtime_history)
+_runtime_history: Optional["RuntimeHistory"] = None
+
+# Graceful drain: once draining, run_python rejects new work (see begin_drain)
+_drain_condition = threading.Condition()
+_draining = False
+_active_executions = 0
+
+
+def get_config() -> ServerConfig:
+    """
+    Get the active configuration.
     
-    return str(default_dir)
+    Callers should take one snapshot per request and use it throughout, so
+    a concurrent reload cannot give them a mix of old and new settings.
+    
+    Returns:
+        Current ServerConfig
+    """
+    return _config
 
 
-def get_python_command() -> str:
+def apply_config(config: ServerConfig) -> dict:
     """
-    Get the appropriate Python command for the current platform.
+    Swap in a new configuration.
+    
+    State derived from the old settings (search index, pre-flight decision,
+    execution slots) is reset. Executions that are already running keep the
+    settings and execution slot they started with.
+    
+    Args:
+        config: Configuration to activate
     
     Returns:
-        'python' on Windows, 'python3' on Linux/Mac
+        Mapping of changed field to (old value, new value)
     """
-    if sys.platform == "win32":
-        return "python"
-    else:
-        return "python3"
+    global _config, _search_index, _syntax_preflight_enabled, _execution_slots
+    global ALLOWED_DIRECTORY, PYTHON_TIMEOUT, PYTHON_CMD, PYTHON_MAX_CONCURRENCY, SYNTAX_PREFLIGHT
+    
+    with _config_lock:
+        changes = _config.diff(config)
+        if "allowed_directory" in changes:
+            _search_index = None
+        if "python_cmd" in changes or "syntax_preflight" in changes:
+            _syntax_preflight_enabled = None
+        if "python_max_concurrency" in changes:
+            _execution_slots = threading.BoundedSemaphore(config.python_max_concurrency)
+        
+        ALLOWED_DIRECTORY = config.allowed_directory
+        PYTHON_TIMEOUT = config.python_timeout
+        PYTHON_CMD = config.python_cmd
+        PYTHON_MAX_CONCURRENCY = config.python_max_concurrency
+        SYNTAX_PREFLIGHT = config.syntax_preflight
+        _config = config
+    
+    return changes
+
+
+def reload_server_config() -> dict:
+    """
+    Re-read the configuration and swap it in.
+    
+    Returns:
+        Mapping of changed field to (old value, new value)
+    
+    Raises:
+        ValueError: If a setting is invalid (the old configuration stays active)
+        OSError: If the config file cannot be read
+    """
+    return apply_config(load_server_config())
+
+
+def format_config_changes(changes: dict) -> str:
+    """
+    Describe configuration changes for logs and tool output.
+    
+    Args:
+        changes: Result of apply_config
+    
+    Returns:
+        One "name: old -> new" entry per line
+    """
+    if not changes:
+        return "Configuration unchanged"
+    return "Configuration reloaded:\n" + "".join(
+        f"  {name}: {old} -> {new}\n" for name, (old, new) in changes.items()
+    )
+
+
+def install_reload_handler() -> bool:
+    """
+    Reload the configuration when the process receives SIGHUP.
+    
+    The reload runs in a separate thread, so the signal handler never
+    waits for locks held by the interrupted code.
+    
+    Returns:
+        True if the handler was installed (SIGHUP does not exist on Windows)
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return False
+    
+    def reload_and_log():
+        try:
+            message = format_config_changes(reload_server_config())
+        except (OSError, ValueError) as e:
+            message = f"Configuration not reloaded: {e}"
+        # stdout carries the protocol in stdio mode
+        print(message.rstrip(), file=sys.stderr)
+    
+    signal.signal(
+        signal.SIGHUP,
+        lambda signum, frame: threading.Thread(target=reload_and_log, daemon=True).start()
+    )
+    return True
+
+
+def begin_drain():
+    """Stop accepting new executions; running ones are allowed to finish."""
+    global _draining
+    with _drain_condition:
+        _draining = True
+
+
+def is_draining() -> bool:
+    """Check whether the server is draining."""
+    return _draining
+
+
+def wait_for_drain(timeout: Optional[float] = None) -> bool:
+    """
+    Wait until no executions are running.
+    
+    Args:
+        timeout: Maximum seconds to wait (None waits indefinitely)
+    
+    Returns:
+        True if all executions finished, False on timeout
+    """
+    with _drain_condition:
+        return _drain_condition.wait_for(lambda: _active_executions == 0, timeout)
+
+
+def _start_execution() -> bool:
+    global _active_executions
+    with _drain_condition:
+        if _draining:
+            return False
+        _active_executions += 1
+        return True
+
 
+def _finish_execution():
+    global _active_executions
+    with _drain_condition:
+        _active_executions -= 1
+        _drain_condition.notify_all()
 
-# Configuration
-ALLOWED_DIRECTORY = get_default_python_dir()
-PYTHON_TIMEOUT = int(os.getenv("PYTHON_TIMEOUT", "30"))
-PYTHON_CMD = get_python_command()
+
+def overload_reason() -> Optional[str]:
+    """
+    Check whether new executions should be shed.
+    
+    Returns:
+        Why the server is overloaded, or None if it can take more work
+    """
+    if SHED_QUEUE_DEPTH:
+        queued = int(QUEUE_DEPTH.value())
+        if queued >= SHED_QUEUE_DEPTH:
+            return f"{queued} executions queued"
+    
+    if SHED_LOAD and hasattr(os, "getloadavg"):
+        load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        if load >= SHED_LOAD:
+            return f"load average {load:.2f} per CPU"
+    
+    return None
 
 
-def validate_file_path(file_path: str) -> Path:
+def readiness() -> tuple:
+    """
+    Check whether the server should receive new traffic.
+    
+    Returns:
+        Tuple of (ready, reason); reason is empty when ready
+    """
+    if is_draining():
+        return False, "draining"
+    reason = overload_reason()
+    if reason:
+        return False, f"overloaded: {reason}"
+    return True, ""
+
+
+mcp.add_middleware(AdmissionMiddleware(
+    rate_limiter=RateLimiter(RATE_LIMIT, RATE_BURST) if RATE_LIMIT > 0 else None,
+    max_runs_per_client=CLIENT_MAX_RUNS,
+    overload_reason=overload_reason,
+    draining=is_draining,
+))
+
+
+def validate_file_path(file_path: str, allowed_directory: Optional[str] = None) -> Path:
     """
     Validate that the file path is safe and within allowed directory.
     
     Args:
         file_path: Path to the Python file
+        allowed_directory: Directory the file must be in (default: active config)
         
     Returns:
         Validated Path object
@@ -89,20 +332,228 @@ def validate_file_path(file_path: str) -> Path:
         raise ValueError(f"File must have .py extension: {file_path}")
     
     # Security: Check if file is within allowed directory
-    allowed_dir = Path(ALLOWED_DIRECTORY).resolve()
+    if allowed_directory is None:
+        allowed_directory = get_config().allowed_directory
+    allowed_dir = Path(allowed_directory).resolve()
     try:
         abs_path.relative_to(allowed_dir)
     except ValueError:
         raise ValueError(
-            f"Access denied: File must be within {ALLOWED_DIRECTORY}. "
+            f"Access denied: File must be within {allowed_directory}. "
             f"Got: {abs_path}"
         )
     
     return abs_path
 
 
+def validate_directory_path(directory: Optional[str] = None) -> Path:
+    """
+    Validate that a directory is within the allowed directory.
+    
+    Args:
+        directory: Directory path. If None, the allowed directory is used.
+        
+    Returns:
+        Validated Path object
+        
+    Raises:
+        ValueError: If the directory is invalid or outside allowed directory
+    """
+    allowed_directory = get_config().allowed_directory
+    if directory is None:
+        search_dir = Path(allowed_directory)
+    else:
+        search_dir = Path(directory).resolve()
+        # Security check
+        allowed_dir = Path(allowed_directory).resolve()
+        try:
+            search_dir.relative_to(allowed_dir)
+        except ValueError:
+            raise ValueError(f"Directory must be within {allowed_directory}")
+    
+    if not search_dir.exists():
+        raise ValueError(f"Directory not found: {search_dir}")
+    
+    if not search_dir.is_dir():
+        raise ValueError(f"Path is not a directory: {search_dir}")
+    
+    return search_dir
+
+
+def syntax_preflight_enabled() -> bool:
+    """
+    Check whether files should be compiled in-process before execution.
+    
+    Returns:
+        True if syntax pre-flight is enabled
+    """
+    global _syntax_preflight_enabled
+    if _syntax_preflight_enabled is None:
+        config = get_config()
+        if config.syntax_preflight in ("1", "true", "yes", "on"):
+            _syntax_preflight_enabled = True
+        elif config.syntax_preflight in ("0", "false", "no", "off"):
+            _syntax_preflight_enabled = False
+        else:
+            from syntax_check import interpreter_matches
+            _syntax_preflight_enabled = interpreter_matches(config.python_cmd)
+    return _syntax_preflight_enabled
+
+
+def get_syntax_checker() -> "SyntaxChecker":
+    """
+    Get the syntax checker, creating it on first use.
+    
+    Returns:
+        SyntaxChecker instance
+    """
+    global _syntax_checker
+    if _syntax_checker is None:
+        from syntax_check import SyntaxChecker
+        _syntax_checker = SyntaxChecker()
+    return _syntax_checker
+
+
+def get_runtime_history() -> "RuntimeHistory":
+    """
+    Get the per-file runtime history, creating it on first use.
+    
+    Returns:
+        RuntimeHistory instance
+    """
+    global _runtime_history
+    if _runtime_history is None:
+        from runtime_history import RuntimeHistory
+        _runtime_history = RuntimeHistory()
+    return _runtime_history
+
+
+def resolve_timeout(file_path: Path, requested: Optional[float], config: ServerConfig) -> tuple:
+    """
+    Decide how long a run may take.
+    
+    A requested timeout is capped at the server maximum. Without one, the
+    adaptive deadline learned from the file's previous runs is used if
+    enabled and available, otherwise the configured timeout.
+    
+    Args:
+        file_path: Validated path to the Python file
+        requested: Timeout asked for by the caller, or None
+        config: Active configuration
+    
+    Returns:
+        Tuple of (timeout in seconds, True if it is an adaptive deadline)
+    
+    Raises:
+        ValueError: If the requested timeout is not positive
+    """
+    if requested is not None:
+        if requested <= 0:
+            raise ValueError(f"Timeout must be positive, got {requested}")
+        return min(requested, config.timeout_limit), False
+    
+    if config.python_adaptive_timeout:
+        deadline = get_runtime_history().deadline(file_path, config.python_timeout)
+        if deadline is not None:
+            return round(deadline, 1), True
+    
+    return config.python_timeout, False
+
+
+def format_process_output(stdout: str, stderr: str, returncode: int) -> str:
+    """
+    Combine the output of a Python process into a single result string.
+    
+    Args:
+        stdout: Captured standard output
+        stderr: Captured standard error
+        returncode: Process exit code
+    
+    Returns:
+        Combined output, or "(No output)" if there was none
+    """
+    output = ""
+    if stdout:
+        output += stdout
+    if stderr:
+        if output:
+            output += "\n--- stderr ---\n"
+        output += stderr
+    
+    # Add return code if non-zero
+    if returncode != 0:
+        output += f"\n\n[Process exited with code {returncode}]"
+    
+    return output if output else "(No output)"
+
+
+def execute_python(file_path: Path, timeout: float, python_cmd: Optional[str] = None) -> tuple:
+    """
+    Run a validated Python file in a subprocess, waiting for a free slot.
+    
+    Args:
+        file_path: Validated path to the Python file
+        timeout: Seconds before the process is killed
+        python_cmd: Interpreter to run (default: active config)
+    
+    Returns:
+        Tuple of (stdout, stderr, returncode)
+    
+    Raises:
+        subprocess.TimeoutExpired: If the process ran longer than timeout
+    """
+    # Build command - use platform-appropriate Python command
+    python_cmd = python_cmd or get_config().python_cmd
+    cmd = [python_cmd, str(file_path)]
+    
+    # Release the slot we took, even if a reload replaced the semaphore meanwhile
+    slots = _execution_slots
+    with tracer.span("queue_wait"):
+        QUEUE_DEPTH.inc()
+        try:
+            slots.acquire()
+        finally:
+            QUEUE_DEPTH.dec()
+    
+    IN_FLIGHT.inc()
+    try:
+        start = time.perf_counter()
+        with tracer.span("spawn", command=python_cmd):
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=file_path.parent  # Run in the file's directory
+            )
+        started = time.perf_counter()
+        SPAWN_SECONDS.observe(started - start)
+        
+        try:
+            with tracer.span("execution", pid=proc.pid, timeout=timeout) as span:
+                try:
+                    stdout, stderr = proc.communicate(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.communicate()
+                    TIMEOUTS.inc()
+                    raise
+                if span is not None:
+                    span.set_attribute("exit_code", proc.returncode)
+            get_runtime_history().record(file_path, time.perf_counter() - started)
+        finally:
+            EXECUTION_SECONDS.observe(time.perf_counter() - started)
+        
+        OUTPUT_BYTES.inc(len(stdout.encode("utf-8", "replace")), stream="stdout")
+        OUTPUT_BYTES.inc(len(stderr.encode("utf-8", "replace")), stream="stderr")
+        return stdout, stderr, proc.returncode
+    finally:
+        IN_FLIGHT.dec()
+        slots.release()
+
+
 @mcp.tool
-def run_python(file_name: str) -> str:
+def run_python(file_name: str, timeout: Optional[float] = None) -> str:
     """
     Execute a Python file and return its output (stdout and stderr).
     
@@ -112,6 +563,10 @@ def run_python(file_name: str) -> str:
     Args:
         file_name: Path to the Python file to execute. Can be absolute or relative
                    to the allowed directory. Must have .py extension.
+        timeout: Seconds before the run is killed. Capped by the server maximum
+                 (PYTHON_MAX_TIMEOUT). Defaults to the server timeout, or to a
+                 deadline learned from the file's previous runs if adaptive
+                 timeouts are enabled.
     
     Returns:
         Combined stdout and stderr output from the Python execution.
@@ -124,47 +579,58 @@ def run_python(file_name: str) -> str:
         >>> run_python("/home/ubuntu/python_projects/test.py")
         "Test passed!\nAll assertions successful."
     """
+    # The admission middleware refuses calls once draining; this catches
+    # calls admitted just before the drain began
+    if not _start_execution():
+        return tool_error(f"{DRAINING_PREFIX} and not accepting new executions")
+    try:
+        return _run_python(file_name, timeout, get_config())
+    finally:
+        _finish_execution()
+
+
+def _run_python(file_name: str, requested_timeout: Optional[float], config: ServerConfig) -> str:
+    """Run a Python file using one configuration snapshot throughout."""
+    adaptive = False
     try:
         # Validate file path
-        file_path = validate_file_path(file_name)
+        with tracer.span("validation", file=file_name):
+            file_path = validate_file_path(file_name, config.allowed_directory)
         
-        # Build command - use platform-appropriate Python command
-        cmd = [PYTHON_CMD, str(file_path)]
+        # Report syntax errors without spawning a process
+        if syntax_preflight_enabled():
+            with tracer.span("syntax_check"):
+                syntax_error = get_syntax_checker().check(file_path)
+            if syntax_error is not None:
+                with tracer.span("output_assembly"):
+                    return format_process_output("", syntax_error, 1)
         
         # Execute Python file
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=PYTHON_TIMEOUT,
-            cwd=file_path.parent  # Run in the file's directory
-        )
-        
-        # Combine stdout and stderr
-        output = ""
-        if proc.stdout:
-            output += proc.stdout
-        if proc.stderr:
-            if output:
-                output += "\n--- stderr ---\n"
-            output += proc.stderr
+        timeout, adaptive = resolve_timeout(file_path, requested_timeout, config)
+        stdout, stderr, returncode = execute_python(file_path, timeout, config.python_cmd)
         
-        # Add return code if non-zero
-        if proc.returncode != 0:
-            output += f"\n\n[Process exited with code {proc.returncode}]"
-        
-        return output if output else "(No output)"
+        with tracer.span("output_assembly", stdout_chars=len(stdout), stderr_chars=len(stderr)):
+            return format_process_output(stdout, stderr, returncode)
         
     except ValueError as e:
         # File validation errors
-        return f"Error: {str(e)}"
+        return tool_error(f"Error: {str(e)}")
     
     except subprocess.TimeoutExpired:
-        return f"Error: Execution timed out after {PYTHON_TIMEOUT} seconds"
+        if adaptive:
+            # Learn the file's runtime again; the next run gets the full timeout
+            ADAPTIVE_TIMEOUTS.inc()
+            get_runtime_history().reset(file_path)
+            return tool_error(
+                f"Error: Execution timed out after {timeout:g} seconds "
+                f"(adaptive limit from previous runs of this file; "
+                f"pass a timeout to allow longer)"
+            )
+        return tool_error(f"Error: Execution timed out after {timeout:g} seconds")
     
     except Exception as e:
         # Unexpected errors
-        return f"Error executing Python file: {type(e).__name__}: {str(e)}"
+        return tool_error(f"Error executing Python file: {type(e).__name__}: {str(e)}")
 
 
 @mcp.tool
@@ -179,22 +645,7 @@ def list_python_files(directory: Optional[str] = None) -> str:
         List of Python files found, one per line.
     """
     try:
-        if directory is None:
-            search_dir = Path(ALLOWED_DIRECTORY)
-        else:
-            search_dir = Path(directory).resolve()
-            # Security check
-            allowed_dir = Path(ALLOWED_DIRECTORY).resolve()
-            try:
-                search_dir.relative_to(allowed_dir)
-            except ValueError:
-                return f"Error: Directory must be within {ALLOWED_DIRECTORY}"
-        
-        if not search_dir.exists():
-            return f"Error: Directory not found: {search_dir}"
-        
-        if not search_dir.is_dir():
-            return f"Error: Path is not a directory: {search_dir}"
+        search_dir = validate_directory_path(directory)
         
         # Find all .py files
         py_files = sorted(search_dir.glob("**/*.py"))
@@ -210,8 +661,233 @@ def list_python_files(directory: Optional[str] = None) -> str:
         
         return output
         
+    except ValueError as e:
+        return tool_error(f"Error: {str(e)}")
+        
     except Exception as e:
-        return f"Error listing files: {type(e).__name__}: {str(e)}"
+        return tool_error(f"Error listing files: {type(e).__name__}: {str(e)}")
+
+
+def get_search_index() -> "TrigramIndex":
+    """
+    Get the trigram index for the allowed directory, creating it on first use.
+    
+    Returns:
+        TrigramIndex instance
+    """
+    global _search_index
+    if _search_index is None:
+        from search_index import TrigramIndex
+        _search_index = TrigramIndex(
+            get_config().allowed_directory,
+            str(Path(CACHE_DIR) / "search_index.json")
+        )
+    return _search_index
+
+
+@mcp.tool
+def search_python_files(
+    query: str,
+    regex: bool = False,
+    case_sensitive: bool = True,
+    max_results: int = 100
+) -> str:
+    """
+    Search the contents of all files in the allowed directory.
+    
+    The search is backed by an on-disk trigram index that is updated
+    incrementally, so it is much faster than running a script to grep
+    the tree.
+    
+    Args:
+        query: Text to search for (or a regular expression if regex is True)
+        regex: Interpret query as a Python regular expression
+        case_sensitive: Match case exactly (default: True)
+        max_results: Maximum number of matching lines to return
+    
+    Returns:
+        Matching lines as "path:line: text", one per line.
+    """
+    try:
+        if not query:
+            return tool_error("Error: Query must not be empty")
+        
+        allowed_directory = get_config().allowed_directory
+        if not os.path.isdir(allowed_directory):
+            return f"No matches for {query!r} in {allowed_directory}"
+        matches = get_search_index().search(
+            query,
+            regex=regex,
+            case_sensitive=case_sensitive,
+            max_results=max_results
+        )
+        
+        if not matches:
+            return f"No matches for {query!r} in {allowed_directory}"
+        
+        output = f"Matches for {query!r} in {allowed_directory}:\n"
+        for match in matches:
+            output += f"  {match.path}:{match.line_number}: {match.line.strip()}\n"
+        
+        if len(matches) >= max_results:
+            output += f"  ... (stopped after {max_results} matches)\n"
+        
+        return output
+    
+    except re.error as e:
+        return tool_error(f"Error: Invalid regular expression: {str(e)}")
+    
+    except Exception as e:
+        return tool_error(f"Error searching files: {type(e).__name__}: {str(e)}")
+
+
+def get_symbol_index() -> "SymbolIndex":
+    """
+    Get the AST symbol index, creating it on first use.
+    
+    Returns:
+        SymbolIndex instance
+    """
+    global _symbol_index
+    if _symbol_index is None:
+        from symbol_index import SymbolIndex
+        _symbol_index = SymbolIndex()
+    return _symbol_index
+
+
+def format_file_symbols(rel_path: str, symbols: "FileSymbols") -> str:
+    """
+    Format the symbols of one file for display.
+    
+    Args:
+        rel_path: Path shown in the header
+        symbols: Symbols extracted from the file
+    
+    Returns:
+        Indented, human-readable description
+    """
+    output = f"{rel_path}\n"
+    if symbols.error:
+        return output + f"  Error: {symbols.error}\n"
+    
+    if symbols.docstring:
+        output += f"  Docstring: {symbols.docstring}\n"
+    
+    for title, items in (("Classes", symbols.classes), ("Functions", symbols.functions)):
+        if not items:
+            continue
+        output += f"  {title}:\n"
+        for item in items:
+            output += f"    - {item.signature} (line {item.line})"
+            if item.docstring:
+                output += f": {item.docstring}"
+            output += "\n"
+    
+    if symbols.entry_point_line is not None:
+        output += f"  Entry point: if __name__ == \"__main__\" (line {symbols.entry_point_line})\n"
+    else:
+        output += "  Entry point: none\n"
+    
+    return output
+
+
+@mcp.tool
+def describe_python_files(path: Optional[str] = None) -> str:
+    """
+    Describe Python files without running them.
+    
+    Lists the module docstring, top-level classes and functions (with
+    signatures and docstrings) and the `if __name__ == "__main__"` entry
+    point of each file. Results come from a cached AST index, so this is
+    much cheaper than executing files to find out what they do.
+    
+    Args:
+        path: A Python file or a directory to describe. If None, describes
+              every Python file in the allowed directory.
+    
+    Returns:
+        Description of each file's symbols.
+    """
+    try:
+        symbol_index = get_symbol_index()
+        
+        if path is not None and Path(path).resolve().is_file():
+            file_path = validate_file_path(path)
+            return format_file_symbols(file_path.name, symbol_index.get(file_path))
+        
+        search_dir = validate_directory_path(path)
+        py_files = sorted(search_dir.glob("**/*.py"))
+        
+        if path is None:
+            symbol_index.prune(py_files)
+        
+        if not py_files:
+            return f"No Python files found in {search_dir}"
+        
+        output = f"Python files in {search_dir}:\n"
+        for py_file in py_files:
+            rel_path = py_file.relative_to(search_dir)
+            output += "\n" + format_file_symbols(str(rel_path), symbol_index.get(py_file))
+        
+        return output
+    
+    except ValueError as e:
+        return tool_error(f"Error: {str(e)}")
+    
+    except Exception as e:
+        return tool_error(f"Error describing files: {type(e).__name__}: {str(e)}")
+
+
+@mcp.tool
+def get_recent_traces(limit: int = 10, tool: Optional[str] = None) -> str:
+    """
+    Return recent request traces for debugging slow tool calls.
+    
+    Each trace breaks one tool call into spans (validation, queue_wait,
+    spawn, execution, output_assembly, serialization) and is returned in
+    OTLP-compatible JSON.
+    
+    Args:
+        limit: Maximum number of traces to return (most recent last)
+        tool: Only return traces of this tool (e.g. "run_python")
+    
+    Returns:
+        JSON list of OTLP resourceSpans documents.
+    """
+    buffer = tracer.ring_buffer()
+    if buffer is None:
+        return tool_error("Error: In-memory tracing is disabled (set MCP_TRACE_EXPORT=memory)")
+    
+    traces = buffer.recent()
+    if tool is not None:
+        traces = [
+            trace for trace in traces
+            if any(
+                span["name"] == f"tools/call {tool}"
+                for span in trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            )
+        ]
+    
+    return json.dumps(traces[-limit:] if limit > 0 else [], indent=2)
+
+
+@mcp.tool
+def reload_config() -> str:
+    """
+    Reload the server configuration without a restart.
+    
+    Re-reads the environment and the JSON file named by MCP_CONFIG_FILE
+    (allowed directory, timeouts, Python command, concurrency, syntax
+    pre-flight) and swaps the new settings in atomically. Executions that
+    are already running finish with the settings they started with.
+    
+    Returns:
+        The settings that changed, or an error if the new configuration is invalid.
+    """
+    try:
+        return format_config_changes(reload_server_config())
+    except (OSError, ValueError) as e:
+        return tool_error(f"Error: Configuration not reloaded: {str(e)}")
 
 
 def main():
@@ -220,12 +896,19 @@ def main():
     """
     # Ensure allowed directory exists
     os.makedirs(ALLOWED_DIRECTORY, exist_ok=True)
+    install_reload_handler()
     
     print(f"RmiAgentMcpServer starting...")
     print(f"Platform: {sys.platform}")
     print(f"Python command: {PYTHON_CMD}")
     print(f"Allowed directory: {ALLOWED_DIRECTORY}")
-    print(f"Python timeout: {PYTHON_TIMEOUT}s")
+    print(f"Python timeout: {PYTHON_TIMEOUT}s (per-call max {_config.timeout_limit}s"
+          f"{', adaptive' if _config.python_adaptive_timeout else ''})")
+    print(f"Max concurrent executions: {PYTHON_MAX_CONCURRENCY}")
+    print(f"Rate limit per client: {f'{RATE_LIMIT}/s (burst {RATE_BURST:g})' if RATE_LIMIT > 0 else 'off'}")
+    print(f"Syntax pre-flight: {SYNTAX_PREFLIGHT}")
+    print(f"Cache directory: {CACHE_DIR}")
+    print(f"Trace export: {TRACE_EXPORT}")
     
     # Run the FastMCP server
     mcp.run()
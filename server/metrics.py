@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Low-overhead in-process metrics for RmiAgentMcpServer.
+
+Metrics are plain Python objects guarded by a lock and registered in a
+module-level registry. Updating a metric is a dictionary update, so it is
+cheap enough to do on every request.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds (Prometheus client defaults plus longer runs)
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class Metric:
+    """Base class for named metrics with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name (e.g. "rmi_http_compression_bytes_in_total")
+            description: Human-readable description
+            labels: Names of the labels this metric is split by
+        """
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+
+class Counter(Metric):
+    """A monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add (must not be negative)
+            **labels: Label values
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the current value for a label combination."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        """Get all (label values, value) pairs."""
+        with self._lock:
+            if not self.labels and not self._values:
+                return [((), 0)]
+            return sorted(self._values.items())
+
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        """Increase the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        """Decrease the gauge."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        """Set the gauge to a value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        """Get the current value for a label combination."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        """Get all (label values, value) pairs."""
+        with self._lock:
+            if not self.labels and not self._values:
+                return [((), 0)]
+            return sorted(self._values.items())
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (e.g. a duration in seconds)
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations for a label combination."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[Tuple[LabelValues, List[int], float]]:
+        """Get all (label values, cumulative bucket counts, sum) entries."""
+        with self._lock:
+            items = sorted(self._values.items())
+            if not self.labels and not items:
+                items = [((), ([0] * (len(self.buckets) + 1), 0.0))]
+            result = []
+            for key, (counts, total) in items:
+                cumulative, running = [], 0
+                for count in counts:
+                    running += count
+                    cumulative.append(running)
+                result.append((key, cumulative, total))
+            return result
+
+
+class Registry:
+    """Collection of metrics, keyed by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Register a metric, or return the existing one with the same name.
+
+        Args:
+            metric: Metric to register
+
+        Returns:
+            The registered metric
+        """
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, description: str, labels: Tuple[str, ...] = ()) -> Counter:
+        """Create (or get) a counter."""
+        return self.register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        """Create (or get) a gauge."""
+        return self.register(Gauge(name, description, labels))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create (or get) a histogram."""
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def metrics(self) -> List[Metric]:
+        """Get all registered metrics, sorted by name."""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(registry: "Registry") -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Args:
+        registry: Registry to render
+
+    Returns:
+        Text suitable for a /metrics endpoint
+    """
+    lines = []
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+        if isinstance(metric, Histogram):
+            for values, cumulative, total in metric.samples():
+                for bound, count in zip(metric.buckets + (float("inf"),), cumulative):
+                    le = f'le="{_format_value(bound)}"'
+                    labels = _format_labels(metric.labels, values, le)
+                    lines.append(f"{metric.name}_bucket{labels} {count}")
+                labels = _format_labels(metric.labels, values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {cumulative[-1]}")
+        else:
+            for values, value in metric.samples():
+                labels = _format_labels(metric.labels, values)
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+
+# Default registry used by the server
+REGISTRY = Registry()
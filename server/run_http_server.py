@@ -1,47 +1,323 @@
 #!/usr/bin/env python3
 """
-Run MCP Server with HTTP/SSE transport.
+Run MCP Server with HTTP transport.
 
-This allows remote clients to connect via HTTP.
+This allows remote clients to connect via HTTP. Two transports are supported:
+
+- sse:  Server-Sent Events (one long-lived stream per client plus POSTs),
+        endpoint /sse
+- http: Streamable HTTP (plain request/response over reusable keep-alive
+        connections), endpoint /mcp
+
+Responses are compressed with zstd or gzip when the client accepts it.
+
+On SIGTERM/SIGINT the server stops accepting new executions and waits up to
+--drain-timeout seconds for running ones before it exits. SIGHUP reloads
+the configuration (with --workers > 1, uvicorn replaces the workers one by
+one instead, and each new worker reads the current configuration).
+
+Settings can be given on the command line or through the MCP_TRANSPORT,
+MCP_HOST, MCP_PORT, MCP_WORKERS, MCP_KEEP_ALIVE, MCP_COMPRESSION,
+MCP_COMPRESSION_MIN_SIZE and MCP_DRAIN_TIMEOUT environment variables.
 """
 
 import os
 import sys
+import argparse
+import threading
 from pathlib import Path
 
-# Set default environment variable if not set (cross-platform)
-if "PYTHON_PROJECTS_DIR" not in os.environ:
-    # Use project root / python_projects
-    project_root = Path(__file__).parent.parent.resolve()
-    default_dir = project_root / "python_projects"
-    os.environ["PYTHON_PROJECTS_DIR"] = str(default_dir)
+from config import load_server_config
+
+
+TRANSPORT_PATHS = {
+    "sse": "/sse",
+    "http": "/mcp",
+}
+
+# Seconds left for idle connections (e.g. SSE streams) to close after draining
+CONNECTION_CLOSE_TIMEOUT = 5
+
+# The MCP server, FastMCP and the HTTP stack are imported on first use so
+# argument parsing and the banner do not pay for them.
+
+
+async def metrics_endpoint(request):
+    """Expose server metrics in the Prometheus text format."""
+    from metrics import REGISTRY, render_prometheus
+    from starlette.responses import PlainTextResponse
+    
+    return PlainTextResponse(
+        render_prometheus(REGISTRY),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+async def ready_endpoint(request):
+    """Report whether this server should receive new traffic (for load balancers)."""
+    from mcp_server import readiness
+    from starlette.responses import JSONResponse
+    
+    ready, reason = readiness()
+    if ready:
+        return JSONResponse({"status": "ready"})
+    return JSONResponse({"status": "unavailable", "reason": reason}, status_code=503)
+
+
+_routes_registered = False
+
+
+def get_server():
+    """
+    Import the MCP server and register the HTTP-only routes on it.
+
+    Returns:
+        The FastMCP server instance
+    """
+    global _routes_registered
+    from mcp_server import mcp
+    
+    if not _routes_registered:
+        mcp.custom_route("/metrics", methods=["GET"])(metrics_endpoint)
+        mcp.custom_route("/ready", methods=["GET"])(ready_endpoint)
+        _routes_registered = True
+    return mcp
+
+
+def create_app():
+    """
+    Build the ASGI application for the configured transport.
+
+    Settings are read from the environment so that every uvicorn worker
+    process builds the same app.
+
+    Returns:
+        Starlette application serving the MCP server
+    """
+    from compression import CompressionMiddleware
+    from starlette.middleware import Middleware
+    
+    mcp = get_server()
+    
+    middleware = []
+    if os.getenv("MCP_COMPRESSION", "1") != "0":
+        middleware.append(Middleware(
+            CompressionMiddleware,
+            minimum_size=int(os.getenv("MCP_COMPRESSION_MIN_SIZE", "1024"))
+        ))
+    
+    transport = os.getenv("MCP_TRANSPORT", "sse")
+    if transport == "sse":
+        return mcp.http_app(transport="sse", middleware=middleware)
+
+    # Sessions live in process memory, so with several workers each request
+    # must be self-contained
+    stateless = int(os.getenv("MCP_WORKERS", "1")) > 1
+    return mcp.http_app(transport="http", stateless_http=stateless, middleware=middleware)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments, falling back to environment variables.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run RmiAgentMcpServer over HTTP",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # SSE transport on port 8000 (default)
+  python run_http_server.py
 
-# Import the server
-from mcp_server import mcp, ALLOWED_DIRECTORY
+  # Streamable HTTP transport with 4 worker processes
+  python run_http_server.py --transport http --workers 4
+        """
+    )
 
-def main():
+    parser.add_argument(
+        "--transport",
+        choices=sorted(TRANSPORT_PATHS),
+        default=os.getenv("MCP_TRANSPORT", "sse"),
+        help="HTTP transport: sse or streamable http (default: sse)"
+    )
+
+    parser.add_argument(
+        "--host",
+        default=os.getenv("MCP_HOST", "0.0.0.0"),
+        help="Interface to bind (default: 0.0.0.0)"
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("MCP_PORT", "8000")),
+        help="Port to listen on (default: 8000)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("MCP_WORKERS", "1")),
+        help="Number of worker processes (http transport only, default: 1)"
+    )
+
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=int(os.getenv("MCP_KEEP_ALIVE", "75")),
+        help="Seconds to keep idle connections open for reuse (default: 75)"
+    )
+
+    parser.add_argument(
+        "--no-compression",
+        dest="compression",
+        action="store_false",
+        default=os.getenv("MCP_COMPRESSION", "1") != "0",
+        help="Disable zstd/gzip response compression"
+    )
+
+    parser.add_argument(
+        "--compression-min-size",
+        type=int,
+        default=int(os.getenv("MCP_COMPRESSION_MIN_SIZE", "1024")),
+        help="Only compress complete responses of at least this many bytes (default: 1024)"
+    )
+
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=float(os.getenv("MCP_DRAIN_TIMEOUT", "60")),
+        help="Seconds to let running executions finish on shutdown (default: 60)"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.workers > 1 and args.transport == "sse":
+        parser.error(
+            "--workers > 1 requires --transport http "
+            "(SSE sessions are bound to a single process)"
+        )
+
+    return args
+
+
+def run_draining_server(app, drain_timeout: float, **uvicorn_kwargs):
+    """
+    Serve a single-process app, draining executions before shutting down.
+
+    The first SIGTERM/SIGINT makes run_python reject new calls, then waits
+    up to drain_timeout seconds for running executions before uvicorn stops.
+    A second signal skips the wait.
+
+    Args:
+        app: ASGI application
+        drain_timeout: Seconds to wait for running executions
+        **uvicorn_kwargs: Passed to uvicorn.Config
+    """
+    import uvicorn
+    import mcp_server
+
+    class DrainingServer(uvicorn.Server):
+        drain_started = False
+
+        def handle_exit(self, sig, frame):
+            if self.drain_started:
+                super().handle_exit(sig, frame)
+                return
+
+            self.drain_started = True
+            mcp_server.begin_drain()
+            print("Draining running executions...", file=sys.stderr)
+
+            def drain_then_exit():
+                if not mcp_server.wait_for_drain(drain_timeout):
+                    print(f"Drain timed out after {drain_timeout}s", file=sys.stderr)
+                super(DrainingServer, self).handle_exit(sig, frame)
+
+            threading.Thread(target=drain_then_exit, daemon=True).start()
+
+    config = uvicorn.Config(
+        app,
+        timeout_graceful_shutdown=CONNECTION_CLOSE_TIMEOUT,
+        **uvicorn_kwargs
+    )
+    DrainingServer(config).run()
+
+
+def main(argv=None):
     """Run the server with HTTP transport."""
+    import uvicorn
+
+    args = parse_args(argv)
+
+    # Worker processes rebuild the app from these
+    os.environ["MCP_TRANSPORT"] = args.transport
+    os.environ["MCP_WORKERS"] = str(args.workers)
+    os.environ["MCP_COMPRESSION"] = "1" if args.compression else "0"
+    os.environ["MCP_COMPRESSION_MIN_SIZE"] = str(args.compression_min_size)
+
+    endpoint = f"http://{args.host}:{args.port}{TRANSPORT_PATHS[args.transport]}"
+
     print("=" * 60)
-    print("RmiAgentMcpServer - HTTP/SSE Mode")
+    print(f"RmiAgentMcpServer - HTTP Mode ({args.transport})")
     print("=" * 60)
     print(f"Platform: {sys.platform}")
-    print(f"Allowed directory: {ALLOWED_DIRECTORY}")
-    print(f"Server will listen on: http://0.0.0.0:8000")
-    print(f"SSE endpoint: http://0.0.0.0:8000/sse")
+    print(f"Allowed directory: {load_server_config().allowed_directory}")
+    print(f"Server will listen on: http://{args.host}:{args.port}")
+    print(f"MCP endpoint: {endpoint}")
+    print(f"Metrics endpoint: http://{args.host}:{args.port}/metrics")
+    print(f"Readiness endpoint: http://{args.host}:{args.port}/ready")
+    print(f"Workers: {args.workers}")
+    print(f"Keep-alive: {args.keep_alive}s")
+    print(f"Drain timeout: {args.drain_timeout}s")
+    if args.compression:
+        from compression import supported_encodings
+        print(f"Compression: {', '.join(supported_encodings())} (>= {args.compression_min_size} bytes)")
+    else:
+        print("Compression: disabled")
     print()
     print("To create ngrok tunnel, run in another terminal:")
     if sys.platform == "win32":
         print("  # PowerShell:")
-        print("  ngrok http --region=eu 8000")
+        print(f"  ngrok http --region=eu {args.port}")
     else:
         print("  # Bash:")
-        print("  ngrok http --region=eu 8000")
+        print(f"  ngrok http --region=eu {args.port}")
     print()
     print("=" * 60)
     print()
-    
-    # Run with HTTP transport
-    mcp.run(transport="sse")
+
+    uvicorn_kwargs = {
+        "host": args.host,
+        "port": args.port,
+        "timeout_keep_alive": args.keep_alive,
+    }
+
+    if args.workers > 1:
+        # Multiple workers need an import string so each process builds its own app.
+        # Requests are stateless here, so uvicorn's graceful shutdown already
+        # waits for the executions running inside them.
+        uvicorn.run(
+            "run_http_server:create_app",
+            factory=True,
+            workers=args.workers,
+            app_dir=str(Path(__file__).parent),
+            timeout_graceful_shutdown=args.drain_timeout,
+            **uvicorn_kwargs
+        )
+    else:
+        app = create_app()
+        import mcp_server
+        mcp_server.install_reload_handler()
+        run_draining_server(app, args.drain_timeout, **uvicorn_kwargs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Execution time history for adaptive run_python timeouts.
+
+The duration of recent runs is kept per file. Once a file has run a few
+times, its deadline is derived from the observed runtimes (a high
+percentile times a safety factor) instead of the global timeout, so a hung
+run of a script that normally takes a second is killed after a few seconds
+and its execution slot returns to the pool.
+
+History is reset when the file changes (new mtime or size), since its
+runtime may change with it, and when a run is killed by an adaptive
+deadline, so a script that legitimately got slower gets the full timeout
+on its next run and its deadline is learned again.
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Optional
+
+
+# Runs needed before a file gets an adaptive deadline
+MIN_SAMPLES = 5
+# Deadline = percentile * FACTOR + HEADROOM seconds, at least MIN_TIMEOUT
+PERCENTILE = 0.99
+FACTOR = 3.0
+HEADROOM = 1.0
+MIN_TIMEOUT = 1.0
+
+
+def percentile(samples, q: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        samples: Observed values (not empty)
+        q: Percentile between 0 and 1
+
+    Returns:
+        Smallest sample with at least q of the samples at or below it
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _FileHistory:
+    def __init__(self, signature: tuple, max_samples: int):
+        self.signature = signature
+        self.durations: deque = deque(maxlen=max_samples)
+
+
+class RuntimeHistory:
+    """Recent execution times per file."""
+
+    def __init__(self, max_samples: int = 50, max_files: int = 1000):
+        """
+        Initialize the history.
+
+        Args:
+            max_samples: Most recent runs kept per file
+            max_files: Files tracked; the least recently run is dropped first
+        """
+        self.max_samples = max_samples
+        self.max_files = max_files
+        self._files: "OrderedDict[str, _FileHistory]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: Path) -> tuple:
+        try:
+            stat = path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return ()
+
+    def _current(self, path: Path) -> Optional[_FileHistory]:
+        history = self._files.get(str(path))
+        if history is not None and history.signature != self._signature(path):
+            del self._files[str(path)]
+            return None
+        return history
+
+    def record(self, path: Path, duration: float):
+        """
+        Record the duration of a completed run.
+
+        Args:
+            path: Executed file
+            duration: Seconds from process start to exit
+        """
+        with self._lock:
+            history = self._current(path)
+            if history is None:
+                history = _FileHistory(self._signature(path), self.max_samples)
+                self._files[str(path)] = history
+                if len(self._files) > self.max_files:
+                    self._files.popitem(last=False)
+            else:
+                self._files.move_to_end(str(path))
+            history.durations.append(duration)
+
+    def reset(self, path: Path):
+        """Forget the history of a file."""
+        with self._lock:
+            self._files.pop(str(path), None)
+
+    def deadline(self, path: Path, ceiling: float) -> Optional[float]:
+        """
+        Derive a deadline from the file's previous runs.
+
+        Args:
+            path: File about to run
+            ceiling: Upper bound (the configured timeout)
+
+        Returns:
+            Seconds, or None if there are fewer than MIN_SAMPLES runs
+        """
+        with self._lock:
+            history = self._current(path)
+            if history is None or len(history.durations) < MIN_SAMPLES:
+                return None
+            observed = percentile(history.durations, PERCENTILE)
+        return min(ceiling, max(MIN_TIMEOUT, observed * FACTOR + HEADROOM))
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Trigram index for fast code search over the projects directory.
+
+Every text file under the root is broken into lowercase trigrams and the
+resulting postings are persisted to a JSON file on disk. Each search first
+refreshes the index incrementally (only files whose mtime or size changed
+are re-read), then narrows the candidate files with the trigrams of the
+query and finally verifies matches line by line. Text files too short to
+have a trigram are always candidates, since nothing can rule them out.
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_parse
+
+
+INDEX_VERSION = 2
+
+# Files larger than this are not indexed (generated data, logs, etc.)
+MAX_FILE_SIZE = 1024 * 1024
+
+# Directories that are never indexed
+SKIPPED_DIRS = {"__pycache__", "node_modules"}
+
+
+class SearchMatch(NamedTuple):
+    """A single matching line."""
+    path: str
+    line_number: int
+    line: str
+
+
+def extract_trigrams(text: str) -> Set[str]:
+    """
+    Extract the set of lowercase trigrams from a piece of text.
+
+    Args:
+        text: Text to split into trigrams
+
+    Returns:
+        Set of 3-character strings
+    """
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Extract literal substrings that every match of a regex must contain.
+
+    Only the top-level sequence of the pattern is inspected, which is
+    conservative: alternations, groups and repeats end a literal run.
+
+    Args:
+        pattern: Regular expression pattern
+        flags: Regular expression flags
+
+    Returns:
+        List of literal strings (possibly empty if nothing is required)
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError):
+        return []
+
+    literals = []
+    current = []
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            literals.append("".join(current))
+            current = []
+    if current:
+        literals.append("".join(current))
+
+    return literals
+
+
+def _is_skipped_dir(name: str) -> bool:
+    return name.startswith(".") or name in SKIPPED_DIRS
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """Read a file as text, returning None for binary or unreadable files."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:8192]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+class TrigramIndex:
+    """
+    On-disk trigram index over all text files below a root directory.
+    """
+
+    def __init__(self, root: str, index_path: str):
+        """
+        Initialize the index.
+
+        Args:
+            root: Directory whose files are indexed
+            index_path: JSON file where the index is persisted
+        """
+        self.root = Path(root).resolve()
+        self.index_path = Path(index_path)
+
+        # rel_path -> (mtime_ns, size)
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        # rel_path -> trigrams of the file (None for binary files)
+        self._trigrams: Dict[str, Optional[Set[str]]] = {}
+        # trigram -> rel_paths containing it
+        self._postings: Dict[str, Set[str]] = {}
+
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the persisted index, ignoring stale or corrupt files."""
+        self._loaded = True
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+            return
+
+        for rel_path, entry in data.get("files", {}).items():
+            trigrams = entry["trigrams"]
+            self._add(
+                rel_path, (entry["mtime_ns"], entry["size"]),
+                set(trigrams) if trigrams is not None else None
+            )
+
+    def _save(self):
+        """Persist the index atomically."""
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "files": {
+                rel_path: {
+                    "mtime_ns": stat[0],
+                    "size": stat[1],
+                    "trigrams": (
+                        sorted(self._trigrams[rel_path])
+                        if self._trigrams[rel_path] is not None else None
+                    ),
+                }
+                for rel_path, stat in self._stats.items()
+            },
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _add(self, rel_path: str, stat: Tuple[int, int], trigrams: Optional[Set[str]]):
+        self._stats[rel_path] = stat
+        self._trigrams[rel_path] = trigrams
+        for trigram in trigrams or ():
+            self._postings.setdefault(trigram, set()).add(rel_path)
+
+    def _remove(self, rel_path: str):
+        self._stats.pop(rel_path, None)
+        for trigram in self._trigrams.pop(rel_path, None) or ():
+            paths = self._postings.get(trigram)
+            if paths is not None:
+                paths.discard(rel_path)
+                if not paths:
+                    del self._postings[trigram]
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every indexable file below the root."""
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not _is_skipped_dir(d)]
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+                if st.st_size > MAX_FILE_SIZE:
+                    continue
+                rel_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                found[rel_path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            Tuple of (files re-indexed, files removed)
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            current = self._scan()
+
+            removed = [p for p in self._stats if p not in current]
+            for rel_path in removed:
+                self._remove(rel_path)
+
+            updated = 0
+            for rel_path, stat in current.items():
+                if self._stats.get(rel_path) == stat:
+                    continue
+                self._remove(rel_path)
+                text = _read_text(self.root / rel_path)
+                self._add(rel_path, stat, extract_trigrams(text) if text is not None else None)
+                updated += 1
+
+            if updated or removed:
+                self._save()
+
+            return updated, len(removed)
+
+    def candidates(self, literals: List[str]) -> List[str]:
+        """
+        Return the files that may contain all of the given literals.
+
+        Args:
+            literals: Strings that a matching file must contain
+
+        Returns:
+            Sorted list of relative paths
+        """
+        # Text files without trigrams are too short for the postings to say
+        # anything about them, so they are always checked
+        short = {p for p, trigrams in self._trigrams.items() if trigrams == set()}
+
+        result: Optional[Set[str]] = None
+        for literal in literals:
+            for trigram in extract_trigrams(literal):
+                paths = self._postings.get(trigram, set())
+                result = set(paths) if result is None else result & paths
+                if not result:
+                    return sorted(short)
+
+        if result is None:
+            # Nothing to filter on: every text file is a candidate
+            result = {p for p, trigrams in self._trigrams.items() if trigrams is not None}
+
+        return sorted(result | short)
+
+    def search(
+        self,
+        query: str,
+        regex: bool = False,
+        case_sensitive: bool = True,
+        max_results: int = 100,
+    ) -> List[SearchMatch]:
+        """
+        Search indexed files for a substring or regular expression.
+
+        Args:
+            query: Substring or regex to search for
+            regex: Treat query as a regular expression
+            case_sensitive: Match case exactly
+            max_results: Maximum number of matching lines to return
+
+        Returns:
+            List of matching lines
+
+        Raises:
+            re.error: If regex is True and the pattern is invalid
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        if regex:
+            pattern = re.compile(query, flags)
+            literals = required_literals(query, flags)
+        else:
+            pattern = re.compile(re.escape(query), flags)
+            literals = [query]
+
+        self.refresh()
+        with self._lock:
+            paths = self.candidates(literals)
+
+        matches = []
+        for rel_path in paths:
+            text = _read_text(self.root / rel_path)
+            # A whole-file check is exact only for plain substrings; anchors
+            # such as ^ and \A in a regex refer to single lines here
+            if text is None or (not regex and not pattern.search(text)):
+                continue
+            for line_number, line in enumerate(text.splitlines(), start=1):
+                if pattern.search(line):
+                    matches.append(SearchMatch(rel_path, line_number, line))
+                    if len(matches) >= max_results:
+                        return matches
+
+        return matches
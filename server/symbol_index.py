@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cached AST symbol index for Python files.
+
+For every file the index records its module docstring, top-level functions
+and classes (with their signatures and docstrings) and whether it has an
+``if __name__ == "__main__"`` entry point. Entries are cached per file by
+mtime and size, with a content hash as a second check, and are refreshed
+lazily when a file is looked up again.
+"""
+
+import ast
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class Symbol:
+    """A top-level function or class."""
+    kind: str
+    name: str
+    line: int
+    signature: str = ""
+    docstring: Optional[str] = None
+
+
+@dataclass
+class FileSymbols:
+    """Symbols extracted from one Python file."""
+    docstring: Optional[str] = None
+    functions: List[Symbol] = field(default_factory=list)
+    classes: List[Symbol] = field(default_factory=list)
+    entry_point_line: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _first_line(docstring: Optional[str]) -> Optional[str]:
+    if not docstring:
+        return None
+    return docstring.strip().splitlines()[0]
+
+
+def _is_main_guard(node: ast.AST) -> bool:
+    """Check for ``if __name__ == "__main__":`` (in either operand order)."""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    test = node.test
+    if len(test.ops) != 1 or not isinstance(test.ops[0], ast.Eq):
+        return False
+    operands = [test.left, test.comparators[0]]
+    has_name = any(isinstance(o, ast.Name) and o.id == "__name__" for o in operands)
+    has_main = any(isinstance(o, ast.Constant) and o.value == "__main__" for o in operands)
+    return has_name and has_main
+
+
+def extract_symbols(source: bytes) -> FileSymbols:
+    """
+    Extract top-level symbols from Python source.
+
+    Args:
+        source: Raw file contents
+
+    Returns:
+        FileSymbols (with error set if the source does not parse)
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return FileSymbols(error=f"{type(e).__name__}: {e}")
+
+    symbols = FileSymbols(docstring=_first_line(ast.get_docstring(tree)))
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            prefix = "async " if isinstance(node, ast.AsyncFunctionDef) else ""
+            symbols.functions.append(Symbol(
+                kind="function",
+                name=node.name,
+                line=node.lineno,
+                signature=f"{prefix}{node.name}({ast.unparse(node.args)})",
+                docstring=_first_line(ast.get_docstring(node)),
+            ))
+        elif isinstance(node, ast.ClassDef):
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            symbols.classes.append(Symbol(
+                kind="class",
+                name=node.name,
+                line=node.lineno,
+                signature=f"{node.name}({bases})" if bases else node.name,
+                docstring=_first_line(ast.get_docstring(node)),
+            ))
+        elif _is_main_guard(node) and symbols.entry_point_line is None:
+            symbols.entry_point_line = node.lineno
+
+    return symbols
+
+
+class SymbolIndex:
+    """
+    Lazily refreshed, in-memory cache of FileSymbols keyed by file path.
+    """
+
+    def __init__(self):
+        # path -> (mtime_ns, size, sha256, symbols)
+        self._entries: Dict[str, Tuple[int, int, str, FileSymbols]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> FileSymbols:
+        """
+        Get the symbols of a file, re-parsing only if its content changed.
+
+        Args:
+            path: Path to the Python file
+
+        Returns:
+            FileSymbols for the file
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = str(path)
+        st = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[:2] == (st.st_mtime_ns, st.st_size):
+            return entry[3]
+
+        source = path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+
+        if entry and entry[2] == digest:
+            symbols = entry[3]
+        else:
+            symbols = extract_symbols(source)
+
+        with self._lock:
+            self._entries[key] = (st.st_mtime_ns, st.st_size, digest, symbols)
+
+        return symbols
+
+    def prune(self, keep: List[Path]):
+        """
+        Drop cached entries for files that are not in keep.
+
+        Args:
+            keep: Paths that are still present
+        """
+        keep_keys = {str(p) for p in keep}
+        with self._lock:
+            for key in [k for k in self._entries if k not in keep_keys]:
+                del self._entries[key]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+In-process syntax pre-flight for Python files.
+
+Compiling a file in the server process is much cheaper than spawning an
+interpreter just to have it print a SyntaxError. Results are cached by
+content hash, so each version of a file is compiled at most once.
+"""
+
+import hashlib
+import subprocess
+import sys
+import threading
+import traceback
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+# Number of compile results kept in memory
+DEFAULT_CACHE_SIZE = 1024
+
+
+def interpreter_matches(python_cmd: str) -> bool:
+    """
+    Check whether python_cmd runs the same Python version as this process.
+
+    Syntax is only pre-checked when it is, so files using newer syntax are
+    never rejected on behalf of a newer child interpreter.
+
+    Args:
+        python_cmd: Command used to execute Python files
+
+    Returns:
+        True if implementation and major/minor version match
+    """
+    probe = "import sys; print(sys.implementation.name, *sys.version_info[:2])"
+    try:
+        proc = subprocess.run(
+            [python_cmd, "-c", probe],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+    expected = f"{sys.implementation.name} {sys.version_info[0]} {sys.version_info[1]}"
+    return proc.returncode == 0 and proc.stdout.strip() == expected
+
+
+def format_syntax_error(exc: SyntaxError) -> str:
+    """
+    Format a SyntaxError the way the interpreter prints it for a script.
+
+    Args:
+        exc: The exception raised by compile()
+
+    Returns:
+        Text the child process would have written to stderr
+    """
+    return "".join(traceback.format_exception_only(type(exc), exc))
+
+
+class SyntaxChecker:
+    """
+    Compiles Python files in-process and caches the outcome by content hash.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the checker.
+
+        Args:
+            cache_size: Maximum number of cached compile results
+        """
+        self.cache_size = cache_size
+        # (path, sha256) -> formatted error, or None if the file compiles
+        self._cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, path: Path) -> Optional[str]:
+        """
+        Compile a file and report its syntax error, if any.
+
+        Args:
+            path: Absolute path to the Python file
+
+        Returns:
+            The error text the interpreter would print, or None if the file
+            compiles (or could not be checked and should just be run)
+        """
+        try:
+            source = path.read_bytes()
+        except OSError:
+            return None
+
+        key = (str(path), hashlib.sha256(source).hexdigest())
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                compile(source, str(path), "exec", dont_inherit=True)
+            error = None
+        except SyntaxError as e:
+            error = format_syntax_error(e)
+        except (ValueError, MemoryError, RecursionError):
+            # Let the interpreter report these itself
+            error = None
+
+        with self._lock:
+            self._cache[key] = error
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return error
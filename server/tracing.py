@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Lightweight request tracing with OTLP-compatible JSON export.
+
+Each tool call becomes a trace made of spans (validation, queue wait,
+spawn, execution, output assembly, serialization). When the root span of a
+trace ends, the whole trace is exported as one OTLP/JSON ``resourceSpans``
+document to the configured exporters:
+
+- RingBufferExporter keeps the most recent traces in memory, where the
+  get_recent_traces debug tool can read them
+- RotatingFileExporter appends one JSON document per line to a local file
+  and rotates it when it grows too large
+
+The current span is tracked with contextvars, so spans opened in worker
+threads (where sync tools run) are attached to the right trace.
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastmcp.server.middleware import Middleware
+
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None,
+    ):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.root: "Span" = parent.root if parent else self
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = STATUS_OK
+        self.status_message = ""
+        # Finished spans of the trace, collected on the root span
+        self.finished: List["Span"] = []
+
+    def set_attribute(self, key: str, value: Any):
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        """Mark the span as failed."""
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent.span_id if self.parent else "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def to_otlp_document(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """
+    Wrap spans in an OTLP/JSON ExportTraceServiceRequest document.
+
+    Args:
+        spans: Spans to export
+        service_name: Value of the service.name resource attribute
+
+    Returns:
+        Dict ready to be serialized as JSON
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "rmi-agent-mcp-server"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class RingBufferExporter:
+    """Keeps the most recent traces in memory."""
+
+    def __init__(self, max_traces: int = 200):
+        self._traces: deque = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def export(self, document: Dict[str, Any]):
+        with self._lock:
+            self._traces.append(document)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get up to limit traces (all if None), most recent last."""
+        with self._lock:
+            traces = list(self._traces)
+        if limit is None:
+            return traces
+        return traces[-limit:] if limit > 0 else []
+
+
+class RotatingFileExporter:
+    """Appends traces as JSON lines to a file, rotating it by size."""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def export(self, document: Dict[str, Any]):
+        line = json.dumps(document, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                size = self.path.stat().st_size
+            except OSError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "rmi_current_span", default=None
+)
+
+
+class Tracer:
+    """Creates spans and exports finished traces."""
+
+    def __init__(self, service_name: str, exporters: Optional[list] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            service_name: Reported as the service.name resource attribute
+            exporters: Objects with an export(document) method. With no
+                       exporters, spans are not recorded at all.
+        """
+        self.service_name = service_name
+        self.exporters = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def ring_buffer(self) -> Optional[RingBufferExporter]:
+        """Get the in-memory exporter, if configured."""
+        for exporter in self.exporters:
+            if isinstance(exporter, RingBufferExporter):
+                return exporter
+        return None
+
+    def current_span(self) -> Optional[Span]:
+        """Get the active span in this context."""
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+        """
+        Open a span as a child of the current span (or as a new trace).
+
+        Args:
+            name: Span name
+            kind: OTLP span kind
+            **attributes: Initial span attributes
+
+        Yields:
+            The Span, or None if tracing is disabled
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = Span(name, parent=_current_span.get(), kind=kind, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes):
+        """
+        Record an already completed child span of the current span.
+
+        Args:
+            name: Span name
+            start_ns: Start time (ns since epoch)
+            end_ns: End time (ns since epoch)
+            **attributes: Span attributes
+        """
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            return
+        span = Span(name, parent=parent, attributes=attributes, start_ns=start_ns)
+        self._finish(span, end_ns)
+
+    def _finish(self, span: Span, end_ns: Optional[int] = None):
+        span.end_ns = end_ns if end_ns is not None else time.time_ns()
+        span.root.finished.append(span)
+        if span is span.root:
+            document = to_otlp_document(span.finished, self.service_name)
+            for exporter in self.exporters:
+                exporter.export(document)
+
+
+def create_tracer(
+    service_name: str,
+    export: str,
+    trace_file: str,
+    buffer_size: int = 200,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 3,
+) -> Tracer:
+    """
+    Create a tracer from configuration values.
+
+    Args:
+        service_name: Reported as the service.name resource attribute
+        export: Comma-separated exporters: "memory", "file" or "none"
+        trace_file: Path of the JSON lines file for the file exporter
+        buffer_size: Number of traces kept by the memory exporter
+        max_bytes: Size at which the trace file is rotated
+        backup_count: Number of rotated files kept
+
+    Returns:
+        Configured Tracer
+    """
+    exporters = []
+    for name in (part.strip().lower() for part in export.split(",")):
+        if name == "memory":
+            exporters.append(RingBufferExporter(buffer_size))
+        elif name == "file":
+            exporters.append(RotatingFileExporter(trace_file, max_bytes, backup_count))
+    return Tracer(service_name, exporters)
+
+
+class TracingMiddleware(Middleware):
+    """
+    Open a root span for every tool call.
+
+    The time between the tool body finishing and the middleware regaining
+    control (FastMCP converting the return value into MCP content) is
+    recorded as a "serialization" span.
+    """
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    async def on_call_tool(self, context, call_next):
+        if not self.tracer.enabled:
+            return await call_next(context)
+
+        tool = context.message.name
+        with self.tracer.span(f"tools/call {tool}", kind=SPAN_KIND_SERVER, tool=tool) as root:
+            result = await call_next(context)
+            if root.finished:
+                body_end = max(span.end_ns for span in root.finished)
+                self.tracer.record_span("serialization", body_end, time.time_ns())
+            return result
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible chat completions server for tests.
+
+Replays scripted responses in order, streamed as server-sent events the way
+the OpenAI API streams them (text split into small deltas, tool call
+arguments split across chunks), with optional pauses to make timing
+observable. Every request body is recorded.
+
+Example:
+    with FakeOpenAIServer() as fake:
+        fake.add_response(tool_calls=[{"name": "run_python", "arguments": {"file_name": "a.py"}}])
+        fake.add_response(content="It printed hello.")
+        llm = LLMClient(api_key="test", base_url=fake.base_url)
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+class FakeOpenAIServer:
+    """Serve scripted chat completions on a free localhost port."""
+
+    def __init__(self, chunk_size: int = 4, delay: float = 0.0):
+        """
+        Initialize the server.
+
+        Args:
+            chunk_size: Characters per streamed text or argument delta
+            delay: Seconds between chunks
+        """
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.responses = []
+        self.requests = []
+        self._server = None
+        self._thread = None
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def add_response(self, content: str = None, tool_calls: list = None):
+        """
+        Queue the next response.
+
+        Args:
+            content: Assistant text
+            tool_calls: Dicts with name, arguments (dict) and optionally
+                        pause (seconds to wait after the call's arguments)
+        """
+        self.responses.append({"content": content, "tool_calls": tool_calls or []})
+
+    def _chunk(self, delta: dict, finish_reason: str = None) -> str:
+        body = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "fake",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    def _pieces(self, text: str) -> list:
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+
+    async def _stream(self, response: dict):
+        yield self._chunk({"role": "assistant"})
+        for piece in self._pieces(response["content"]) if response["content"] else []:
+            await asyncio.sleep(self.delay)
+            yield self._chunk({"content": piece})
+
+        for index, call in enumerate(response["tool_calls"]):
+            yield self._chunk({"tool_calls": [{
+                "index": index, "id": f"call_{index}", "type": "function",
+                "function": {"name": call["name"], "arguments": ""},
+            }]})
+            for piece in self._pieces(json.dumps(call.get("arguments", {}))):
+                await asyncio.sleep(self.delay)
+                yield self._chunk({"tool_calls": [{"index": index, "function": {"arguments": piece}}]})
+            await asyncio.sleep(call.get("pause", 0))
+
+        finish_reason = "tool_calls" if response["tool_calls"] else "stop"
+        yield self._chunk({}, finish_reason)
+        yield "data: [DONE]\n\n"
+
+    def _message(self, response: dict) -> dict:
+        message = {"role": "assistant", "content": response["content"]}
+        if response["tool_calls"]:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{index}", "type": "function",
+                    "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+                }
+                for index, call in enumerate(response["tool_calls"])
+            ]
+        return message
+
+    async def _completions(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        if not self.responses:
+            return JSONResponse({"error": {"message": "No scripted response left"}}, status_code=500)
+        response = self.responses.pop(0)
+
+        if body.get("stream"):
+            return StreamingResponse(self._stream(response), media_type="text/event-stream")
+        return JSONResponse({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "fake",
+            "choices": [{
+                "index": 0,
+                "message": self._message(response),
+                "finish_reason": "tool_calls" if response["tool_calls"] else "stop",
+            }],
+        })
+
+    def start(self):
+        """Start serving in a background thread."""
+        app = Starlette(routes=[Route("/v1/chat/completions", self._completions, methods=["POST"])])
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake OpenAI server did not start")
+            time.sleep(0.01)
+
+    def stop(self):
+        """Stop the server."""
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Unit tests for rate limiting, execution quotas and load shedding.
+"""
+
+import sys
+import asyncio
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from fastmcp import FastMCP, Client
+
+import admission
+from admission import (
+    AdmissionMiddleware, RateLimiter, TokenBucket, client_key,
+    RATE_LIMITED_PREFIX, OVERLOADED_PREFIX, DRAINING_PREFIX, REJECTION_META, REJECTIONS
+)
+
+
+def make_server(middleware):
+    """Create a server with a slow run_python and a cheap ping tool."""
+    server = FastMCP("AdmissionTest")
+    server.add_middleware(middleware)
+
+    @server.tool
+    async def run_python(file_name: str) -> str:
+        await asyncio.sleep(0.2)
+        return f"ran {file_name}"
+
+    @server.tool
+    def ping() -> str:
+        return "pong"
+
+    return server
+
+
+async def call(client, tool, **args):
+    """Call a tool and return its text."""
+    result = await client.call_tool(tool, args, raise_on_error=False)
+    return result.content[0].text
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows a burst, then refills at the rate."""
+        bucket = TokenBucket(rate=2, burst=3, now=0)
+
+        assert [bucket.take(now=0) for _ in range(3)] == [0, 0, 0]
+        assert bucket.take(now=0) == pytest.approx(0.5)
+        assert bucket.take(now=0.5) == 0
+
+    def test_rate_limiter_per_client(self):
+        """Test that clients have independent buckets."""
+        limiter = RateLimiter(rate=1, burst=1)
+
+        assert limiter.check("a", now=0) == 0
+        assert limiter.check("a", now=0) > 0
+        assert limiter.check("b", now=0) == 0
+
+    def test_rate_limiter_forgets_oldest(self):
+        """Test that the number of tracked clients is bounded."""
+        limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+        for client in ("a", "b", "c"):
+            limiter.check(client, now=0)
+
+        assert list(limiter._buckets) == ["b", "c"]
+
+
+class TestClientKey:
+    """Tests for identifying the client of a request."""
+
+    def use_request(self, monkeypatch, headers=None, query=None, host="10.0.0.1"):
+        """Make client_key see an HTTP request from host."""
+        request = SimpleNamespace(query_params=query or {}, client=SimpleNamespace(host=host))
+        monkeypatch.setattr(admission, "get_http_headers", lambda include=None: headers or {})
+        monkeypatch.setattr(admission, "get_http_request", lambda: request)
+
+    def test_api_key_first(self, monkeypatch):
+        """Test that an API key wins over session and address."""
+        self.use_request(monkeypatch, {"authorization": "Bearer secret"}, {"session_id": "abc"})
+
+        assert client_key().startswith("key:")
+        assert "secret" not in client_key()
+
+    def test_streamable_http_session(self, monkeypatch):
+        """Test that the mcp-session-id header identifies streamable HTTP clients."""
+        self.use_request(monkeypatch, {"mcp-session-id": "abc"})
+
+        assert client_key() == "session:abc"
+
+    def test_sse_session(self, monkeypatch):
+        """Test that SSE clients behind one address are told apart by session_id."""
+        self.use_request(monkeypatch, query={"session_id": "one"})
+        first = client_key()
+        self.use_request(monkeypatch, query={"session_id": "two"})
+
+        assert first == "session:one"
+        assert client_key() == "session:two"
+
+    def test_address_fallback(self, monkeypatch):
+        """Test that the remote address is used without key or session."""
+        self.use_request(monkeypatch)
+
+        assert client_key() == "addr:10.0.0.1"
+
+    def test_local_without_http(self):
+        """Test that stdio and in-memory calls share one identity."""
+        assert client_key() == "local"
+
+
+@pytest.mark.asyncio
+class TestAdmissionMiddleware:
+    """Tests for AdmissionMiddleware on a live in-memory server."""
+
+    async def test_rate_limited(self):
+        """Test that calls beyond the burst are rejected with retry advice."""
+        server = make_server(AdmissionMiddleware(rate_limiter=RateLimiter(rate=0.1, burst=2)))
+
+        async with Client(server) as client:
+            results = [await call(client, "ping") for _ in range(2)]
+            rejected = await client.call_tool("ping", {}, raise_on_error=False)
+
+        assert results == ["pong", "pong"]
+        assert rejected.content[0].text.startswith(RATE_LIMITED_PREFIX)
+        assert "retry in" in rejected.content[0].text
+        # The rejection is flagged, so clients need not parse the text
+        assert rejected.is_error
+        assert rejected.meta[REJECTION_META]["reason"] == "rate_limited"
+        assert rejected.meta[REJECTION_META]["retry_after"] > 0
+
+    async def test_quota_per_client(self):
+        """Test that concurrent executions beyond the quota are rejected."""
+        server = make_server(AdmissionMiddleware(max_runs_per_client=1))
+        before = REJECTIONS.value(tool="run_python", reason="quota")
+
+        async with Client(server) as client:
+            results = await asyncio.gather(
+                call(client, "run_python", file_name="a.py"),
+                call(client, "run_python", file_name="b.py"),
+            )
+            # Other tools are not limited by the quota
+            assert await call(client, "ping") == "pong"
+
+        assert sorted(r.startswith("ran") for r in results) == [False, True]
+        assert REJECTIONS.value(tool="run_python", reason="quota") - before == 1
+
+    async def test_load_shedding(self):
+        """Test that run_python is shed while overloaded and accepted after."""
+        overloaded = ["5 executions queued"]
+        server = make_server(AdmissionMiddleware(
+            overload_reason=lambda: overloaded[0] if overloaded else None
+        ))
+
+        async with Client(server) as client:
+            shed = await call(client, "run_python", file_name="a.py")
+            assert await call(client, "ping") == "pong"
+            overloaded.clear()
+            accepted = await call(client, "run_python", file_name="a.py")
+
+        assert shed == f"{OVERLOADED_PREFIX} (5 executions queued); retry later"
+        assert accepted == "ran a.py"
+
+    async def test_draining(self):
+        """Test that run_python is refused, without retry advice, while draining."""
+        server = make_server(AdmissionMiddleware(draining=lambda: True))
+
+        async with Client(server) as client:
+            refused = await client.call_tool("run_python", {"file_name": "a.py"}, raise_on_error=False)
+            assert await call(client, "ping") == "pong"
+
+        assert refused.content[0].text.startswith(DRAINING_PREFIX)
+        assert refused.meta[REJECTION_META] == {"reason": "draining", "retry_after": None}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the agent-loop overhead benchmark.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from fastmcp import FastMCP
+
+from agent_loop_benchmark import run_agent_loop, workload_prompts
+
+
+def make_server(calls):
+    """Create a server that records the tools called."""
+    server = FastMCP("AgentLoop")
+
+    @server.tool
+    def run_python(file_name: str) -> str:
+        calls.append(file_name)
+        return f"ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        calls.append("list")
+        return "Python files in /srv:"
+
+    return server
+
+
+@pytest.mark.asyncio
+class TestAgentLoopBenchmark:
+    """Tests for the agent-loop benchmark."""
+
+    async def test_run_agent_loop(self):
+        """Test that turns are measured per stage after a warm-up cycle."""
+        calls = []
+        server = make_server(calls)
+        prompts = workload_prompts(["/srv/a.py", "/srv/b.py"])
+
+        result = await run_agent_loop(lambda: server, prompts, turns=8)
+
+        assert result["turns"] == 8
+        assert result["latency_ms"]["count"] == 8
+        # Per cycle: one file, two files, a listing and a plain answer
+        assert result["stages"]["tools"]["count"] == 8
+        assert result["stages"]["llm"]["count"] == 8 + 6
+        assert result["request_bytes"]["max"] > 0
+        assert len(calls) == 12
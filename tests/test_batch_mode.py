@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for batch prompt mode of the LLM client.
+"""
+
+import io
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+
+import mcp_client_llm
+from connection_pool import ConnectionPool
+from llm_backends import ScriptedBackend
+from mcp_client_llm import LLMClient, read_prompts, run_batch
+
+
+def make_server(running):
+    """Create a server whose run_python takes a while and tracks concurrent runs."""
+    server = FastMCP("BatchTest")
+
+    @server.tool
+    async def run_python(file_name: str) -> str:
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+        return f"ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        return "Python files in /srv:"
+
+    return server
+
+
+class TestReadPrompts:
+    """Tests for parsing batch input."""
+
+    def test_lines_and_json(self):
+        """Test plain prompts, JSON prompts with ids and blank lines."""
+        lines = ["run a.py\n", "\n", '{"id": "q2", "prompt": "list files", "extra": 1}\n', "  hello  \n"]
+
+        assert read_prompts(lines) == [
+            {"prompt": "run a.py"},
+            {"id": "q2", "prompt": "list files"},
+            {"prompt": "hello"},
+        ]
+
+    def test_json_without_prompt(self):
+        """Test that a JSON line without a prompt is rejected."""
+        with pytest.raises(ValueError, match="Line 1"):
+            read_prompts(['{"id": 1}'])
+
+
+@pytest.mark.asyncio
+class TestRunBatch:
+    """Tests for answering prompts concurrently."""
+
+    async def test_results(self, monkeypatch):
+        """Test one JSON line per prompt, separate conversations and one shared connection."""
+        pools = []
+
+        class RecordingPool(ConnectionPool):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        monkeypatch.setattr(mcp_client_llm, "ConnectionPool", RecordingPool)
+        running = {"now": 0, "peak": 0}
+        backend = ScriptedBackend()
+        prompts = [{"prompt": f"run /srv/{n}.py", "id": n} for n in range(6)] + [{"prompt": "hello"}]
+        output = io.StringIO()
+
+        failed = await run_batch(
+            make_server(running), prompts, output, concurrency=2,
+            llm=LLMClient(model="scripted", backend=backend)
+        )
+
+        records = sorted((json.loads(line) for line in output.getvalue().splitlines()), key=lambda r: r["index"])
+        assert failed == 0
+        assert [record["index"] for record in records] == list(range(7))
+        assert records[3]["id"] == 3
+        assert records[3]["answer"] == "Done. run_python: ran /srv/3.py"
+        assert records[3]["tool_calls"] == [{"name": "run_python", "arguments": {"file_name": "/srv/3.py"}}]
+        assert records[3]["seconds"] >= records[3]["stages"]["llm"]
+        assert records[6]["tool_calls"] == []
+        assert running["peak"] == 2
+        # Each prompt starts its own conversation
+        first_requests = [r["messages"] for r in backend.requests if r["messages"][-1]["role"] == "user"]
+        assert all(len(messages) == 2 for messages in first_requests)
+        assert pools[0].stats["connects"] == 1
+
+    async def test_error_recorded(self):
+        """Test that a failing prompt is reported without stopping the others."""
+        def fail(messages, tools):
+            raise RuntimeError("model unavailable")
+
+        output = io.StringIO()
+        llm = LLMClient(model="scripted", backend=ScriptedBackend([fail]))
+
+        failed = await run_batch(
+            make_server({"now": 0, "peak": 0}), [{"prompt": "hello"}, {"prompt": "hello"}],
+            output, concurrency=1, llm=llm
+        )
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert failed == 1
+        assert sorted(record["error"] is None for record in records) == [False, True]
+        assert "RuntimeError: model unavailable" in [record["error"] for record in records]
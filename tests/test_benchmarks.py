@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for server hot paths (pytest-benchmark).
+
+Covers path validation, list_python_files on synthetic trees, output
+assembly for large outputs and the cost of spawning PYTHON_CMD. In a normal
+test run every benchmark also runs as a correctness check and is compared
+against the committed baseline in benchmarks/baselines (see pytest.ini and
+the README, "Micro-Benchmarks").
+
+Trees of 1,000 files are always measured. Larger trees take a while to
+create and are opt-in:
+
+    RMI_BENCH_TREE_SIZES=1000,100000,1000000 pytest tests/test_benchmarks.py --benchmark-only
+"""
+
+import sys
+import os
+import subprocess
+import dataclasses
+import pytest
+from pathlib import Path
+
+pytest.importorskip("pytest_benchmark")
+
+# Set cross-platform default directory
+if "PYTHON_PROJECTS_DIR" not in os.environ:
+    project_root = Path(__file__).parent.parent.resolve()
+    os.environ["PYTHON_PROJECTS_DIR"] = str(project_root / "python_projects")
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+import mcp_server
+from mcp_server import (
+    validate_file_path, list_python_files, format_process_output, execute_python, ALLOWED_DIRECTORY
+)
+
+
+TREE_SIZES = [int(size) for size in os.environ.get("RMI_BENCH_TREE_SIZES", "1000").split(",")]
+
+# Files per directory in synthetic trees
+FILES_PER_DIR = 100
+
+
+def make_tree(root: Path, count: int):
+    """Create count empty .py files, FILES_PER_DIR per directory."""
+    for index in range(count):
+        directory = root / f"pkg_{index // FILES_PER_DIR:05d}"
+        if index % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True)
+        (directory / f"module_{index % FILES_PER_DIR:03d}.py").touch()
+
+
+@pytest.fixture(scope="module", params=TREE_SIZES, ids=lambda size: f"{size}_files")
+def python_tree(request, tmp_path_factory):
+    """Synthetic tree of Python files, made the allowed directory."""
+    root = tmp_path_factory.mktemp(f"tree_{request.param}")
+    make_tree(root, request.param)
+
+    original = mcp_server.get_config()
+    mcp_server.apply_config(dataclasses.replace(original, allowed_directory=str(root)))
+    yield root, request.param
+    mcp_server.apply_config(original)
+
+
+class TestValidateFilePathBenchmark:
+    """Benchmarks for validate_file_path."""
+
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        self.test_file = self.test_dir / "bench_validate.py"
+        self.test_file.write_text("print('test')")
+
+    @pytest.mark.benchmark(group="validate_file_path")
+    def test_valid_path(self, benchmark):
+        """Benchmark validating an allowed file."""
+        result = benchmark(validate_file_path, str(self.test_file))
+
+        assert result == self.test_file.resolve()
+
+    @pytest.mark.benchmark(group="validate_file_path")
+    def test_rejected_path(self, benchmark):
+        """Benchmark rejecting a path outside the allowed directory."""
+        def reject():
+            try:
+                validate_file_path(__file__)
+            except ValueError as e:
+                return str(e)
+
+        assert "Access denied" in benchmark(reject)
+
+
+class TestListPythonFilesBenchmark:
+    """Benchmarks for list_python_files on synthetic trees."""
+
+    @pytest.mark.benchmark(group="list_python_files")
+    def test_list_tree(self, benchmark, python_tree):
+        """Benchmark listing every file of a tree."""
+        root, count = python_tree
+        rounds = 10 if count <= 10000 else 2
+
+        output = benchmark.pedantic(list_python_files, rounds=rounds, iterations=1)
+
+        assert output.startswith(f"Python files in {root}")
+        assert output.count("\n  - ") == count
+
+
+class TestOutputAssemblyBenchmark:
+    """Benchmarks for combining process output."""
+
+    @pytest.mark.benchmark(group="output_assembly")
+    @pytest.mark.parametrize("megabytes", [1, 16], ids=lambda mb: f"{mb}MB")
+    def test_large_output(self, benchmark, megabytes):
+        """Benchmark assembling large stdout and stderr with an exit code."""
+        line = "x" * 79 + "\n"
+        stdout = line * (megabytes * 1024 * 1024 // len(line))
+        stderr = line * (megabytes * 1024 * 1024 // len(line) // 4)
+
+        output = benchmark(format_process_output, stdout, stderr, 1)
+
+        assert len(output) > len(stdout) + len(stderr)
+        assert output.endswith("[Process exited with code 1]")
+
+
+class TestSpawnBenchmark:
+    """Benchmarks for the cost of running PYTHON_CMD."""
+
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        self.empty_file = self.test_dir / "bench_empty.py"
+        self.empty_file.write_text("")
+
+    @pytest.mark.benchmark(group="spawn")
+    def test_raw_spawn(self, benchmark):
+        """Benchmark starting and waiting for the bare interpreter."""
+        cmd = [mcp_server.get_config().python_cmd, "-c", "pass"]
+
+        result = benchmark.pedantic(subprocess.run, args=(cmd,), rounds=10, iterations=1)
+
+        assert result.returncode == 0
+
+    @pytest.mark.benchmark(group="spawn")
+    def test_execute_empty_file(self, benchmark):
+        """Benchmark execute_python on an empty file (spawn plus bookkeeping)."""
+        stdout, stderr, returncode = benchmark.pedantic(
+            execute_python, args=(self.empty_file, 30), rounds=10, iterations=1
+        )
+
+        assert (stdout, stderr, returncode) == ("", "", 0)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent fan-out mode of the mcp_client CLI.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+
+from mcp_client import RmiMcpClient, parse_file_list, expand_file_patterns, run_files
+
+
+FILE_LIST = "Python files in /srv/projects:\n  - a.py\n  - b.py\n  - sub/c.py\n"
+
+
+def make_server(in_flight):
+    """Create a server that lists three files and records concurrency."""
+    server = FastMCP("CliTest")
+
+    @server.tool
+    def list_python_files() -> str:
+        return FILE_LIST
+
+    @server.tool
+    async def run_python(file_name: str) -> str:
+        in_flight.append(1)
+        in_flight[0] = max(in_flight[0], len(in_flight) - 1)
+        await asyncio.sleep(0.05)
+        in_flight.pop()
+        if file_name.endswith("b.py"):
+            return "Traceback...\n\n[Process exited with code 1]"
+        return f"ran {file_name}"
+
+    return server
+
+
+class TestFanOut:
+    """Tests for running many files from the CLI."""
+
+    def test_parse_file_list(self):
+        """Test parsing list_python_files output."""
+        assert parse_file_list(FILE_LIST) == ("/srv/projects", ["a.py", "b.py", "sub/c.py"])
+        assert parse_file_list("No Python files found in /srv") == ("", [])
+
+    @pytest.mark.asyncio
+    async def test_expand_patterns(self):
+        """Test that globs are matched on the server's relative and full paths."""
+        async with RmiMcpClient(make_server([0])) as client:
+            files = await expand_file_patterns(client, ["sub/*.py", "/srv/projects/a.py", "x.py", "*.py"])
+
+        assert files == [
+            "/srv/projects/sub/c.py",
+            "/srv/projects/a.py",
+            "x.py",
+            "/srv/projects/b.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_files(self, capsys):
+        """Test bounded concurrency, per-file results and the summary."""
+        in_flight = [0]
+
+        failed = await run_files(make_server(in_flight), ["*.py"], concurrency=2)
+
+        output = capsys.readouterr().out
+        assert failed == 1
+        assert in_flight[0] == 2
+        assert "[FAIL " in output and "/srv/projects/b.py" in output
+        assert output.count("[ok ") == 2
+        assert "Files: 3  Succeeded: 2  Failed: 1" in output
+        assert "FAILED: /srv/projects/b.py" in output
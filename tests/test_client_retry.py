@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for automatic reconnects and retries in the client.
+"""
+
+import sys
+from types import SimpleNamespace
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "server"))
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import MCPError
+from mcp.types import CONNECTION_CLOSED
+
+from connection_pool import ConnectionPool
+from mcp_client import RmiMcpClient
+from retry import RetryPolicy, admission_rejection, is_connection_error
+from admission import rejection_result
+
+
+def make_server(runs):
+    """Create a server that counts run_python calls."""
+    server = FastMCP("RetryTest")
+
+    @server.tool
+    def run_python(file_name: str) -> str:
+        runs.append(file_name)
+        return f"ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        return "Python files:"
+
+    return server
+
+
+def drop_next_call(client):
+    """Make the client's next call fail as if the stream was closed."""
+    session = client.client
+    call_tool = session.call_tool
+
+    async def dropped(*args, **kwargs):
+        session.call_tool = call_tool
+        raise MCPError(CONNECTION_CLOSED, "Connection closed")
+
+    session.call_tool = dropped
+
+
+FAST = RetryPolicy(base_delay=0)
+
+RATE_LIMITED = "Error: Rate limit exceeded; retry in 0.0 seconds"
+
+
+class TestRetryPolicy:
+    """Tests for the retry helpers."""
+
+    def test_delay_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential bound."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+
+        for attempt, bound in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 4.0)):
+            delays = [policy.delay(attempt) for _ in range(50)]
+            assert all(0 <= d <= bound for d in delays)
+            assert len(set(delays)) > 1
+
+    def test_connection_errors(self):
+        """Test which exceptions count as a lost connection."""
+        wrapped = RuntimeError("Client failed to connect")
+        wrapped.__cause__ = ConnectionRefusedError()
+
+        assert is_connection_error(MCPError(CONNECTION_CLOSED, "Connection closed"))
+        assert is_connection_error(wrapped)
+        assert not is_connection_error(ValueError("bad argument"))
+        assert not is_connection_error(MCPError(-32602, "Invalid params"))
+
+    def test_admission_rejection(self):
+        """Test that only results carrying the rejection marker are rejections."""
+        marked = rejection_result("rate_limited", RATE_LIMITED, 1.5)
+        unmarked = SimpleNamespace(is_error=False, meta=None)
+
+        assert admission_rejection(marked) == {"reason": "rate_limited", "retry_after": 1.5}
+        assert admission_rejection(unmarked) is None
+        assert admission_rejection(SimpleNamespace(is_error=True, meta={"other": 1})) is None
+
+    def test_invalid_attempts(self):
+        """Test that at least one attempt is required."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+@pytest.mark.asyncio
+class TestClientRetry:
+    """Tests for RmiMcpClient reconnects."""
+
+    async def test_reconnects_closed_session(self):
+        """Test that a session closed underneath the client is reopened."""
+        server = make_server([])
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            await client.client.__aexit__(None, None, None)
+
+            assert await client.list_python_files() == "Python files:"
+            assert client.stats["reconnects"] == 1
+
+    async def test_idempotent_call_retried(self):
+        """Test that list_python_files is retried after a dropped stream."""
+        server = make_server([])
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            drop_next_call(client)
+
+            assert await client.list_python_files() == "Python files:"
+            assert client.stats == {"reconnects": 1, "retries": 1}
+
+    async def test_run_python_not_retried_by_default(self):
+        """Test that run_python fails once but the client stays usable."""
+        runs = []
+        server = make_server(runs)
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            drop_next_call(client)
+
+            with pytest.raises(MCPError):
+                await client.run_python("a.py")
+            assert await client.run_python("b.py") == "ran b.py"
+            assert runs == ["b.py"]
+            assert client.stats == {"reconnects": 1, "retries": 0}
+
+    async def test_run_python_retry_opt_in(self):
+        """Test that run_python is retried when the policy allows it."""
+        runs = []
+        server = make_server(runs)
+        policy = RetryPolicy(base_delay=0, retry_run_python=True)
+
+        async with RmiMcpClient(server, retry=policy) as client:
+            drop_next_call(client)
+
+            assert await client.run_python("a.py") == "ran a.py"
+            assert runs == ["a.py"]
+
+    async def test_admission_rejection_retried(self):
+        """Test that rate-limited calls are repeated until admitted."""
+        server = FastMCP("RateLimited")
+        calls = []
+
+        @server.tool
+        def run_python(file_name: str) -> str:
+            calls.append(file_name)
+            if len(calls) < 3:
+                return rejection_result("rate_limited", RATE_LIMITED, 0.0)
+            return f"ran {file_name}"
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            assert await client.run_python("a.py") == "ran a.py"
+            assert client.stats["retries"] == 2
+
+    async def test_rejection_text_not_retried(self):
+        """Test that a script printing a rejection-like line is not run again."""
+        server = FastMCP("LooksLimited")
+        calls = []
+
+        @server.tool
+        def run_python(file_name: str) -> str:
+            calls.append(file_name)
+            return RATE_LIMITED
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            assert await client.run_python("a.py") == RATE_LIMITED
+            assert calls == ["a.py"]
+            assert client.stats["retries"] == 0
+
+    async def test_tool_error_raised(self):
+        """Test that other tool errors are raised, not retried."""
+        server = FastMCP("Broken")
+        calls = []
+
+        @server.tool
+        def run_python(file_name: str) -> str:
+            calls.append(file_name)
+            raise ValueError("broken tool")
+
+        async with RmiMcpClient(server, retry=FAST) as client:
+            with pytest.raises(ToolError, match="broken tool"):
+                await client.run_python("a.py")
+            assert calls == ["a.py"]
+
+    async def test_gives_up_after_max_attempts(self):
+        """Test that the last rejection is returned once attempts run out."""
+        server = FastMCP("AlwaysLimited")
+
+        @server.tool
+        def list_python_files() -> str:
+            return rejection_result("rate_limited", RATE_LIMITED, 0.0)
+
+        async with RmiMcpClient(server, retry=RetryPolicy(max_attempts=2, base_delay=0)) as client:
+            assert (await client.list_python_files()).startswith("Error: Rate limit exceeded")
+            assert client.stats["retries"] == 1
+
+    async def test_pooled_session_replaced(self):
+        """Test that a failed pooled session is discarded from the pool."""
+        server = make_server([])
+
+        async with ConnectionPool() as pool:
+            async with RmiMcpClient(server, pool=pool, retry=FAST) as client:
+                first = client.client
+                drop_next_call(client)
+
+                assert await client.list_python_files() == "Python files:"
+                assert client.client is not first
+
+            assert pool.stats["connects"] == 2
+            assert pool.stats["reconnects"] == 1
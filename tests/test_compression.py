@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the HTTP response compression middleware.
+"""
+
+import sys
+import gzip
+import zlib
+import asyncio
+import pytest
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+import compression
+from compression import CompressionMiddleware, negotiate_encoding
+
+
+def make_app(chunks, content_type=b"application/json"):
+    """Create an ASGI app that sends the given body chunks."""
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type)],
+        })
+        for i, chunk in enumerate(chunks):
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": i < len(chunks) - 1,
+            })
+    return app
+
+
+def call(app, accept_encoding="gzip"):
+    """Run an ASGI app and collect the messages it sends."""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(app(scope, receive, send))
+    return dict(messages[0]["headers"]), messages[1:]
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_gzip(self):
+        """Test gzip is chosen when it is the only option."""
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+
+    def test_disabled_by_quality(self):
+        """Test q=0 excludes an encoding."""
+        assert negotiate_encoding("gzip;q=0, identity") is None
+
+    def test_zstd_preferred(self):
+        """Test zstd wins over gzip when available."""
+        if not compression.HAS_ZSTD:
+            pytest.skip("zstandard not installed")
+        assert negotiate_encoding("gzip, zstd") == "zstd"
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    def test_small_response_not_compressed(self):
+        """Test responses below the threshold pass through."""
+        app = CompressionMiddleware(make_app([b"{}"]), minimum_size=100)
+        headers, bodies = call(app)
+
+        assert b"content-encoding" not in headers
+        assert bodies[0]["body"] == b"{}"
+
+    def test_large_response_compressed(self):
+        """Test complete responses above the threshold are gzipped."""
+        payload = b'{"text": "' + b"hello " * 1000 + b'"}'
+        app = CompressionMiddleware(make_app([payload]), minimum_size=100)
+        before = compression.BYTES_IN.value(encoding="gzip")
+
+        headers, bodies = call(app)
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert int(headers[b"content-length"]) == len(bodies[0]["body"])
+        assert gzip.decompress(bodies[0]["body"]) == payload
+        assert compression.BYTES_IN.value(encoding="gzip") - before == len(payload)
+
+    def test_streaming_chunks_flushed(self):
+        """Test each streamed chunk can be decoded as soon as it arrives."""
+        chunks = [b"data: one\n\n", b"data: two\n\n"]
+        app = CompressionMiddleware(make_app(chunks, b"text/event-stream"), minimum_size=100)
+
+        headers, bodies = call(app)
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        assert decoder.decompress(bodies[0]["body"]) == chunks[0]
+        assert decoder.decompress(bodies[1]["body"]) == chunks[1]
+
+    def test_not_accepted(self):
+        """Test clients that do not accept compression get identity."""
+        payload = b"x" * 5000
+        app = CompressionMiddleware(make_app([payload]), minimum_size=100)
+        headers, bodies = call(app, accept_encoding="identity")
+
+        assert b"content-encoding" not in headers
+        assert bodies[0]["body"] == payload
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the reloadable server configuration.
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from config import ServerConfig, load_config, load_server_config
+
+
+DEFAULTS = {
+    "allowed_directory": "/srv/projects",
+    "python_timeout": 30,
+    "python_cmd": "python3",
+    "python_max_concurrency": 4,
+    "syntax_preflight": "auto",
+}
+
+
+class TestLoadConfig:
+    """Tests for building a ServerConfig from its sources."""
+    
+    def test_defaults(self):
+        """Test that defaults are used when nothing overrides them."""
+        config = load_config(DEFAULTS, environ={})
+        
+        assert config == ServerConfig(**DEFAULTS)
+    
+    def test_environment_overrides_defaults(self):
+        """Test that environment variables are parsed and applied."""
+        config = load_config(DEFAULTS, environ={"PYTHON_TIMEOUT": "5", "PYTHON_CMD": "pypy3"})
+        
+        assert config.python_timeout == 5
+        assert config.python_cmd == "pypy3"
+    
+    def test_file_overrides_environment(self, tmp_path):
+        """Test that the config file wins over the environment."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"python_timeout": 9, "syntax_preflight": "OFF"}')
+        
+        config = load_config(DEFAULTS, environ={"PYTHON_TIMEOUT": "5"}, config_file=str(config_file))
+        
+        assert config.python_timeout == 9
+        assert config.syntax_preflight == "off"
+    
+    def test_unknown_key_rejected(self, tmp_path):
+        """Test that typos in the config file are reported."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"python_timeot": 9}')
+        
+        with pytest.raises(ValueError, match="python_timeot"):
+            load_config(DEFAULTS, environ={}, config_file=str(config_file))
+    
+    def test_invalid_values_rejected(self):
+        """Test validation of numeric settings."""
+        with pytest.raises(ValueError):
+            load_config(DEFAULTS, environ={"PYTHON_MAX_CONCURRENCY": "0"})
+        with pytest.raises(ValueError):
+            load_config(DEFAULTS, environ={"PYTHON_TIMEOUT": "soon"})
+    
+    def test_diff(self):
+        """Test that diff reports changed fields only."""
+        old = ServerConfig(**DEFAULTS)
+        new = ServerConfig(**{**DEFAULTS, "python_timeout": 10})
+        
+        assert old.diff(new) == {"python_timeout": (30, 10)}
+    
+    def test_load_server_config(self, tmp_path, monkeypatch):
+        """Test that the server settings honor the environment and MCP_CONFIG_FILE."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"allowed_directory": "/srv/from-file"}')
+        monkeypatch.setenv("PYTHON_PROJECTS_DIR", "/srv/from-env")
+        monkeypatch.setenv("PYTHON_TIMEOUT", "7")
+        monkeypatch.setenv("MCP_CONFIG_FILE", str(config_file))
+        
+        config = load_server_config()
+        
+        assert config.allowed_directory == "/srv/from-file"
+        assert config.python_timeout == 7
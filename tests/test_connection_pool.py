@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for pooled, shared MCP sessions in the client.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+
+from connection_pool import ConnectionPool
+from mcp_client import RmiMcpClient
+
+
+def make_server():
+    """Create a small server with a slow tool."""
+    server = FastMCP("PoolTest")
+
+    @server.tool
+    async def run_python(file_name: str) -> str:
+        await asyncio.sleep(0.05)
+        return f"ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        return "Python files:"
+
+    return server
+
+
+@pytest.mark.asyncio
+class TestConnectionPool:
+    """Tests for ConnectionPool and RmiMcpClient(pool=...)."""
+
+    async def test_sessions_reused(self):
+        """Test that consecutive clients reuse one warm session."""
+        server = make_server()
+
+        async with ConnectionPool() as pool:
+            for name in ("a.py", "b.py", "c.py"):
+                async with RmiMcpClient(server, pool=pool) as client:
+                    assert await client.run_python(name) == f"ran {name}"
+
+            assert pool.stats["connects"] == 1
+            assert pool.stats["reuses"] == 2
+
+    async def test_concurrent_callers_share_session(self):
+        """Test that many concurrent callers multiplex over the pool's sessions."""
+        server = make_server()
+
+        async def run(pool, i):
+            async with RmiMcpClient(server, pool=pool) as client:
+                return await client.run_python(f"{i}.py")
+
+        async with ConnectionPool(sessions_per_url=2) as pool:
+            results = await asyncio.gather(*(run(pool, i) for i in range(10)))
+
+            assert results == [f"ran {i}.py" for i in range(10)]
+            assert pool.stats["connects"] == 2
+
+    async def test_reconnect_after_disconnect(self):
+        """Test that a disconnected session is replaced transparently."""
+        server = make_server()
+
+        async with ConnectionPool() as pool:
+            async with RmiMcpClient(server, pool=pool) as client:
+                first = client.client
+                await first.__aexit__(None, None, None)
+
+            async with RmiMcpClient(server, pool=pool) as client:
+                assert client.client is not first
+                assert await client.list_python_files() == "Python files:"
+
+            assert pool.stats["connects"] == 2
+            assert pool.stats["reconnects"] == 1
+
+    async def test_failed_health_check_reconnects(self, monkeypatch):
+        """Test that a session failing its ping is replaced."""
+        server = make_server()
+
+        async with ConnectionPool(health_check_interval=0) as pool:
+            async with pool.session(server) as client:
+                first = client
+
+            async def broken_ping():
+                raise ConnectionError("stream closed")
+            monkeypatch.setattr(first, "ping", broken_ping)
+
+            async with pool.session(server) as client:
+                assert client is not first
+                assert (await client.call_tool("list_python_files", {})).content[0].text == "Python files:"
+
+    async def test_idle_sessions_closed(self):
+        """Test that sessions unused for idle_timeout are closed."""
+        server = make_server()
+
+        async with ConnectionPool(idle_timeout=0) as pool:
+            async with pool.session(server):
+                pass
+            async with pool.session(server):
+                pass
+
+            assert pool.stats["idle_closed"] == 1
+            assert pool.stats["connects"] == 2
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-budgeted conversation history of the LLM client.
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from conversation import Conversation, estimate_tokens
+
+
+def add_tool_turn(conversation, index, output_lines=200):
+    """Add a turn that runs a file with a large output."""
+    call_id = f"call_{index}"
+    conversation.append({"role": "user", "content": f"run script {index}"})
+    conversation.append({
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": call_id, "type": "function",
+            "function": {"name": "run_python", "arguments": json.dumps({"file_name": f"/srv/s{index}.py"})},
+        }],
+    })
+    output = "\n".join(f"line {n} of script {index}" for n in range(output_lines))
+    conversation.append({"role": "tool", "tool_call_id": call_id, "name": "run_python", "content": output})
+    conversation.append({"role": "assistant", "content": f"Script {index} printed {output_lines} lines."})
+
+
+def check_tool_messages(messages):
+    """Assert that every tool message answers a call sent before it."""
+    call_ids = set()
+    for message in messages:
+        for call in message.get("tool_calls") or []:
+            call_ids.add(call["id"])
+        if message["role"] == "tool":
+            assert message["tool_call_id"] in call_ids
+
+
+class TestConversation:
+    """Tests for Conversation."""
+
+    def test_under_budget_unchanged(self):
+        """Test that a short history is sent verbatim."""
+        conversation = Conversation("system prompt", max_tokens=8000)
+        conversation.append({"role": "user", "content": "hi"})
+        conversation.append({"role": "assistant", "content": "hello"})
+
+        assert conversation.messages() == [
+            {"role": "system", "content": "system prompt"},
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+        ]
+        assert conversation.stats["compacted_turns"] == 0
+
+    def test_old_turns_compacted(self):
+        """Test that old turns are summarized and recent turns kept verbatim."""
+        conversation = Conversation("system prompt", max_tokens=3000, keep_turns=2)
+        for index in range(5):
+            add_tool_turn(conversation, index)
+
+        messages = conversation.messages()
+
+        assert messages[0] == {"role": "system", "content": "system prompt"}
+        summary = messages[1]["content"]
+        assert summary.startswith("Summary of the earlier conversation")
+        assert 'User: "run script 0"' in summary
+        assert "run_python" in summary and "/srv/s0.py" in summary
+        assert "line 0 of script 0 (+199 lines)" in summary
+        assert "line 150 of script 0" not in summary
+
+        # The last two turns are untouched
+        assert messages[-8:] == [m for turn in conversation.turns for m in turn]
+        assert [m["content"] for m in messages if m["role"] == "user"][-2:] == [
+            "run script 3", "run script 4"
+        ]
+        check_tool_messages(messages)
+
+    def test_requests_stay_within_budget(self):
+        """Test that request sizes stay flat over a long session."""
+        conversation = Conversation("system prompt", max_tokens=4000, keep_turns=1)
+
+        for index in range(300):
+            add_tool_turn(conversation, index, output_lines=50)
+            conversation.messages()
+
+        assert max(conversation.request_tokens) <= 4000
+        assert conversation.request_tokens[-1] <= conversation.request_tokens[50] * 1.1
+        assert conversation.omitted_turns > 0
+        assert "earlier turns omitted" in conversation.messages()[1]["content"]
+
+    def test_current_turn_never_compacted(self):
+        """Test that the turn in progress is sent even when over budget."""
+        conversation = Conversation("system prompt", max_tokens=100, keep_turns=1)
+        add_tool_turn(conversation, 0)
+        add_tool_turn(conversation, 1)
+
+        messages = conversation.messages()
+
+        assert messages[-4]["content"] == "run script 1"
+        assert "line 199 of script 1" in messages[-2]["content"]
+        check_tool_messages(messages)
+
+    def test_custom_token_counter(self):
+        """Test that a custom counter decides the budget."""
+        words = lambda text: len(text.split())
+        conversation = Conversation("system prompt", max_tokens=30, keep_turns=1, count_tokens=words)
+        for index in range(3):
+            conversation.append({"role": "user", "content": "word " * 10})
+            conversation.append({"role": "assistant", "content": "ok"})
+
+        conversation.messages()
+
+        assert len(conversation.turns) == 1
+        assert conversation.stats["compacted_turns"] == 2
+
+    def test_estimate_tokens(self):
+        """Test the character-based estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_keep_turns_validated(self):
+        """Test that at least one turn must be kept."""
+        with pytest.raises(ValueError):
+            Conversation("system prompt", keep_turns=0)
@@ -7,6 +7,7 @@ import sys
 import os
 import asyncio
 import pytest
+import pytest_asyncio
 from pathlib import Path
 
 # Set cross-platform default directory
@@ -27,7 +28,7 @@ from mcp_client import RmiMcpClient
 class TestClientServerIntegration:
     """Integration tests for client-server communication."""
     
-    @pytest.fixture
+    @pytest_asyncio.fixture
     async def client(self):
         """Create client connected to server via in-memory transport."""
         # Use in-memory transport for testing
@@ -39,9 +40,9 @@ class TestClientServerIntegration:
         tools = await client.list_tools()
         
         assert tools is not None
-        assert len(tools.tools) >= 2  # run_python and list_python_files
+        assert len(tools) >= 2  # run_python and list_python_files
         
-        tool_names = [tool.name for tool in tools.tools]
+        tool_names = [tool.name for tool in tools]
         assert "run_python" in tool_names
         assert "list_python_files" in tool_names
     
@@ -85,6 +86,73 @@ class TestClientServerIntegration:
         
         assert "file1.py" in output or "file2.py" in output
         assert "Error" not in output
+    
+    async def test_tool_metrics_recorded(self, client):
+        """Test that tool calls are counted and timed."""
+        from instrumentation import TOOL_CALLS, TOOL_DURATION
+        
+        calls_before = TOOL_CALLS.value(tool="list_python_files", status="ok")
+        timings_before = TOOL_DURATION.count(tool="list_python_files")
+        
+        Path(ALLOWED_DIRECTORY).mkdir(parents=True, exist_ok=True)
+        (Path(ALLOWED_DIRECTORY) / "file1.py").write_text("pass")
+        await client.list_python_files()
+        
+        assert TOOL_CALLS.value(tool="list_python_files", status="ok") == calls_before + 1
+        assert TOOL_DURATION.count(tool="list_python_files") == timings_before + 1
+    
+    async def test_tool_metrics_status(self, client):
+        """Test that only the server's own errors count as failed calls."""
+        from instrumentation import TOOL_CALLS
+        
+        test_dir = Path(ALLOWED_DIRECTORY)
+        test_dir.mkdir(parents=True, exist_ok=True)
+        test_file = test_dir / "test_prints_error.py"
+        test_file.write_text("print('Error: this is just output')")
+        ok_before = TOOL_CALLS.value(tool="run_python", status="ok")
+        errors_before = TOOL_CALLS.value(tool="run_python", status="error")
+        
+        output = await client.run_python(str(test_file))
+        assert output.startswith("Error: this is just output")
+        assert TOOL_CALLS.value(tool="run_python", status="ok") == ok_before + 1
+        
+        output = await client.run_python(str(test_dir / "missing.py"))
+        assert output.startswith("Error: File not found")
+        assert TOOL_CALLS.value(tool="run_python", status="error") == errors_before + 1
+
+
+@pytest.mark.asyncio
+class TestTracing:
+    """Integration tests for request tracing."""
+    
+    @pytest_asyncio.fixture
+    async def client(self):
+        """Create client connected to server via in-memory transport."""
+        async with RmiMcpClient(server_mcp) as client:
+            yield client
+    
+    async def test_run_python_span_breakdown(self, client):
+        """Test that a run_python call is traced phase by phase."""
+        import json
+        
+        test_dir = Path(ALLOWED_DIRECTORY)
+        test_dir.mkdir(parents=True, exist_ok=True)
+        test_file = test_dir / "test_traced.py"
+        test_file.write_text("print('traced')")
+        
+        await client.run_python(str(test_file))
+        
+        result = await client.client.call_tool(
+            "get_recent_traces", {"limit": 1, "tool": "run_python"}
+        )
+        traces = json.loads(result.content[0].text)
+        spans = traces[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        names = {span["name"] for span in spans}
+        
+        assert {
+            "tools/call run_python", "validation", "queue_wait", "spawn",
+            "execution", "output_assembly", "serialization"
+        } <= names
 
 
 def run_integration_tests():
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for pluggable LLM backends and the offline scripted fake.
+"""
+
+import sys
+import os
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+# Set cross-platform default directory
+if "PYTHON_PROJECTS_DIR" not in os.environ:
+    project_root = Path(__file__).parent.parent.resolve()
+    os.environ["PYTHON_PROJECTS_DIR"] = str(project_root / "python_projects")
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "server"))
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+
+from mcp_server import mcp as server_mcp, ALLOWED_DIRECTORY
+from mcp_client import RmiMcpClient
+from llm_backends import ScriptedBackend, default_response
+from mcp_client_llm import ADMIN_TOOLS, AgentSession, LLMClient, execute_tool, llm_interactive_mode, to_openai_tools
+
+TOOLS = [{"type": "function", "function": {"name": "run_python"}}]
+
+
+class TestScriptedBackend:
+    """Tests for the scripted fake LLM."""
+
+    @pytest.mark.asyncio
+    async def test_canned_responses(self):
+        """Test that canned responses are streamed in order and requests recorded."""
+        backend = ScriptedBackend([
+            {"content": None, "tool_calls": [{"name": "run_python", "arguments": {"file_name": "/srv/a.py"}}]},
+            lambda messages, tools: {"content": f"{len(messages)} messages seen"},
+        ], chunk_size=4)
+        llm = LLMClient(model="scripted", backend=backend)
+
+        first = await llm.call_llm([{"role": "user", "content": "go"}], tools=TOOLS)
+        second = await llm.call_llm([{"role": "user", "content": "go"}, {"role": "user", "content": "on"}])
+
+        [call] = first["tool_calls"]
+        assert (call.name, call.parsed_arguments()) == ("run_python", {"file_name": "/srv/a.py"})
+        assert second["content"] == "2 messages seen"
+        assert [request["tools"] for request in backend.requests] == [TOOLS, None]
+        assert backend.request_bytes[0] > 0
+
+    def test_default_rules(self):
+        """Test the rule-based replies used once the script is used up."""
+        def ask(prompt, tools=TOOLS):
+            return default_response([{"role": "user", "content": prompt}], tools)
+
+        assert ask("run a.py and lib/b.py")["tool_calls"] == [
+            {"name": "run_python", "arguments": {"file_name": "a.py"}},
+            {"name": "run_python", "arguments": {"file_name": "lib/b.py"}},
+        ]
+        assert ask("show me the files")["tool_calls"] == [{"name": "list_python_files", "arguments": {}}]
+        assert ask("run a.py", tools=None)["tool_calls"] == []
+        assert ask("hello")["content"]
+
+        after_tool = default_response([
+            {"role": "user", "content": "run a.py"},
+            {"role": "tool", "name": "run_python", "content": "Hello\nWorld"},
+        ])
+        assert after_tool["content"] == "Done. run_python: Hello"
+
+    def test_no_api_key_needed(self, monkeypatch):
+        """Test that a backend replaces the API key requirement."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+        with pytest.raises(ValueError):
+            LLMClient()
+        assert LLMClient(backend=ScriptedBackend()).model == "gpt-4o-mini"
+
+
+@pytest.mark.asyncio
+class TestOfflineAgent:
+    """Tests for running the LLM client against the real server without network."""
+
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        self.test_file = self.test_dir / "test_offline_agent.py"
+        self.test_file.write_text("print('Hello from the offline agent')")
+
+    async def test_non_interactive_session(self, capsys):
+        """Test llm_interactive_mode with given prompts and the scripted LLM."""
+        llm = LLMClient(model="scripted", backend=ScriptedBackend())
+
+        await llm_interactive_mode(server_mcp, llm=llm, prompts=[f"run {self.test_file}", "list files"])
+
+        output = capsys.readouterr().out
+        assert "Hello from the offline agent" in output
+        assert "test_offline_agent.py" in output
+        assert "Goodbye!" in output
+        assert len(llm.backend.requests) == 4
+
+    async def test_stage_timings(self):
+        """Test that an agent session times each stage of a turn."""
+        llm = LLMClient(model="scripted", backend=ScriptedBackend())
+
+        async with RmiMcpClient(server_mcp) as mcp_client:
+            session = AgentSession(mcp_client, llm, echo=False)
+            answer = await session.turn(f"run {self.test_file}")
+
+        assert answer == "Done. run_python: Hello from the offline agent"
+        assert {stage: len(times) for stage, times in session.timings.items()} == {
+            "turn": 1, "schemas": 1, "messages": 2, "llm": 2, "tools": 1, "results": 1
+        }
+
+
+@pytest.mark.asyncio
+class TestServerTools:
+    """Tests for the server tools offered to the model."""
+
+    async def test_admin_tools_hidden(self):
+        """Test that administration tools are not offered to the model."""
+        async with RmiMcpClient(server_mcp) as mcp_client:
+            schemas = await mcp_client.tool_schemas(to_openai_tools)
+
+        names = {schema["function"]["name"] for schema in schemas}
+        assert {"run_python", "search_python_files", "describe_python_files"} <= names
+        assert not names & ADMIN_TOOLS
+
+    async def test_other_tools_dispatched(self):
+        """Test that tools beyond run_python and list_python_files reach the server."""
+        test_dir = Path(ALLOWED_DIRECTORY)
+        test_dir.mkdir(parents=True, exist_ok=True)
+        (test_dir / "test_dispatch_target.py").write_text("def dispatch_target():\n    pass\n")
+
+        async with RmiMcpClient(server_mcp) as mcp_client:
+            found = await execute_tool(mcp_client, "search_python_files", {"query": "def dispatch_target"})
+            hidden = await execute_tool(mcp_client, "reload_config", {})
+
+        assert "test_dispatch_target.py:1" in found
+        assert hidden.startswith("Error: Tool not available")
+
+    async def test_run_python_timeout_passed(self):
+        """Test that a timeout the model asks for reaches the server."""
+        server = FastMCP("TimeoutTest")
+
+        @server.tool
+        def run_python(file_name: str, timeout: Optional[float] = None) -> str:
+            return f"ran {file_name} with timeout {timeout}"
+
+        async with RmiMcpClient(server) as mcp_client:
+            result = await execute_tool(mcp_client, "run_python", {"file_name": "slow.py", "timeout": 120})
+
+        assert result == "ran slow.py with timeout 120.0"
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Tests for async, streaming LLM calls, against a local fake OpenAI server.
+"""
+
+import sys
+import time
+import asyncio
+import builtins
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openai")
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastmcp import FastMCP
+
+from fake_openai_server import FakeOpenAIServer
+from mcp_client_llm import LLMClient, ToolCall, gather_tool_results, llm_interactive_mode
+
+
+@pytest.fixture
+def fake_openai():
+    """Fake OpenAI-compatible server."""
+    with FakeOpenAIServer() as server:
+        yield server
+
+
+def make_server(runs):
+    """Create an MCP server that records which files it ran."""
+    server = FastMCP("LLMTest")
+
+    @server.tool
+    def run_python(file_name: str) -> str:
+        runs.append(file_name)
+        return f"ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        return "Python files in /srv:"
+
+    return server
+
+
+class TestToolCall:
+    """Tests for assembling tool call arguments."""
+
+    def test_parsed_arguments(self):
+        """Test that arguments parse only once complete."""
+        call = ToolCall(0)
+        assert call.parsed_arguments() == {}
+
+        call.arguments = '{"file_name": "a'
+        assert call.parsed_arguments() is None
+
+        call.arguments = '{"file_name": "a}'
+        assert call.parsed_arguments() is None
+
+        call.arguments = '{"file_name": "a.py"}'
+        assert call.parsed_arguments() == {"file_name": "a.py"}
+
+        call.arguments = '["a.py"]'
+        assert call.parsed_arguments() is None
+
+
+@pytest.mark.asyncio
+class TestStreaming:
+    """Tests for LLMClient.call_llm."""
+
+    async def test_text_streamed(self, fake_openai):
+        """Test that text arrives in pieces and is returned whole."""
+        fake_openai.add_response(content="Hello from the fake model.")
+        llm = LLMClient(api_key="test", base_url=fake_openai.base_url)
+
+        pieces = []
+        response = await llm.call_llm([{"role": "user", "content": "hi"}], on_text=pieces.append)
+
+        assert len(pieces) > 1
+        assert "".join(pieces) == response["content"] == "Hello from the fake model."
+        assert response["tool_calls"] is None
+        assert fake_openai.requests[0]["stream"] is True
+
+    async def test_tool_calls_assembled(self, fake_openai):
+        """Test that tool calls are assembled from argument deltas."""
+        fake_openai.add_response(tool_calls=[
+            {"name": "run_python", "arguments": {"file_name": "/srv/a.py"}},
+            {"name": "list_python_files", "arguments": {}},
+        ])
+        llm = LLMClient(api_key="test", model="fake-model", base_url=fake_openai.base_url)
+
+        async def run_tool(call):
+            return call.name
+
+        response = await llm.call_llm([{"role": "user", "content": "run a"}], on_tool_call=run_tool)
+
+        first, second = response["tool_calls"]
+        assert (first.id, first.name, first.parsed_arguments()) == (
+            "call_0", "run_python", {"file_name": "/srv/a.py"}
+        )
+        assert (second.name, second.parsed_arguments()) == ("list_python_files", {})
+        assert [await first.task, await second.task] == ["run_python", "list_python_files"]
+        assert fake_openai.requests[0]["model"] == "fake-model"
+
+    async def test_tool_call_starts_before_stream_ends(self, fake_openai):
+        """Test that a tool call starts as soon as its arguments are complete."""
+        fake_openai.add_response(tool_calls=[
+            {"name": "run_python", "arguments": {"file_name": "/srv/a.py"}, "pause": 0.5},
+            {"name": "run_python", "arguments": {"file_name": "/srv/b.py"}},
+        ])
+        llm = LLMClient(api_key="test", base_url=fake_openai.base_url)
+
+        started = {}
+
+        async def run_tool(call):
+            started[call.parsed_arguments()["file_name"]] = time.monotonic()
+            return "ok"
+
+        response = await llm.call_llm([{"role": "user", "content": "run both"}], on_tool_call=run_tool)
+        await asyncio.gather(*(call.task for call in response["tool_calls"]))
+
+        # a.py started during the pause, before b.py's arguments were streamed
+        assert started["/srv/b.py"] - started["/srv/a.py"] >= 0.4
+
+    async def test_event_loop_not_blocked(self, fake_openai):
+        """Test that other tasks keep running while the model streams."""
+        fake_openai.delay = 0.02
+        fake_openai.add_response(content="A slowly streamed answer.")
+        llm = LLMClient(api_key="test", base_url=fake_openai.base_url)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await llm.call_llm([{"role": "user", "content": "hi"}])
+        task.cancel()
+
+        assert ticks >= 5
+
+
+class TestLLMInteractiveMode:
+    """Tests for llm_interactive_mode against a fake model."""
+
+    @pytest.mark.asyncio
+    async def test_tool_turn(self, fake_openai, monkeypatch, capsys):
+        """Test a full turn: tool call, tool result, final answer."""
+        fake_openai.add_response(tool_calls=[{"name": "run_python", "arguments": {"file_name": "/srv/a.py"}}])
+        fake_openai.add_response(content="The program ran.")
+        prompts = iter(["run a.py", "quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+
+        runs = []
+        await llm_interactive_mode(make_server(runs), api_key="test", base_url=fake_openai.base_url)
+
+        output = capsys.readouterr().out
+        assert runs == ["/srv/a.py"]
+        assert "ran /srv/a.py" in output
+        assert "The program ran." in output
+
+        first, second = fake_openai.requests
+        assert {tool["function"]["name"] for tool in first["tools"]} == {"run_python", "list_python_files"}
+        assert second["messages"][-1] == {
+            "role": "tool", "tool_call_id": "call_0", "name": "run_python", "content": "ran /srv/a.py"
+        }
+
+    @pytest.mark.asyncio
+    async def test_history_compacted(self, fake_openai, monkeypatch):
+        """Test that long sessions send a bounded history."""
+        server = FastMCP("BigOutput")
+
+        @server.tool
+        def run_python(file_name: str) -> str:
+            return "\n".join(f"{file_name} line {n}" for n in range(300))
+
+        for i in range(6):
+            fake_openai.add_response(tool_calls=[{"name": "run_python", "arguments": {"file_name": f"/srv/{i}.py"}}])
+            fake_openai.add_response(content=f"Script {i} ran.")
+        prompts = iter([f"run {i}.py" for i in range(6)] + ["quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+
+        await llm_interactive_mode(
+            server, api_key="test", base_url=fake_openai.base_url,
+            context_tokens=6000, tool_output_tokens=0
+        )
+
+        # About 1,400 tokens per raw output: older ones are compacted away
+        raw_outputs = [
+            sum(message["role"] == "tool" for message in request["messages"])
+            for request in fake_openai.requests
+        ]
+        assert max(raw_outputs) <= 4 and raw_outputs[-1] < 6
+        last = fake_openai.requests[-1]["messages"]
+        assert last[1]["content"].startswith("Summary of the earlier conversation")
+        assert '"run 0.py"' in last[1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_tool_output_condensed(self, fake_openai, monkeypatch, capsys):
+        """Test that the LLM gets a condensed output while the terminal shows it whole."""
+        server = FastMCP("BigOutput")
+
+        @server.tool
+        def run_python(file_name: str) -> str:
+            return "\n".join(f"row {n}" for n in range(20000))
+
+        fake_openai.add_response(tool_calls=[{"name": "run_python", "arguments": {"file_name": "/srv/big.py"}}])
+        fake_openai.add_response(content="It printed many rows.")
+        prompts = iter(["run big.py", ":output 1", "quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+
+        await llm_interactive_mode(
+            server, api_key="test", base_url=fake_openai.base_url, tool_output_tokens=500
+        )
+
+        sent = fake_openai.requests[1]["messages"][-1]["content"]
+        assert len(sent) < 2500
+        assert "full output kept locally as #1" in sent
+        # The turn printed every row, once by itself and once for ':output 1',
+        # which did not call the model
+        output = capsys.readouterr().out
+        assert output.count("row 12345") == 2
+        assert "full output kept locally" not in output
+        assert len(fake_openai.requests) == 2
+
+
+@pytest.mark.asyncio
+class TestParallelToolCalls:
+    """Tests for running the tool calls of one model turn concurrently."""
+
+    def make_slow_server(self, running):
+        """Create a server whose runs take 0.3s and record concurrency."""
+        server = FastMCP("ParallelTest")
+
+        @server.tool
+        async def run_python(file_name: str) -> str:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.3)
+            running["now"] -= 1
+            return f"ran {file_name}"
+
+        @server.tool
+        def list_python_files() -> str:
+            return "Python files in /srv:"
+
+        return server
+
+    def script(self, fake_openai, count):
+        """Queue a turn calling run_python count times, then an answer."""
+        fake_openai.add_response(tool_calls=[
+            {"name": "run_python", "arguments": {"file_name": f"/srv/{i}.py"}} for i in range(count)
+        ])
+        fake_openai.add_response(content="All done.")
+
+    async def test_calls_run_concurrently(self, fake_openai, monkeypatch, capsys):
+        """Test that all five calls run at the same time."""
+        self.script(fake_openai, 5)
+        prompts = iter(["run all five", "quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+        running = {"now": 0, "peak": 0}
+
+        await llm_interactive_mode(
+            self.make_slow_server(running), api_key="test", base_url=fake_openai.base_url,
+            max_parallel_tools=5
+        )
+
+        assert running["peak"] == 5
+
+        output = capsys.readouterr().out
+        assert all(f"ran /srv/{i}.py" in output for i in range(5))
+
+    async def test_concurrency_cap(self, fake_openai, monkeypatch):
+        """Test that at most max_parallel_tools calls run at once."""
+        self.script(fake_openai, 5)
+        prompts = iter(["run all five", "quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+        running = {"now": 0, "peak": 0}
+
+        await llm_interactive_mode(
+            self.make_slow_server(running), api_key="test", base_url=fake_openai.base_url,
+            max_parallel_tools=2
+        )
+
+        assert running["peak"] == 2
+
+    async def test_single_assistant_message(self, fake_openai, monkeypatch):
+        """Test that all calls of a turn are sent back under one assistant message."""
+        self.script(fake_openai, 3)
+        prompts = iter(["run all three", "quit"])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(prompts))
+
+        await llm_interactive_mode(make_server([]), api_key="test", base_url=fake_openai.base_url)
+
+        messages = fake_openai.requests[1]["messages"]
+        assistant = messages[-4]
+        assert assistant["role"] == "assistant"
+        assert [call["id"] for call in assistant["tool_calls"]] == ["call_0", "call_1", "call_2"]
+        assert [m["tool_call_id"] for m in messages[-3:]] == ["call_0", "call_1", "call_2"]
+        assert [m["content"] for m in messages[-3:]] == [f"ran /srv/{i}.py" for i in range(3)]
+
+    async def test_failed_call_reported(self):
+        """Test that a failing call becomes an error result without hiding the others."""
+        async def ok():
+            return "ok"
+
+        async def broken():
+            raise ConnectionError("stream closed")
+
+        calls = [ToolCall(0), ToolCall(1)]
+        calls[0].task = asyncio.ensure_future(ok())
+        calls[1].task = asyncio.ensure_future(broken())
+
+        assert await gather_tool_results(calls) == ["ok", "Error: ConnectionError: stream closed"]
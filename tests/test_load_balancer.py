@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side load balancing across several servers.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "server"))
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+from mcp.shared.exceptions import MCPError
+from mcp.types import CONNECTION_CLOSED
+
+from admission import AdmissionMiddleware
+from mcp_client import RmiMcpClient
+from retry import RetryPolicy
+
+
+# Nothing listens on the discard port, so connecting fails at once
+DEAD_URL = "http://127.0.0.1:9/mcp"
+
+FAST = RetryPolicy(base_delay=0)
+
+
+def make_server(name, runs, reply=None, delay=0.05, middleware=None):
+    """Create a server that records which files it ran."""
+    server = FastMCP(name)
+    if middleware is not None:
+        server.add_middleware(middleware)
+
+    @server.tool
+    async def run_python(file_name: str) -> str:
+        runs.append(file_name)
+        await asyncio.sleep(delay)
+        return reply or f"{name} ran {file_name}"
+
+    @server.tool
+    def list_python_files() -> str:
+        return f"Python files in /{name}:"
+
+    return server
+
+
+def endpoint_for(client, server):
+    """Find the balancer endpoint of a server."""
+    return next(e for e in client.balancer.endpoints if e.url is server)
+
+
+class TestLoadBalancer:
+    """Tests for RmiMcpClient with several server URLs."""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding_requests(self):
+        """Test that concurrent runs are spread evenly across servers."""
+        runs = {name: [] for name in ("a", "b", "c")}
+        servers = [make_server(name, runs[name]) for name in runs]
+
+        async with RmiMcpClient(servers) as client:
+            await asyncio.gather(*(client.run_python(f"{i}.py") for i in range(6)))
+
+        assert [len(r) for r in runs.values()] == [2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_busy_server_avoided(self):
+        """Test that new calls go to idle servers while one runs a long job."""
+        slow_runs, fast_runs = [], []
+        slow = make_server("slow", slow_runs, delay=0.5)
+        fast = make_server("fast", fast_runs, delay=0)
+
+        async with RmiMcpClient([slow, fast]) as client:
+            endpoint_for(client, fast).outstanding += 1
+            long_run = asyncio.create_task(client.run_python("long.py"))
+            await asyncio.sleep(0.1)
+            endpoint_for(client, fast).outstanding -= 1
+
+            for i in range(3):
+                await client.run_python(f"{i}.py")
+            await long_run
+
+        assert slow_runs == ["long.py"]
+        assert fast_runs == ["0.py", "1.py", "2.py"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_ejected(self):
+        """Test that a server that cannot be reached receives no calls."""
+        runs = []
+        server = make_server("up", runs)
+
+        async with RmiMcpClient([DEAD_URL, server], retry=FAST) as client:
+            dead = client.balancer.endpoints[0]
+            assert not dead.available(time.monotonic())
+
+            for i in range(4):
+                assert await client.run_python(f"{i}.py") == f"up ran {i}.py"
+
+        assert len(runs) == 4
+        assert dead.stats["ejections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_overloaded_server_fails_over(self):
+        """Test that a rejected call moves to another server."""
+        busy_runs, ok_runs = [], []
+        busy = make_server("busy", busy_runs, middleware=AdmissionMiddleware(
+            overload_reason=lambda: "queue full"
+        ))
+        ok = make_server("ok", ok_runs)
+
+        async with RmiMcpClient([busy, ok], retry=FAST) as client:
+            for i in range(3):
+                assert await client.run_python(f"{i}.py") == f"ok ran {i}.py"
+
+            assert busy_runs == []
+            assert endpoint_for(client, busy).stats["ejections"] <= 1
+            assert len(ok_runs) == 3
+
+    @pytest.mark.asyncio
+    async def test_draining_server_fails_over(self):
+        """Test that a server refusing work while draining is ejected."""
+        draining_runs, ok_runs = [], []
+        draining = make_server("draining", draining_runs, middleware=AdmissionMiddleware(
+            draining=lambda: True
+        ))
+        ok = make_server("ok", ok_runs)
+
+        async with RmiMcpClient([draining, ok], retry=FAST) as client:
+            for i in range(3):
+                assert await client.run_python(f"{i}.py") == f"ok ran {i}.py"
+
+            assert draining_runs == []
+            assert endpoint_for(client, draining).stats["ejections"] <= 1
+
+    @pytest.mark.asyncio
+    async def test_rejection_text_not_ejected(self):
+        """Test that a script printing a rejection-like line is neither ejected nor re-run."""
+        runs = []
+        reply = "Error: Server is shutting down"
+        a = make_server("a", runs, reply=reply)
+        b = make_server("b", runs, reply=reply)
+
+        async with RmiMcpClient([a, b], retry=FAST) as client:
+            assert await client.run_python("x.py") == reply
+
+            assert runs == ["x.py"]
+            assert all(e.stats["ejections"] == 0 for e in client.balancer.endpoints)
+
+    @pytest.mark.asyncio
+    async def test_every_server_rejecting(self):
+        """Test that the last rejection is returned when no server takes the call."""
+        servers = [
+            make_server(name, [], middleware=AdmissionMiddleware(overload_reason=lambda: "queue full"))
+            for name in ("a", "b")
+        ]
+
+        async with RmiMcpClient(servers, retry=RetryPolicy(max_attempts=2, base_delay=0)) as client:
+            result = await client.run_python("x.py")
+
+        assert result == "Error: Server overloaded (queue full); retry later"
+
+    @pytest.mark.asyncio
+    async def test_dropped_connection_retries_elsewhere(self):
+        """Test that idempotent calls move on after a dropped stream."""
+        a, b = make_server("a", []), make_server("b", [])
+
+        async with RmiMcpClient([a, b], retry=FAST) as client:
+            client.balancer.failure_threshold = 1
+            for endpoint in client.balancer.endpoints:
+                async def dropped(*args, **kwargs):
+                    raise MCPError(CONNECTION_CLOSED, "Connection closed")
+                endpoint.client.client.call_tool = dropped
+            broken = client.balancer.endpoints
+
+            result = await client.list_python_files()
+
+            # Both sessions dropped once; the retry reconnected one of them
+            assert result in ("Python files in /a:", "Python files in /b:")
+            assert sum(e.stats["failures"] for e in broken) >= 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_ejects(self):
+        """Test that a server failing its ping is ejected."""
+        a_runs, b_runs = [], []
+        a, b = make_server("a", a_runs), make_server("b", b_runs)
+
+        async with RmiMcpClient([a, b]) as client:
+            async def broken_ping():
+                raise ConnectionError("stream closed")
+            endpoint_for(client, a).client.ping = broken_ping
+
+            await client.balancer.health_check()
+            for i in range(3):
+                await client.run_python(f"{i}.py")
+
+        assert a_runs == []
+        assert len(b_runs) == 3
+
+    def test_ejection_backoff(self):
+        """Test that repeated ejections last longer, up to the maximum."""
+        client = RmiMcpClient([make_server("a", []), make_server("b", [])])
+        balancer = client.balancer
+        balancer.ejection_time, balancer.max_ejection_time = 1.0, 3.0
+        endpoint = balancer.endpoints[0]
+
+        durations = []
+        for _ in range(4):
+            balancer.eject(endpoint)
+            durations.append(round(endpoint.ejected_until - time.monotonic()))
+        assert durations == [1, 2, 3, 3]
+
+        balancer.record_success(endpoint)
+        balancer.eject(endpoint)
+        assert round(endpoint.ejected_until - time.monotonic()) == 1
+
+    @pytest.mark.asyncio
+    async def test_all_ejected_still_routes(self):
+        """Test that calls go to the server whose ejection ends first."""
+        a_runs, b_runs = [], []
+        a, b = make_server("a", a_runs), make_server("b", b_runs)
+
+        async with RmiMcpClient([a, b]) as client:
+            client.balancer.eject(endpoint_for(client, a), 60)
+            client.balancer.eject(endpoint_for(client, b), 30)
+
+            assert await client.run_python("x.py") == "b ran x.py"
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the end-to-end load-test harness.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from fastmcp import FastMCP
+
+from load_test import compare, parse_mix, run_load, server_target
+
+
+def make_server(calls):
+    """Create a server that records the tools called."""
+    server = FastMCP("LoadTest")
+
+    @server.tool
+    def run_python(file_name: str) -> str:
+        calls.append("run_python")
+        return "ok" if file_name != "/bad.py" else "Error: File not found: /bad.py"
+
+    @server.tool
+    def list_python_files() -> str:
+        calls.append("list_python_files")
+        return "Python files in /srv:"
+
+    return server
+
+
+class TestLoadTest:
+    """Tests for the load-test helpers."""
+
+    def test_parse_mix(self):
+        """Test parsing operation weights."""
+        assert parse_mix("run_python=3,list_python_files=1") == {
+            "run_python": 3.0, "list_python_files": 1.0
+        }
+        assert parse_mix("run_python") == {"run_python": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("delete_files=1")
+        with pytest.raises(ValueError):
+            parse_mix("run_python=0")
+
+    @pytest.mark.asyncio
+    async def test_run_load_counts_requests(self):
+        """Test that the request budget is shared and errors are counted."""
+        calls = []
+        server = make_server(calls)
+
+        result = await run_load(
+            lambda: server, clients=3, mix={"run_python": 1.0},
+            files=["/ok.py", "/bad.py"], requests=20
+        )
+
+        assert result["requests"] == 20
+        assert 0 < result["errors"] < 20
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        # One warm-up listing per client is not counted
+        assert calls.count("list_python_files") == 3
+        assert calls.count("run_python") == 20
+
+    @pytest.mark.asyncio
+    async def test_memory_target_restores_config(self, tmp_path):
+        """Test that the in-process server uses the run's directory only during the run."""
+        import mcp_server
+
+        original = mcp_server.get_config()
+        environ = dict(os.environ)
+        env = dict(environ, PYTHON_PROJECTS_DIR=str(tmp_path))
+
+        async with server_target("memory", env) as target:
+            assert target() is mcp_server.mcp
+            assert mcp_server.get_config().allowed_directory == str(tmp_path)
+
+        assert mcp_server.get_config() == original
+        assert dict(os.environ) == environ
+
+    def test_compare(self):
+        """Test that throughput drops and p95 increases are reported."""
+        baseline = {"results": {"memory": {"throughput": 100.0, "latency_ms": {"p95": 10.0}}}}
+
+        same = {"memory": {"throughput": 95.0, "latency_ms": {"p95": 11.0}}}
+        worse = {"memory": {"throughput": 70.0, "latency_ms": {"p95": 15.0}}}
+
+        assert compare(same, baseline, 20) == []
+        assert len(compare(worse, baseline, 20)) == 2
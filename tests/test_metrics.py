@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the metrics registry and Prometheus rendering.
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from metrics import Registry, render_prometheus
+
+
+class TestMetrics:
+    """Tests for counters, gauges and histograms."""
+
+    def setup_method(self):
+        """Create a fresh registry."""
+        self.registry = Registry()
+
+    def test_counter(self):
+        """Test counter increments per label combination."""
+        calls = self.registry.counter("calls_total", "Calls", ("tool",))
+        calls.inc(tool="a")
+        calls.inc(2, tool="a")
+        calls.inc(tool="b")
+
+        assert calls.value(tool="a") == 3
+        assert calls.value(tool="b") == 1
+
+        with pytest.raises(ValueError):
+            calls.inc(-1, tool="a")
+        with pytest.raises(ValueError):
+            calls.inc(other="a")
+
+    def test_register_returns_existing(self):
+        """Test metrics are shared by name."""
+        first = self.registry.counter("shared_total", "Shared")
+        assert self.registry.counter("shared_total", "Shared") is first
+
+    def test_gauge(self):
+        """Test gauge inc/dec/set."""
+        depth = self.registry.gauge("depth", "Depth")
+        depth.inc()
+        depth.inc()
+        depth.dec()
+        assert depth.value() == 1
+        depth.set(5)
+        assert depth.value() == 5
+
+    def test_prometheus_format(self):
+        """Test the text exposition format."""
+        self.registry.counter("calls_total", "Calls", ("tool",)).inc(tool='run"x')
+        latency = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = render_prometheus(self.registry)
+
+        assert "# TYPE calls_total counter" in text
+        assert 'calls_total{tool="run\\"x"} 1' in text
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_sum 5.55" in text
+        assert "latency_seconds_count 3" in text
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for condensing long tool outputs before they reach the LLM.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from conversation import estimate_tokens
+from output_condenser import OutputStore, condense_output, find_tracebacks
+
+
+TRACEBACK = """Traceback (most recent call last):
+  File "/srv/job.py", line 10, in <module>
+    main()
+  File "/srv/job.py", line 8, in main
+    1 / 0
+ZeroDivisionError: division by zero"""
+
+
+def long_output(lines=50000, traceback=True, after=0):
+    """Build run_python style output: stdout, stderr with a traceback, exit code."""
+    output = "\n".join(f"progress {n}" for n in range(lines))
+    if traceback:
+        output += "\n--- stderr ---\n" + TRACEBACK
+        output += "".join(f"\ncleanup {n}" for n in range(after))
+        output += "\n\n[Process exited with code 1]"
+    return output
+
+
+class TestCondenseOutput:
+    """Tests for condense_output."""
+
+    def test_short_output_unchanged(self):
+        """Test that output within budget is returned as is."""
+        assert condense_output("Hello, World!", max_tokens=100) == "Hello, World!"
+
+    def test_head_tail_and_stats(self):
+        """Test that long output keeps its first and last lines and statistics."""
+        condensed = condense_output(long_output(traceback=False), max_tokens=300)
+        lines = condensed.splitlines()
+
+        assert estimate_tokens(condensed) <= 300
+        assert lines[0] == "progress 0"
+        assert "progress 49999" in lines
+        assert "lines omitted" in condensed
+        assert lines[-1].startswith("[Output condensed: 50,000 lines")
+
+    def test_traceback_and_exit_code_kept(self):
+        """Test that the traceback survives even when followed by more output."""
+        condensed = condense_output(long_output(after=5000), max_tokens=400)
+
+        assert estimate_tokens(condensed) <= 400
+        assert TRACEBACK in condensed
+        assert "--- stderr ---" in condensed
+        assert "[Process exited with code 1]" in condensed
+        assert "1 traceback(s)" in condensed
+
+    def test_latest_traceback_preferred(self):
+        """Test that with a small budget the latest traceback is kept."""
+        first = TRACEBACK.replace("ZeroDivisionError: division by zero", "KeyError: 'first'")
+        output = first + "\n" + "\n".join(f"retry {n}" for n in range(2000)) + "\n" + TRACEBACK
+
+        condensed = condense_output(output, max_tokens=200)
+
+        assert "ZeroDivisionError: division by zero" in condensed
+        assert "2 traceback(s)" in condensed
+
+    def test_long_lines_cut(self):
+        """Test that a huge single line does not consume the budget."""
+        condensed = condense_output("x" * 1000000, max_tokens=200)
+
+        assert estimate_tokens(condensed) <= 200
+        assert "(+999,700 chars)" in condensed
+
+    def test_find_tracebacks(self):
+        """Test locating tracebacks in output lines."""
+        lines = ["start"] + TRACEBACK.splitlines() + ["after"]
+
+        assert find_tracebacks(lines) == [(1, 7)]
+
+
+class TestOutputStore:
+    """Tests for OutputStore."""
+
+    def test_full_output_kept(self):
+        """Test that condensed outputs can be retrieved in full."""
+        store = OutputStore(max_tokens=300)
+        output = long_output()
+
+        condensed = store.condense(output)
+
+        assert "full output kept locally as #1" in condensed
+        assert store.get(1) == output
+        assert store.get() == output
+        assert store.stats["condensed"] == 1
+        assert store.stats["tokens_saved"] > 100000
+
+    def test_short_output_not_stored(self):
+        """Test that outputs within budget are neither changed nor stored."""
+        store = OutputStore(max_tokens=300)
+
+        assert store.condense("ok") == "ok"
+        assert store.get() is None
+
+    def test_disabled(self):
+        """Test that a zero budget sends outputs whole."""
+        store = OutputStore(max_tokens=0)
+        output = long_output(lines=1000)
+
+        assert store.condense(output) == output
+
+    def test_oldest_dropped(self):
+        """Test that only the latest max_outputs outputs are kept."""
+        store = OutputStore(max_tokens=100, max_outputs=2)
+        for _ in range(3):
+            store.condense(long_output(lines=1000))
+
+        assert store.get(1) is None
+        assert store.get(2) is not None and store.get(3) is not None
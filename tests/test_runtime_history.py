@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-file runtime history behind adaptive timeouts.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from runtime_history import RuntimeHistory, percentile, MIN_SAMPLES, MIN_TIMEOUT
+
+
+class TestRuntimeHistory:
+    """Tests for RuntimeHistory."""
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        samples = list(range(1, 101))
+        
+        assert percentile(samples, 0.5) == 50
+        assert percentile(samples, 0.99) == 99
+        assert percentile([3.0], 0.99) == 3.0
+    
+    def test_deadline_needs_samples(self, tmp_path):
+        """Test that no deadline is derived from too few runs."""
+        path = tmp_path / "job.py"
+        path.write_text("pass")
+        history = RuntimeHistory()
+        
+        for _ in range(MIN_SAMPLES - 1):
+            history.record(path, 2.0)
+        assert history.deadline(path, ceiling=30) is None
+        
+        history.record(path, 2.0)
+        assert history.deadline(path, ceiling=30) == 2.0 * 3 + 1
+    
+    def test_deadline_bounds(self, tmp_path):
+        """Test that deadlines stay between MIN_TIMEOUT and the ceiling."""
+        path = tmp_path / "job.py"
+        path.write_text("pass")
+        history = RuntimeHistory()
+        
+        for _ in range(MIN_SAMPLES):
+            history.record(path, 0.0)
+        assert history.deadline(path, ceiling=30) >= MIN_TIMEOUT
+        
+        for _ in range(MIN_SAMPLES):
+            history.record(path, 100.0)
+        assert history.deadline(path, ceiling=30) == 30
+    
+    def test_reset_when_file_changes(self, tmp_path):
+        """Test that editing a file discards its history."""
+        path = tmp_path / "job.py"
+        path.write_text("pass")
+        history = RuntimeHistory()
+        for _ in range(MIN_SAMPLES):
+            history.record(path, 1.0)
+        
+        path.write_text("import time; time.sleep(5)")
+        os.utime(path, ns=(0, 1))
+        
+        assert history.deadline(path, ceiling=30) is None
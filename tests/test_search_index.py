@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the trigram search index.
+"""
+
+import sys
+import os
+import pytest
+from pathlib import Path
+
+# Set cross-platform default directory
+if "PYTHON_PROJECTS_DIR" not in os.environ:
+    project_root = Path(__file__).parent.parent.resolve()
+    os.environ["PYTHON_PROJECTS_DIR"] = str(project_root / "python_projects")
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from search_index import TrigramIndex, extract_trigrams, required_literals
+
+
+class TestTrigramHelpers:
+    """Tests for trigram and literal extraction."""
+
+    def test_extract_trigrams(self):
+        """Test trigrams are lowercase and overlapping."""
+        assert extract_trigrams("AbCd") == {"abc", "bcd"}
+        assert extract_trigrams("ab") == set()
+
+    def test_required_literals(self):
+        """Test literal runs are extracted from the top-level sequence."""
+        assert required_literals(r"def \w+_test") == ["def ", "_test"]
+        assert required_literals("foo|bar") == []
+        assert required_literals("(") == []
+
+
+class TestTrigramIndex:
+    """Tests for TrigramIndex search and incremental refresh."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create an index over a small project tree."""
+        root = tmp_path / "projects"
+        (root / "pkg").mkdir(parents=True)
+        (root / "hello.py").write_text("print('Hello, World!')\n")
+        (root / "pkg" / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+        (root / "notes.txt").write_text("remember to add tests\n")
+        (root / "data.bin").write_bytes(b"\0\1\2add")
+        return TrigramIndex(str(root), str(tmp_path / "cache" / "index.json"))
+
+    def test_substring_search(self, index):
+        """Test substring search across Python and text files."""
+        matches = index.search("add")
+
+        assert [(m.path, m.line_number) for m in matches] == [
+            ("notes.txt", 1),
+            ("pkg/calc.py", 1),
+        ]
+
+    def test_case_insensitive_search(self, index):
+        """Test case-insensitive search."""
+        assert index.search("HELLO") == []
+        assert len(index.search("HELLO", case_sensitive=False)) == 1
+
+    def test_regex_search(self, index):
+        """Test regex search."""
+        matches = index.search(r"return \w+ \+", regex=True)
+
+        assert len(matches) == 1
+        assert matches[0].path == "pkg/calc.py"
+        assert matches[0].line_number == 2
+
+    def test_anchored_regex_after_first_line(self, index):
+        """Test that ^ anchors match at the start of every line."""
+        matches = index.search(r"^    return", regex=True)
+
+        assert [(m.path, m.line_number) for m in matches] == [("pkg/calc.py", 2)]
+
+    def test_short_files_and_queries(self, index):
+        """Test that files and queries too short for a trigram are still searched."""
+        (index.root / "tiny.txt").write_text("ok")
+
+        assert [(m.path, m.line_number) for m in index.search("ok")] == [("tiny.txt", 1)]
+        assert [m.path for m in index.search("o")] == ["hello.py", "notes.txt", "tiny.txt"]
+        # Binary files are never candidates
+        assert "data.bin" not in index.candidates([])
+
+    def test_max_results(self, index):
+        """Test the result limit."""
+        assert len(index.search("a", max_results=1)) == 1
+
+    def test_incremental_refresh(self, index):
+        """Test that only changed files are re-indexed."""
+        assert index.refresh() == (4, 0)
+        assert index.refresh() == (0, 0)
+
+        calc = index.root / "pkg" / "calc.py"
+        calc.write_text("def multiply(a, b):\n    return a * b\n")
+        os.utime(calc, ns=(0, 1))
+        (index.root / "notes.txt").unlink()
+
+        assert index.refresh() == (1, 1)
+        assert index.search("add") == []
+        assert len(index.search("multiply")) == 1
+
+    def test_index_persisted(self, index):
+        """Test that a new index instance reuses the on-disk index."""
+        index.refresh()
+        assert index.index_path.exists()
+
+        reloaded = TrigramIndex(str(index.root), str(index.index_path))
+        assert reloaded.refresh() == (0, 0)
+        assert len(reloaded.search("Hello")) == 1
@@ -108,6 +108,313 @@ class TestRunPythonTool:
         
         assert "Error" in result
         assert "File not found" in result
+    
+    def test_per_call_timeout(self):
+        """Test that a per-call timeout kills the run early."""
+        test_file = self.test_dir / "sleepy.py"
+        test_file.write_text("import time\ntime.sleep(10)\n")
+        
+        from mcp_server import run_python
+        result = run_python(str(test_file), timeout=0.5)
+        
+        assert result == "Error: Execution timed out after 0.5 seconds"
+    
+    def test_per_call_timeout_capped(self):
+        """Test that requested timeouts are capped and validated."""
+        import mcp_server
+        config = mcp_server.get_config()
+        
+        assert mcp_server.resolve_timeout(Path("x.py"), 10 ** 6, config) == (config.timeout_limit, False)
+        assert "Timeout must be positive" in mcp_server.run_python(str(self.test_dir / "success.py"), timeout=0)
+
+
+class TestAdaptiveTimeout:
+    """Tests for deadlines learned from previous runs."""
+    
+    def setup_method(self):
+        """Enable adaptive timeouts with a fresh history."""
+        import dataclasses
+        import mcp_server
+        from runtime_history import RuntimeHistory
+        
+        self.original_config = mcp_server.get_config()
+        mcp_server.apply_config(dataclasses.replace(self.original_config, python_adaptive_timeout=True))
+        mcp_server._runtime_history = RuntimeHistory()
+        
+        self.test_file = Path(ALLOWED_DIRECTORY) / "adaptive.py"
+        self.test_file.parent.mkdir(parents=True, exist_ok=True)
+        self.test_file.write_text(
+            "import os, time\nif os.path.exists('hang'):\n    time.sleep(30)\nprint('done')\n"
+        )
+    
+    def teardown_method(self):
+        """Restore the original configuration."""
+        import mcp_server
+        mcp_server.apply_config(self.original_config)
+        (self.test_file.parent / "hang").unlink(missing_ok=True)
+    
+    def test_hung_run_killed_early(self):
+        """Test that a hung run is killed at the learned deadline, then relearned."""
+        import mcp_server
+        from runtime_history import MIN_SAMPLES
+        
+        for _ in range(MIN_SAMPLES):
+            assert mcp_server.run_python(str(self.test_file)).strip() == "done"
+        deadline, adaptive = mcp_server.resolve_timeout(self.test_file, None, mcp_server.get_config())
+        assert adaptive and deadline < mcp_server.get_config().python_timeout
+        
+        (self.test_file.parent / "hang").write_text("")
+        result = mcp_server.run_python(str(self.test_file))
+        
+        assert result.startswith(f"Error: Execution timed out after {deadline:g} seconds (adaptive")
+        assert mcp_server.resolve_timeout(self.test_file, None, mcp_server.get_config())[1] is False
+
+
+class TestSyntaxPreflight:
+    """Tests for in-process syntax checking before execution."""
+    
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.test_file = self.test_dir / "syntax_error.py"
+        self.test_file.write_text("print('unclosed'\n")
+    
+    def test_matches_interpreter_output(self, monkeypatch):
+        """Test that pre-flight output matches what the child process prints."""
+        import mcp_server
+        
+        monkeypatch.setattr(mcp_server, "_syntax_preflight_enabled", False)
+        spawned = mcp_server.run_python(str(self.test_file))
+        
+        monkeypatch.setattr(mcp_server, "_syntax_preflight_enabled", True)
+        monkeypatch.setattr(mcp_server.subprocess, "Popen", None)  # must not spawn
+        preflight = mcp_server.run_python(str(self.test_file))
+        
+        assert "SyntaxError" in preflight
+        assert preflight == spawned
+    
+    def test_compile_result_cached(self, monkeypatch):
+        """Test that compile results are cached by content hash."""
+        from syntax_check import SyntaxChecker
+        import builtins
+        
+        checker = SyntaxChecker()
+        compiles = []
+        original_compile = builtins.compile
+        monkeypatch.setattr(
+            builtins, "compile",
+            lambda *args, **kwargs: compiles.append(args) or original_compile(*args, **kwargs)
+        )
+        
+        assert "SyntaxError" in checker.check(self.test_file)
+        assert "SyntaxError" in checker.check(self.test_file)
+        assert len(compiles) == 1
+        
+        self.test_file.write_text("print('fixed')\n")
+        assert checker.check(self.test_file) is None
+        assert len(compiles) == 2
+
+
+class TestSearchPythonFilesTool:
+    """Tests for search_python_files tool."""
+    
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.test_file = self.test_dir / "search_target.py"
+        self.test_file.write_text("def find_me_please():\n    pass\n")
+    
+    def test_search_finds_match(self):
+        """Test that a matching line is reported with its location."""
+        from mcp_server import search_python_files
+        result = search_python_files("find_me_please")
+        
+        assert "search_target.py:1:" in result
+    
+    def test_invalid_regex(self):
+        """Test that an invalid regex returns an error."""
+        from mcp_server import search_python_files
+        result = search_python_files("(", regex=True)
+        
+        assert "Invalid regular expression" in result
+    
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing allowed directory gives no matches and is not created."""
+        import dataclasses
+        import mcp_server
+        original = mcp_server.get_config()
+        missing = tmp_path / "missing"
+        mcp_server.apply_config(dataclasses.replace(original, allowed_directory=str(missing)))
+        try:
+            result = mcp_server.search_python_files("find_me_please")
+        finally:
+            mcp_server.apply_config(original)
+        
+        assert result.startswith("No matches")
+        assert not missing.exists()
+
+
+class TestDescribePythonFilesTool:
+    """Tests for describe_python_files tool."""
+    
+    def setup_method(self):
+        """Setup test environment."""
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.test_file = self.test_dir / "described.py"
+        self.test_file.write_text(
+            '"""Described module."""\n'
+            'def helper(x):\n'
+            '    """Help."""\n'
+            'if __name__ == "__main__":\n'
+            '    helper(1)\n'
+        )
+    
+    def test_describe_file(self):
+        """Test describing a single file."""
+        from mcp_server import describe_python_files
+        result = describe_python_files(str(self.test_file))
+        
+        assert "Docstring: Described module." in result
+        assert "helper(x) (line 2): Help." in result
+        assert "(line 4)" in result
+    
+    def test_describe_directory(self):
+        """Test describing the allowed directory."""
+        from mcp_server import describe_python_files
+        result = describe_python_files()
+        
+        assert "described.py" in result
+    
+    def test_describe_outside_directory(self):
+        """Test that directories outside the allowed directory are rejected."""
+        from mcp_server import describe_python_files
+        result = describe_python_files("/")
+        
+        assert "Error: Directory must be within" in result
+
+
+class TestHttpServerConfig:
+    """Tests for run_http_server argument handling."""
+    
+    def test_defaults(self, monkeypatch):
+        """Test default transport, host and port."""
+        for name in ("MCP_TRANSPORT", "MCP_HOST", "MCP_PORT", "MCP_WORKERS"):
+            monkeypatch.delenv(name, raising=False)
+        from run_http_server import parse_args
+        args = parse_args([])
+        
+        assert (args.transport, args.host, args.port, args.workers) == ("sse", "0.0.0.0", 8000, 1)
+    
+    def test_sse_rejects_multiple_workers(self):
+        """Test that SSE cannot be combined with several workers."""
+        from run_http_server import parse_args
+        
+        with pytest.raises(SystemExit):
+            parse_args(["--transport", "sse", "--workers", "2"])
+    
+    def test_create_app_routes(self, monkeypatch):
+        """Test that each transport is served on its endpoint."""
+        from run_http_server import create_app
+        
+        monkeypatch.setenv("MCP_TRANSPORT", "http")
+        assert "/mcp" in [route.path for route in create_app().routes]
+        
+        monkeypatch.setenv("MCP_TRANSPORT", "sse")
+        assert "/sse" in [route.path for route in create_app().routes]
+        assert "/metrics" in [route.path for route in create_app().routes]
+
+
+class TestConfigReloadAndDrain:
+    """Tests for hot configuration reload and graceful drain."""
+    
+    def setup_method(self):
+        """Setup test environment."""
+        import mcp_server
+        self.original_config = mcp_server.get_config()
+        self.test_dir = Path(ALLOWED_DIRECTORY)
+        self.test_dir.mkdir(parents=True, exist_ok=True)
+        self.test_file = self.test_dir / "reload_test.py"
+        self.test_file.write_text("print('ok')\n")
+    
+    def teardown_method(self):
+        """Restore the original configuration and drain state."""
+        import mcp_server
+        mcp_server.apply_config(self.original_config)
+        mcp_server._draining = False
+    
+    def test_reload_from_config_file(self, tmp_path, monkeypatch):
+        """Test that the reload tool swaps in settings from MCP_CONFIG_FILE."""
+        import mcp_server
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"python_timeout": 7, "python_max_concurrency": 2}')
+        monkeypatch.setenv("MCP_CONFIG_FILE", str(config_file))
+        
+        result = mcp_server.reload_config()
+        
+        assert "python_timeout:" in result and "-> 7" in result
+        assert mcp_server.get_config().python_timeout == 7
+        assert mcp_server.PYTHON_TIMEOUT == 7
+        assert mcp_server._execution_slots._value == 2
+    
+    def test_invalid_config_keeps_old(self, tmp_path, monkeypatch):
+        """Test that an invalid config file leaves the active config in place."""
+        import mcp_server
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"python_timeout": 0}')
+        monkeypatch.setenv("MCP_CONFIG_FILE", str(config_file))
+        
+        result = mcp_server.reload_config()
+        
+        assert result.startswith("Error: Configuration not reloaded")
+        assert mcp_server.get_config() == self.original_config
+    
+    def test_draining_rejects_new_executions(self):
+        """Test that run_python refuses work once draining started."""
+        import mcp_server
+        
+        assert mcp_server.run_python(str(self.test_file)).strip() == "ok"
+        mcp_server.begin_drain()
+        
+        assert "shutting down" in mcp_server.run_python(str(self.test_file))
+        assert mcp_server.wait_for_drain(timeout=1)
+    
+    def test_readiness(self, monkeypatch):
+        """Test that readiness reports draining and overload."""
+        import mcp_server
+        
+        assert mcp_server.readiness() == (True, "")
+        
+        monkeypatch.setattr(mcp_server, "SHED_QUEUE_DEPTH", 1)
+        mcp_server.QUEUE_DEPTH.inc()
+        try:
+            assert mcp_server.readiness() == (False, "overloaded: 1 executions queued")
+        finally:
+            mcp_server.QUEUE_DEPTH.dec()
+        
+        mcp_server.begin_drain()
+        assert mcp_server.readiness() == (False, "draining")
+    
+    def test_wait_for_drain_waits_for_running(self):
+        """Test that wait_for_drain blocks until running executions finish."""
+        import threading
+        import mcp_server
+        self.test_file.write_text("import time\ntime.sleep(0.5)\n")
+        
+        worker = threading.Thread(target=mcp_server.run_python, args=(str(self.test_file),))
+        worker.start()
+        while mcp_server._active_executions == 0:
+            pass
+        mcp_server.begin_drain()
+        
+        assert not mcp_server.wait_for_drain(timeout=0.05)
+        assert mcp_server.wait_for_drain(timeout=5)
+        worker.join()
 
 
 def run_tests():
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for speculative run_python calls in the LLM client.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+from fastmcp import FastMCP
+
+from mcp_client import RmiMcpClient
+from llm_backends import ScriptedBackend
+from mcp_client_llm import AgentSession, LLMClient
+from speculation import Speculator, parse_listing
+
+LISTING = "Python files in /srv:\n  - calc.py\n  - lib/util.py\n  - tools/util.py\n"
+
+
+def make_server(runs, delay=0.2, running=None):
+    """Create a server whose run_python takes a while and records the files it ran."""
+    server = FastMCP("SpeculationTest")
+    running = running if running is not None else {"now": 0, "peak": 0}
+
+    @server.tool
+    async def run_python(file_name: str, timeout: Optional[float] = None) -> str:
+        runs.append(file_name)
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            running["now"] -= 1
+        return f"ran {file_name}" if timeout is None else f"ran {file_name} within {timeout:.0f}s"
+
+    @server.tool
+    def list_python_files() -> str:
+        return LISTING
+
+    return server
+
+
+def run_call(*file_names, **arguments):
+    """Scripted response that runs files."""
+    return {"content": None, "tool_calls": [
+        {"name": "run_python", "arguments": dict(arguments, file_name=name)} for name in file_names
+    ]}
+
+
+class TestMatching:
+    """Tests for finding the files a prompt names."""
+
+    def setup_method(self):
+        """Setup a speculator with a known listing."""
+        self.speculator = Speculator(mcp_client=None)
+        self.speculator.paths = parse_listing(LISTING)
+
+    def test_parse_listing(self):
+        """Test that listings parse into full paths and errors into nothing."""
+        assert parse_listing(LISTING) == ["/srv/calc.py", "/srv/lib/util.py", "/srv/tools/util.py"]
+        assert parse_listing("Error: Directory not found") == []
+
+    def test_resolve(self):
+        """Test that only names matching exactly one file resolve."""
+        assert self.speculator.resolve("calc.py") == "/srv/calc.py"
+        assert self.speculator.resolve("/srv/lib/util.py") == "/srv/lib/util.py"
+        assert self.speculator.resolve("tools/util.py") == "/srv/tools/util.py"
+        assert self.speculator.resolve("util.py") is None
+        assert self.speculator.resolve("missing.py") is None
+
+    def test_match_prompt_needs_run_verb(self):
+        """Test that a prompt must ask for a run."""
+        assert self.speculator.match_prompt("Please run calc.py") == ["/srv/calc.py"]
+        assert self.speculator.match_prompt("What does calc.py do?") == []
+
+
+@pytest.mark.asyncio
+class TestSpeculativeRuns:
+    """Tests for speculation in an agent session."""
+
+    async def session_turn(self, prompt, responses, runs, running=None, max_parallel_tools=4):
+        """Run one speculating turn with a slow model and return the session."""
+        llm = LLMClient(model="scripted", backend=ScriptedBackend(responses, latency=0.3))
+        async with RmiMcpClient(make_server(runs, running=running)) as mcp_client:
+            session = AgentSession(
+                mcp_client, llm, max_parallel_tools=max_parallel_tools, speculate=True, echo=False
+            )
+            answer = await session.turn(prompt)
+        return session, answer
+
+    async def test_hit(self):
+        """Test that the model's call reuses the speculative run."""
+        runs = []
+
+        session, answer = await self.session_turn("run calc.py", [run_call("calc.py")], runs)
+
+        assert runs == ["/srv/calc.py"]
+        assert answer == "Done. run_python: ran /srv/calc.py"
+        assert session.speculator.stats["hits"] == 1
+        assert session.speculator.stats["wasted"] == 0
+        assert session.speculator.stats["seconds_saved"] > 0.1
+        # The run finished while the model was deciding
+        assert session.timings["tools"][0] < 0.1
+
+    async def test_miss_discarded(self):
+        """Test that a run the model does not ask for is counted as wasted."""
+        runs = []
+
+        session, _ = await self.session_turn("run calc.py", [run_call("/srv/lib/util.py")], runs)
+
+        assert sorted(runs) == ["/srv/calc.py", "/srv/lib/util.py"]
+        assert session.speculator.stats == {"started": 1, "hits": 0, "wasted": 1, "seconds_saved": 0.0}
+        assert session.speculator.hit_rate() == 0.0
+
+    async def test_no_speculation_without_run_verb(self):
+        """Test that prompts not asking for a run start nothing early."""
+        runs = []
+
+        session, _ = await self.session_turn("what is in calc.py?", [{"content": "A calculator."}], runs)
+
+        assert runs == []
+        assert session.speculator.stats["started"] == 0
+
+    async def test_other_arguments_not_reused(self):
+        """Test that a call with its own timeout runs itself and the speculative run is dropped."""
+        runs = []
+
+        session, answer = await self.session_turn("run calc.py", [run_call("calc.py", timeout=60)], runs)
+
+        assert answer == "Done. run_python: ran calc.py within 60s"
+        assert runs == ["/srv/calc.py", "calc.py"]
+        assert session.speculator.stats["hits"] == 0
+        assert session.speculator.stats["wasted"] == 1
+
+    async def test_tool_slots_respected(self):
+        """Test that speculative runs count against max_parallel_tools."""
+        runs, running = [], {"now": 0, "peak": 0}
+
+        session, _ = await self.session_turn(
+            "run calc.py and lib/util.py", [run_call("calc.py", "lib/util.py")], runs,
+            running=running, max_parallel_tools=1
+        )
+
+        assert sorted(runs) == ["/srv/calc.py", "/srv/lib/util.py"]
+        assert running["peak"] == 1
+        assert session.speculator.stats["hits"] == 2
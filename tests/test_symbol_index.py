@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AST symbol index.
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from symbol_index import SymbolIndex, extract_symbols
+
+
+SAMPLE_SOURCE = b'''"""Sample module.
+
+More details.
+"""
+
+class Greeter(object):
+    """Says hello."""
+
+def greet(name, *, loud=False):
+    """Return a greeting."""
+    return f"Hello, {name}"
+
+async def fetch():
+    pass
+
+if __name__ == "__main__":
+    print(greet("World"))
+'''
+
+
+class TestExtractSymbols:
+    """Tests for symbol extraction."""
+
+    def test_symbols(self):
+        """Test docstrings, functions, classes and entry point."""
+        symbols = extract_symbols(SAMPLE_SOURCE)
+
+        assert symbols.docstring == "Sample module."
+        assert [c.signature for c in symbols.classes] == ["Greeter(object)"]
+        assert symbols.classes[0].docstring == "Says hello."
+        assert [f.signature for f in symbols.functions] == [
+            "greet(name, *, loud=False)",
+            "async fetch()",
+        ]
+        assert symbols.functions[0].line == 9
+        assert symbols.entry_point_line == 16
+        assert symbols.error is None
+
+    def test_syntax_error(self):
+        """Test that unparsable files report an error."""
+        symbols = extract_symbols(b"def broken(:\n")
+
+        assert symbols.error.startswith("SyntaxError")
+        assert symbols.functions == []
+
+
+class TestSymbolIndex:
+    """Tests for SymbolIndex caching."""
+
+    def test_cached_until_content_changes(self, tmp_path, monkeypatch):
+        """Test that files are only re-parsed when their content changes."""
+        import symbol_index
+
+        calls = []
+        original = symbol_index.extract_symbols
+        monkeypatch.setattr(
+            symbol_index, "extract_symbols",
+            lambda source: calls.append(source) or original(source)
+        )
+
+        path = tmp_path / "module.py"
+        path.write_text("def one():\n    pass\n")
+        index = SymbolIndex()
+
+        assert index.get(path).functions[0].name == "one"
+        assert index.get(path).functions[0].name == "one"
+        assert len(calls) == 1
+
+        # Touch without changing content: hash check avoids a re-parse
+        os.utime(path, ns=(0, 1))
+        index.get(path)
+        assert len(calls) == 1
+
+        path.write_text("def two():\n    pass\n")
+        os.utime(path, ns=(0, 2))
+        assert index.get(path).functions[0].name == "two"
+        assert len(calls) == 2
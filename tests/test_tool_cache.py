@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side tool list caching.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "client"))
+
+import mcp.types as mt
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import Middleware
+
+from connection_pool import ConnectionPool
+from mcp_client import RmiMcpClient
+from mcp_client_llm import to_openai_tools
+from tool_cache import ToolCache
+
+
+class CountListTools(Middleware):
+    """Count tools/list requests reaching the server."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def on_list_tools(self, context, call_next):
+        self.calls += 1
+        return await call_next(context)
+
+
+def make_server():
+    """Create a server that can add a tool and announce it."""
+    server = FastMCP("ToolCacheTest")
+    counter = CountListTools()
+    server.add_middleware(counter)
+
+    @server.tool
+    def list_python_files() -> str:
+        return "Python files:"
+
+    @server.tool
+    async def add_tool(ctx: Context) -> str:
+        def run_python(file_name: str) -> str:
+            return f"ran {file_name}"
+        server.tool(run_python)
+        await ctx.send_notification(mt.ToolListChangedNotification())
+        return "added"
+
+    return server, counter
+
+
+async def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true (notifications arrive asynchronously)."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestToolCache:
+    """Tests for ToolCache and RmiMcpClient.list_tools caching."""
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL and derived values go with them."""
+        cache = ToolCache(ttl=0)
+        cache.store(["tool"])
+        assert cache.get() is None
+
+        cache = ToolCache(ttl=60)
+        cache.store(["tool"])
+        assert cache.derived(len) == 1
+        assert cache.get() == ["tool"]
+        cache.invalidate()
+        assert cache.get() is None
+        assert cache.stats == {"hits": 1, "misses": 1, "invalidations": 1}
+
+    @pytest.mark.asyncio
+    async def test_list_tools_cached(self):
+        """Test that repeated list_tools calls hit the server once."""
+        server, counter = make_server()
+
+        async with RmiMcpClient(server) as client:
+            first = await client.list_tools()
+            second = await client.list_tools()
+
+            assert first is second
+            assert counter.calls == 1
+
+            await client.list_tools(refresh=True)
+            assert counter.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidated_by_list_changed(self):
+        """Test that a tools/list_changed notification drops the cache."""
+        server, counter = make_server()
+
+        async with RmiMcpClient(server) as client:
+            names = [t.name for t in await client.list_tools()]
+            assert "run_python" not in names
+
+            await client.client.call_tool("add_tool", {})
+            await wait_for(lambda: client.tool_cache.tools is None)
+
+            names = [t.name for t in await client.list_tools()]
+            assert "run_python" in names
+            assert counter.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_schemas_cached_with_tools(self):
+        """Test that derived OpenAI schemas are rebuilt only after a change."""
+        server, _ = make_server()
+
+        async with RmiMcpClient(server) as client:
+            schemas = await client.tool_schemas(to_openai_tools)
+            assert await client.tool_schemas(to_openai_tools) is schemas
+            assert schemas[0]["function"]["name"] == "list_python_files"
+
+            await client.client.call_tool("add_tool", {})
+            await wait_for(lambda: client.tool_cache.tools is None)
+
+            rebuilt = await client.tool_schemas(to_openai_tools)
+            assert rebuilt is not schemas
+            assert len(rebuilt) == len(schemas) + 1
+
+    @pytest.mark.asyncio
+    async def test_pooled_sessions_share_cache(self):
+        """Test that clients borrowing one pooled session share its tool list."""
+        server, counter = make_server()
+
+        async with ConnectionPool() as pool:
+            for _ in range(3):
+                async with RmiMcpClient(server, pool=pool) as client:
+                    await client.list_tools()
+
+            assert counter.calls == 1
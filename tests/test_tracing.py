@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for request tracing.
+"""
+
+import sys
+import json
+import asyncio
+import pytest
+from pathlib import Path
+
+# Add server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from tracing import Tracer, RingBufferExporter, RotatingFileExporter, create_tracer
+
+
+def spans_of(document):
+    """Get the spans of an exported OTLP document."""
+    return document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+class TestTracer:
+    """Tests for span nesting and export."""
+
+    def test_nested_spans_exported_with_root(self):
+        """Test that a trace is exported once, when its root span ends."""
+        buffer = RingBufferExporter()
+        tracer = Tracer("test", [buffer])
+
+        with tracer.span("root") as root:
+            with tracer.span("child", size=3):
+                pass
+            assert buffer.recent() == []
+
+        spans = spans_of(buffer.recent()[0])
+        by_name = {span["name"]: span for span in spans}
+
+        assert set(by_name) == {"root", "child"}
+        assert by_name["child"]["parentSpanId"] == by_name["root"]["spanId"]
+        assert by_name["child"]["traceId"] == by_name["root"]["traceId"] == root.trace_id
+        assert by_name["child"]["attributes"] == [{"key": "size", "value": {"intValue": "3"}}]
+        assert int(by_name["root"]["endTimeUnixNano"]) >= int(by_name["child"]["endTimeUnixNano"])
+
+    def test_error_status(self):
+        """Test that exceptions mark the span as failed."""
+        buffer = RingBufferExporter()
+        tracer = Tracer("test", [buffer])
+
+        with pytest.raises(ValueError):
+            with tracer.span("root"):
+                raise ValueError("boom")
+
+        span = spans_of(buffer.recent()[0])[0]
+        assert span["status"] == {"code": 2, "message": "ValueError: boom"}
+
+    def test_spans_in_worker_thread(self):
+        """Test that spans opened in a thread join the caller's trace."""
+        buffer = RingBufferExporter()
+        tracer = Tracer("test", [buffer])
+
+        def work():
+            with tracer.span("in_thread"):
+                pass
+
+        async def main():
+            with tracer.span("root"):
+                await asyncio.to_thread(work)
+
+        asyncio.run(main())
+
+        assert [span["name"] for span in spans_of(buffer.recent()[0])] == ["in_thread", "root"]
+
+    def test_disabled(self):
+        """Test that a tracer without exporters records nothing."""
+        tracer = create_tracer("test", "none", "unused.jsonl")
+
+        with tracer.span("root") as span:
+            assert span is None
+        assert tracer.ring_buffer() is None
+
+
+class TestRotatingFileExporter:
+    """Tests for the rotating file exporter."""
+
+    def test_rotation(self, tmp_path):
+        """Test that the file is rotated when it would exceed max_bytes."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer("test", [RotatingFileExporter(str(path), max_bytes=600, backup_count=2)])
+
+        for i in range(10):
+            with tracer.span(f"span-{i}"):
+                pass
+
+        assert path.exists()
+        assert (tmp_path / "traces.jsonl.1").exists()
+        assert (tmp_path / "traces.jsonl.2").exists()
+        assert not (tmp_path / "traces.jsonl.3").exists()
+
+        last = json.loads(path.read_text().splitlines()[-1])
+        assert spans_of(last)[0]["name"] == "span-9"